@@ -7,18 +7,50 @@ app = marimo.App(width="full")
 @app.cell
 def _():
     import marimo as mo
+    import sys
+    import time
     import numpy as np
-    import matplotlib.pyplot as plt
-    return mo, np, plt
+
+    # Módulos compartidos de recursos/: pool de trabajo, figuras que se rasterizan en él, muestreo adaptativo
+    # e instrumentación
+    if str(mo.notebook_dir()) not in sys.path:
+        sys.path.insert(0, str(mo.notebook_dir()))
+    import figuras
+    import instrumentacion
+    import pool_trabajo
+    from muestreo import cache_curva, muestreo_adaptativo
+    return (
+        cache_curva,
+        figuras,
+        instrumentacion,
+        mo,
+        muestreo_adaptativo,
+        np,
+        pool_trabajo,
+        time,
+    )
 
 
 @app.cell
-def _(mo):
-    mo.md(
-        r"""
+def _(instrumentacion):
+    # Instrumentación (instrumentacion.py): tramos medidos (celda/etapa) y contadores acumulados
+    perfil = instrumentacion.Perfil()
+    medir, anotar, contar = perfil.medir, perfil.anotar, perfil.contar
+    perfil_json, perfil_chrome = perfil.a_json, perfil.a_chrome
+    tramos, contadores = perfil.tramos, perfil.contadores
+    return anotar, contadores, contar, medir, perfil, perfil_chrome, perfil_json, tramos
+
+
+@app.cell
+def _(medir, mo):
+    with medir("markdown", celda="ecuaciones"):
+        _md = mo.md(
+            r"""
 # Diagrama de Moody interactivo (Marimo) — **Fanning**
 
 El gráfico usa **factor de fricción de Fanning** ($f_F$), no Darcy.
+Las curvas se muestrean de forma adaptativa en $\log_{10} Re$: se agregan puntos solo donde la curva se aparta
+de la cuerda más de 1/4 de píxel (p. ej. en el salto de $Re = 2300$), y los puntos ya evaluados se reutilizan.
 
 ## Ecuaciones usadas
 
@@ -52,18 +84,22 @@ $$
 \phi = 4 f_F \left(\frac{L}{D}\right)\left(\frac{V^2}{2}\right)
 $$
 """
-    )
+        )
+    _md
     return
 
 
 @app.cell
-def _(np):
+def _(contar, np):
     def f_darcy_swamee_jain(Re, rr):
         return 0.25 / (np.log10(rr / 3.7 + 5.74 / (Re**0.9)) ** 2)
 
     def f_darcy_colebrook(Re, rr, it=35):
         Re = np.asarray(Re, dtype=float)
         fD = np.maximum(f_darcy_swamee_jain(Re, max(rr, 1e-12)), 1e-6)
+        contar("colebrook_llamadas")
+        contar("colebrook_iteraciones", it)
+        contar("colebrook_puntos", Re.size)
         for _ in range(it):
             inv = -2 * np.log10(rr / 3.7 + 2.51 / (Re * np.sqrt(fD)))
             fD = 1 / (inv**2)
@@ -77,7 +113,7 @@ def _(np):
         fF[~lam] = f_darcy_colebrook(Re[~lam], rr) / 4
         return fF
 
-    return f_fanning
+    return f_darcy_colebrook, f_fanning
 
 
 @app.cell
@@ -101,80 +137,179 @@ def _(mo):
 
 
 @app.cell
-def _(f_fanning, np, plt, re_manual, re_slider, rr_manual, rr_slider, use_manual):
-    Re_grid = np.logspace(3, 8, 500)
+async def _(anotar, cache_curva, contar, f_fanning, figuras, medir, mo, muestreo_adaptativo, np, pool_trabajo):
+    # Fondo fijo del diagrama: no depende de los sliders, se calcula y rasteriza una sola vez
     rr_lines = np.array([1e-5, 1e-4, 1e-3, 1e-2, 3e-2, 5e-2])
+    _y_min, _y_max = 0.0, 0.03
+
+    # Muestreo adaptativo en log10(Re): tolerancia de 1/4 de píxel sobre el alto del área de ejes
+    # de figuras.dibujar_fondo (7 in · 100 dpi · 0.82); 8 niveles dan ~0.2 px de resolución horizontal
+    tol_px = 0.25
+    _tol_f = tol_px * (_y_max - _y_min) / (7 * 100 * 0.82)
+    curvas, muestreo = [], []
+    with medir("colebrook", curvas=len(rr_lines)):
+        for _rrl in rr_lines:
+            _x, _f, _st = muestreo_adaptativo(
+                lambda x, rr=_rrl: f_fanning(10.0**x, rr), 3.0, 8.0, _tol_f, cache=cache_curva(("00_moody", "fanning", _rrl))
+            )
+            curvas.append((10.0**_x, _f[0]))
+            muestreo.append(_st)
+            for _k in ("puntos", "evaluaciones", "reutilizados"):
+                contar(f"muestreo_{_k}", _st[_k])
+
+    with medir("pool", etapa="fondo"):
+        _r = await pool_trabajo.ejecutar(figuras.dibujar_fondo, curvas=curvas, rr_lines=rr_lines, y_min=_y_min, y_max=_y_max)
+    for _k, _dt in _r["tiempos"].items():
+        anotar(_k, _dt, figura="moody")
+
+    geom = _r["geom"]
+    fondo = mo.image(_r["png"], style={"width": "100%", "display": "block"})
+    return curvas, fondo, geom, muestreo, rr_lines, tol_px
+
 
+@app.cell
+def _(
+    f_fanning,
+    fondo,
+    geom,
+    medir,
+    mo,
+    np,
+    re_manual,
+    re_slider,
+    rr_manual,
+    rr_slider,
+    use_manual,
+):
+    # Camino liviano: solo el punto y los valores cambian con los sliders (SVG sobre el fondo)
     Re0 = float(re_manual.value if use_manual.value else re_slider.value)
     rr0 = float(rr_manual.value if use_manual.value else rr_slider.value)
     Re0 = min(max(Re0, 1e3), 1e8)
     rr0 = min(max(rr0, 1e-6), 0.05)
 
-    fig, ax = plt.subplots(figsize=(11, 7))
-
-    for rrl in rr_lines:
-        ax.plot(Re_grid, f_fanning(Re_grid, rrl), lw=1.2, color="steelblue")
-
-    # Línea laminar (Fanning)
-    Re_l = np.logspace(2.3, np.log10(2300), 200)
-    ax.plot(Re_l, 16 / Re_l, color="black", lw=2.0, label="Laminar: f = 16/Re")
-
-    # Zona sombreada laminar
-    ax.axvspan(1e3, 2300, color="#d9d9d9", alpha=0.25, zorder=0)
-    ax.text(1300, 0.095, "Régimen laminar", fontsize=11, color="#555555")
-
-    ax.set_xscale("log")
-    ax.set_xlim(1e3, 1e8)
-
-    y_min, y_max = 0.0, 0.03
-    ax.set_ylim(y_min, y_max)
-    y_ticks = np.arange(0.0, 0.0301, 0.005)
-    ax.set_yticks(y_ticks)
-    ax.set_yticklabels([f"{t:.2f}" for t in y_ticks])
-
-    ax.grid(True, which="both", ls="--", alpha=0.3)
-    ax.set_title("Diagrama de Moody (Fanning)", fontsize=18, fontweight="bold")
-    ax.set_xlabel("Número de Reynolds, Re", fontsize=14)
-    ax.set_ylabel("Factor de fricción de Fanning, f", fontsize=14)
-    ax.tick_params(axis="both", labelsize=12)
-
-    # Eje derecho: rugosidad relativa en notación científica
-    ax2 = ax.twinx()
-    fD_right = 1 / (-2 * np.log10(rr_lines / 3.7)) ** 2
-    fF_right = fD_right / 4
-    m = (fF_right >= y_min) & (fF_right <= y_max)
-    ax2.set_ylim(y_min, y_max)
-    ax2.set_yticks(fF_right[m])
-    ax2.set_yticklabels([f"{r:.1e}" for r in rr_lines[m]], fontsize=12)
-    ax2.set_ylabel("Rugosidad relativa, ε/D", fontsize=14)
-
-    # Punto interactivo
-    f0 = float(f_fanning(np.array([Re0]), rr0)[0])
-    ax.scatter([Re0], [f0], color="#444444", s=90, zorder=6)
-    ax.hlines(f0, Re0, ax.get_xlim()[1], colors="#666666", linestyles="--", lw=1.3, zorder=4)
-    ax.vlines(Re0, y_min, f0, colors="#666666", linestyles="--", lw=1.3, zorder=4)
-
-    ax.text(
-        0.98,
-        0.97,
-        f"f = {f0:.4f}",
-        transform=ax.transAxes,
-        ha="right",
-        va="top",
-        fontsize=14,
-        color="#222222",
-        fontweight="bold",
+    with medir("marcador"):
+        f0 = float(f_fanning(np.array([Re0]), rr0)[0])
+
+        _g = geom
+        _px = _g["x0"] + (np.log10(Re0) - _g["lx"][0]) / (_g["lx"][1] - _g["lx"][0]) * (_g["x1"] - _g["x0"])
+        _fy = min(max(f0, _g["ly"][0]), _g["ly"][1])
+        _py = _g["y1"] - (_fy - _g["ly"][0]) / (_g["ly"][1] - _g["ly"][0]) * (_g["y1"] - _g["y0"])
+        _ty = max(_py - 0.02 * (_g["y1"] - _g["y0"]), _g["y0"] + 30)
+
+        _svg = f"""
+<svg viewBox="0 0 {_g['W']:.0f} {_g['H']:.0f}" preserveAspectRatio="none"
+     style="position:absolute; left:0; top:0; width:100%; height:100%; pointer-events:none">
+  <line x1="{_px:.1f}" y1="{_py:.1f}" x2="{_g['x1']:.1f}" y2="{_py:.1f}" stroke="#666666" stroke-width="1.8" stroke-dasharray="7,4"/>
+  <line x1="{_px:.1f}" y1="{_py:.1f}" x2="{_px:.1f}" y2="{_g['y1']:.1f}" stroke="#666666" stroke-width="1.8" stroke-dasharray="7,4"/>
+  <circle cx="{_px:.1f}" cy="{_py:.1f}" r="6" fill="#444444"/>
+  <text x="{_g['x1'] - 10:.1f}" y="{_g['y0'] + 28:.1f}" text-anchor="end" font-size="19" font-weight="bold"
+        fill="#222222" font-family="DejaVu Sans, sans-serif">f = {f0:.4f}</text>
+  <text x="{_px + 12:.1f}" y="{_ty:.1f}" font-size="15" fill="#333333" font-family="DejaVu Sans, sans-serif">
+    <tspan x="{_px + 12:.1f}">Re={Re0:.2e}</tspan><tspan x="{_px + 12:.1f}" dy="18">ε/D={rr0:.4f}</tspan>
+  </text>
+</svg>"""
+        grafico = mo.Html(f'<div style="position:relative; display:inline-block; max-width:100%">{fondo.text}{_svg}</div>')
+    grafico
+    return (grafico,)
+
+
+@app.cell
+def _(mo):
+    mostrar_diag = mo.ui.switch(value=False, label="Mostrar diagnóstico de rendimiento")
+    mostrar_diag
+    return (mostrar_diag,)
+
+
+@app.cell
+def _(
+    contadores,
+    curvas,
+    f_fanning,
+    geom,
+    grafico,
+    mo,
+    mostrar_diag,
+    muestreo,
+    np,
+    perfil,
+    perfil_chrome,
+    perfil_json,
+    pool_trabajo,
+    rr_lines,
+    time,
+    tol_px,
+    tramos,
+):
+    _ = grafico  # dependencia: el panel se actualiza después de cada redibujo
+    mo.stop(not mostrar_diag.value)
+
+    _por_nombre = {}
+    for _t in tramos:
+        _por_nombre.setdefault(_t["nombre"], []).append(_t["dt"] * 1000)
+    _filas = ["| etapa | n | última (ms) | mediana (ms) | máx (ms) |", "|---|---:|---:|---:|---:|"]
+    for _k, _v in _por_nombre.items():
+        _filas.append(f"| {_k} | {len(_v)} | {_v[-1]:.2f} | {np.median(_v):.2f} | {max(_v):.2f} |")
+    _cont = ["| contador | total |", "|---|---:|"] + [f"| {k} | {v:,} |" for k, v in contadores.items()]
+    _ep = pool_trabajo.estado()
+    _pool = mo.md(
+        f"""
+**Pool de trabajo** ({_ep['tipo']}, {_ep['trabajadores']} trabajadores, compartido entre sesiones)
+
+- En cola / en curso: **{_ep['en_cola']}**
+- Latencia (n={_ep['n']}): p50 {_ep['p50_ms']:.1f} ms · p95 {_ep['p95_ms']:.1f} ms · p99 {_ep['p99_ms']:.1f} ms
+"""
     )
-    ax.text(
-        Re0 * 1.08,
-        min(f0 * 1.02, y_max * 0.98),
-        f"Re={Re0:.2e}\nε/D={rr0:.4f}",
-        color="#333333",
-        fontsize=11,
+
+    # Fidelidad del muestreo adaptativo frente a la grilla fija de 500 puntos, contra una referencia densa.
+    # Error vertical en px fuera del salto laminar-turbulento; el salto se mide como el ancho (px) del tramo que lo cruza.
+    # Las referencias pasan por f_fanning, que cuenta sus llamadas: se calculan fuera de los contadores.
+    _t_verif = time.perf_counter()
+    _g = geom
+    _px_y = (_g["y1"] - _g["y0"]) / (_g["ly"][1] - _g["ly"][0])
+    _px_x = (_g["x1"] - _g["x0"]) / (_g["lx"][1] - _g["lx"][0])
+    _x_ref = np.linspace(3.0, 8.0, 20001)
+    _x_fijo = np.linspace(3.0, 8.0, 500)
+    _x_salto = np.log10(2300)
+    _lejos = np.abs(_x_ref - _x_salto) > 2 / _px_x
+    _fid = [
+        f"| ε/D | puntos adapt. | evaluados | error máx adapt. (px) | error máx fijo-500 (px) | salto adapt. (px) | salto fijo (px) |",
+        "|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    with perfil.sin_contar():
+        for _rr, (_Re, _f), _st in zip(rr_lines, curvas, muestreo):
+            _f_ref = f_fanning(10.0**_x_ref, _rr)
+            _xa = np.log10(_Re)
+            _e_a = np.abs(np.interp(_x_ref, _xa, _f) - _f_ref)[_lejos].max() * _px_y
+            _e_f = np.abs(np.interp(_x_ref, _x_fijo, f_fanning(10.0**_x_fijo, _rr)) - _f_ref)[_lejos].max() * _px_y
+            _s_a, _s_f = (np.diff(_x[np.searchsorted(_x, _x_salto) - 1 :][:2])[0] * _px_x for _x in (_xa, _x_fijo))
+            _fid.append(
+                f"| {_rr:.0e} | {_f.size} | {_st['evaluaciones']} | {_e_a:.3f} | {_e_f:.3f} | {_s_a:.2f} | {_s_f:.2f} |"
+            )
+    _t_verif = time.perf_counter() - _t_verif
+    _fidelidad = mo.md(
+        f"**Muestreo adaptativo** (tolerancia {tol_px} px; `evaluados` = puntos nuevos, el resto sale de la caché; "
+        f"esta verificación tomó {_t_verif * 1000:.0f} ms y no entra en los contadores)"
+        + chr(10) * 2
+        + chr(10).join(_fid)
     )
 
-    ax.legend(loc="upper center")
-    fig
+    mo.accordion(
+        {
+            "🔎 Diagnóstico de rendimiento": mo.vstack(
+                [
+                    mo.hstack([mo.md(chr(10).join(_filas)), mo.md(chr(10).join(_cont)), _pool], justify="start", gap="3rem"),
+                    _fidelidad,
+                    mo.hstack(
+                        [
+                            mo.download(lambda: perfil_json().encode(), filename="perfil_moody.json", label="JSON"),
+                            mo.download(lambda: perfil_chrome().encode(), filename="traza_moody.json", label="Chrome trace"),
+                        ],
+                        justify="start",
+                    ),
+                ]
+            )
+        }
+    )
     return
 
 
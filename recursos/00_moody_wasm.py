@@ -0,0 +1,284 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    # Solo biblioteca estándar: en el navegador (Pyodide) no se descargan numpy ni matplotlib
+    import marimo as mo
+    import math
+    import struct
+    import sys
+    return math, mo, struct, sys
+
+
+@app.cell
+def _(mo):
+    re_slider = mo.ui.slider(1e3, 1e8, value=1e5, step=1000, label="Re (slider)")
+    re_manual = mo.ui.number(value=1e5, label="Re (manual)")
+
+    rr_slider = mo.ui.slider(0.000001, 0.05, value=0.001, step=0.000001, label="ε/D (slider)")
+    rr_manual = mo.ui.number(value=0.001, label="ε/D (manual)")
+
+    use_manual = mo.ui.switch(value=False, label="Usar entradas manuales")
+
+    mo.vstack(
+        [
+            use_manual,
+            mo.hstack([re_slider, re_manual], widths=[1, 1]),
+            mo.hstack([rr_slider, rr_manual], widths=[1, 1]),
+        ]
+    )
+    return re_manual, re_slider, rr_manual, rr_slider, use_manual
+
+
+@app.cell
+def _(math):
+    _K = 2.0 / math.log(10.0)
+
+    def f_fanning(Re, rr):
+        # Copia escalar de friccion_derivadas (11_sensibilidades) sin numpy: laminar 16/Re; turbulento Colebrook
+        # con 3 pasos de Newton desde Swamee-Jain
+        if Re < 2300:
+            return 16.0 / Re
+        rr = max(rr, 1e-12)
+        x = -2.0 * math.log10(rr / 3.7 + 5.74 / Re**0.9)
+        for _ in range(3):
+            A = rr / 3.7 + 2.51 * x / Re
+            x -= (x + 2.0 * math.log10(A)) / (1.0 + _K * 2.51 / (Re * A))
+        return 0.25 / (x * x)
+
+    def muestrear(fn, x0, x1, tol, n_ini=17, niveles=8):
+        # Copia en Python puro de muestreo.muestreo_adaptativo (sin caché): se divide donde el punto medio se aparta
+        # de la cuerda
+        xs = [x0 + (x1 - x0) * k / (n_ini - 1) for k in range(n_ini)]
+        ys = [fn(x) for x in xs]
+        puntos = [(xs[0], ys[0])]
+
+        def refinar(xa, ya, xb, yb, nivel):
+            xm = 0.5 * (xa + xb)
+            ym = fn(xm)
+            if nivel < niveles and abs(ym - 0.5 * (ya + yb)) > tol:
+                refinar(xa, ya, xm, ym, nivel + 1)
+                puntos.append((xm, ym))
+                refinar(xm, ym, xb, yb, nivel + 1)
+
+        for k in range(n_ini - 1):
+            refinar(xs[k], ys[k], xs[k + 1], ys[k + 1], 0)
+            puntos.append((xs[k + 1], ys[k + 1]))
+        return puntos
+
+    return f_fanning, muestrear
+
+
+@app.cell
+def _(f_fanning, mo, muestrear, struct, sys):
+    rr_lineas_base = (1e-5, 1e-4, 1e-3, 1e-2, 3e-2, 5e-2)
+    nombre_asset = "moody_curvas.bin"
+    _MAGIA = b"MOODY1"
+
+    def calcular_curvas(rr_lineas=rr_lineas_base, tol=0.25 * 0.03 / 574.0):
+        # Curvas (log10 Re, f) con tolerancia de 1/4 de píxel, como el fondo de 00_moody
+        return {rr: muestrear(lambda x, rr=rr: f_fanning(10.0**x, rr), 3.0, 8.0, tol) for rr in rr_lineas}
+
+    def empaquetar_curvas(curvas):
+        # Binario little-endian: magia, n_curvas; por curva: ε/D (f8), n (u2) y n pares (log10 Re, f) en f4
+        partes = [_MAGIA, struct.pack("<H", len(curvas))]
+        for rr, puntos in curvas.items():
+            partes.append(struct.pack("<dH", rr, len(puntos)))
+            partes.append(struct.pack(f"<{2 * len(puntos)}f", *(v for p in puntos for v in p)))
+        return b"".join(partes)
+
+    def desempaquetar_curvas(datos):
+        if datos[:6] != _MAGIA:
+            raise ValueError("asset de curvas de Moody no reconocido")
+        (n,) = struct.unpack_from("<H", datos, 6)
+        pos, curvas = 8, {}
+        for _ in range(n):
+            rr, m = struct.unpack_from("<dH", datos, pos)
+            pos += 10
+            v = struct.unpack_from(f"<{2 * m}f", datos, pos)
+            pos += 8 * m
+            curvas[rr] = list(zip(v[::2], v[1::2]))
+        return curvas
+
+    async def leer_asset(nombre=nombre_asset):
+        # Local: public/ junto al notebook. En Pyodide: se pide al servidor que publica el notebook
+        ubicacion = mo.notebook_location()
+        if ubicacion is None:
+            return None
+        if sys.platform == "emscripten":
+            from pyodide.http import pyfetch
+
+            try:
+                r = await pyfetch(str(ubicacion / "public" / nombre))
+                return await r.bytes() if r.ok else None
+            except OSError:
+                return None
+        ruta = ubicacion / "public" / nombre
+        return ruta.read_bytes() if ruta.exists() else None
+
+    return calcular_curvas, desempaquetar_curvas, empaquetar_curvas, leer_asset, nombre_asset, rr_lineas_base
+
+
+@app.cell
+async def _(calcular_curvas, desempaquetar_curvas, leer_asset):
+    # Sin asset (p. ej. abierto desde MoLab) se calculan las mismas curvas en Python puro
+    _datos = await leer_asset()
+    if _datos is not None:
+        curvas = desempaquetar_curvas(_datos)
+        origen_curvas = f"asset de {len(_datos) / 1024:.1f} kB"
+    else:
+        curvas = calcular_curvas()
+        origen_curvas = "calculadas al abrir (sin asset)"
+    return curvas, origen_curvas
+
+
+@app.cell
+def _(math, muestrear):
+    # Geometría del área de ejes (px, origen arriba a la izquierda), la misma de 00_moody
+    geom = {"W": 1100, "H": 700, "x0": 99.0, "x1": 968.0, "y0": 56.0, "y1": 630.0, "lx": (3.0, 8.0), "ly": (0.0, 0.03)}
+
+    def a_px(lx, f, g=geom):
+        px = g["x0"] + (lx - g["lx"][0]) / (g["lx"][1] - g["lx"][0]) * (g["x1"] - g["x0"])
+        py = g["y1"] - (f - g["ly"][0]) / (g["ly"][1] - g["ly"][0]) * (g["y1"] - g["y0"])
+        return px, py
+
+    def _polilinea(puntos, color, ancho):
+        pts = " ".join("%.1f,%.1f" % a_px(x, f) for x, f in puntos)
+        return f'<polyline points="{pts}" fill="none" stroke="{color}" stroke-width="{ancho}" stroke-linejoin="round"/>'
+
+    def _texto(x, y, s, tam=12, ancla="middle", extra=""):
+        return f'<text x="{x:.1f}" y="{y:.1f}" font-size="{tam}" text-anchor="{ancla}" fill="#222" {extra}>{s}</text>'
+
+    def svg_fondo(curvas, g=geom):
+        # Fondo fijo del diagrama en SVG (reemplaza el PNG de matplotlib de 00_moody)
+        x0, x1, y0, y1 = g["x0"], g["x1"], g["y0"], g["y1"]
+        el = [f'<rect x="{x0}" y="{y0}" width="{x1 - x0}" height="{y1 - y0}" fill="white"/>']
+        xl = a_px(math.log10(2300), 0)[0]
+        el.append(f'<rect x="{x0}" y="{y0}" width="{xl - x0:.1f}" height="{y1 - y0}" fill="#d9d9d9" fill-opacity="0.25"/>')
+        el.append(_texto(a_px(math.log10(1300), 0)[0], a_px(0, 0.0285)[1], "Régimen laminar", 11, "start", 'fill="#555"'))
+
+        # Grilla y marcas: décadas y subdivisiones logarítmicas en x; cada 0.005 en y
+        for d in range(3, 9):
+            for m in range(1, 10) if d < 8 else (1,):
+                px = a_px(d + math.log10(m), 0)[0]
+                el.append(f'<line x1="{px:.1f}" y1="{y0}" x2="{px:.1f}" y2="{y1}" stroke="#bbb" stroke-dasharray="4,3" stroke-width="{0.8 if m == 1 else 0.4}"/>')
+            el.append(_texto(a_px(d, 0)[0], y1 + 22, f"10<tspan dy='-7' font-size='10'>{d}</tspan>"))
+        for k in range(7):
+            py = a_px(0, 0.005 * k)[1]
+            el.append(f'<line x1="{x0}" y1="{py:.1f}" x2="{x1}" y2="{py:.1f}" stroke="#bbb" stroke-dasharray="4,3" stroke-width="0.6"/>')
+            el.append(_texto(x0 - 8, py + 4, f"{0.005 * k:.3f}", ancla="end"))
+
+        for rr, puntos in curvas.items():
+            el.append(_polilinea(puntos, "steelblue", 1.2))
+            # Eje derecho: ε/D en el valor totalmente rugoso de cada curva
+            f_rugoso = 0.25 / (-2 * math.log10(rr / 3.7)) ** 2
+            el.append(_texto(x1 + 8, a_px(0, f_rugoso)[1] + 4, f"{rr:.1e}", ancla="start"))
+        laminar = muestrear(lambda x: 16.0 / 10.0**x, 3.0, math.log10(2300), 0.25 * 0.03 / 574.0)
+        el.append(_polilinea(laminar, "black", 2.0))
+
+        el.append(f'<rect x="{x0}" y="{y0}" width="{x1 - x0}" height="{y1 - y0}" fill="none" stroke="#222"/>')
+        el.append(_texto((x0 + x1) / 2, 38, "Diagrama de Moody (Fanning)", 18, extra='font-weight="bold"'))
+        el.append(_texto((x0 + x1) / 2, y1 + 52, "Número de Reynolds, Re", 14))
+        el.append(_texto(28, (y0 + y1) / 2, "Factor de fricción de Fanning, f", 14, extra=f'transform="rotate(-90 28 {(y0 + y1) / 2})"'))
+        el.append(_texto(1080, (y0 + y1) / 2, "Rugosidad relativa, ε/D", 14, extra=f'transform="rotate(90 1080 {(y0 + y1) / 2})"'))
+        el.append(f'<line x1="{(x0 + x1) / 2 - 95}" y1="{y0 + 20}" x2="{(x0 + x1) / 2 - 65}" y2="{y0 + 20}" stroke="black" stroke-width="2"/>')
+        el.append(_texto((x0 + x1) / 2 - 58, y0 + 24, "Laminar: f = 16/Re", 12, "start"))
+        return "\n".join(el)
+
+    return a_px, geom, svg_fondo
+
+
+@app.cell
+def _(curvas, svg_fondo):
+    fondo = svg_fondo(curvas)
+    return (fondo,)
+
+
+@app.cell
+def _(
+    a_px,
+    f_fanning,
+    fondo,
+    geom,
+    math,
+    mo,
+    re_manual,
+    re_slider,
+    rr_manual,
+    rr_slider,
+    use_manual,
+):
+    # Camino liviano: solo el punto y los valores cambian con los sliders
+    Re0 = float(re_manual.value if use_manual.value else re_slider.value)
+    rr0 = float(rr_manual.value if use_manual.value else rr_slider.value)
+    Re0 = min(max(Re0, 1e3), 1e8)
+    rr0 = min(max(rr0, 1e-6), 0.05)
+    f0 = f_fanning(Re0, rr0)
+
+    _g = geom
+    _px, _py = a_px(math.log10(Re0), min(max(f0, _g["ly"][0]), _g["ly"][1]))
+    _ty = max(_py - 0.02 * (_g["y1"] - _g["y0"]), _g["y0"] + 30)
+    grafico = mo.Html(
+        f"""
+<svg viewBox="0 0 {_g['W']} {_g['H']}" style="width:100%; max-width:{_g['W']}px; font-family:DejaVu Sans, sans-serif">
+{fondo}
+  <line x1="{_px:.1f}" y1="{_py:.1f}" x2="{_g['x1']:.1f}" y2="{_py:.1f}" stroke="#666666" stroke-width="1.8" stroke-dasharray="7,4"/>
+  <line x1="{_px:.1f}" y1="{_py:.1f}" x2="{_px:.1f}" y2="{_g['y1']:.1f}" stroke="#666666" stroke-width="1.8" stroke-dasharray="7,4"/>
+  <circle cx="{_px:.1f}" cy="{_py:.1f}" r="6" fill="#444444"/>
+  <text x="{_g['x1'] - 10:.1f}" y="{_g['y0'] + 28:.1f}" text-anchor="end" font-size="19" font-weight="bold" fill="#222222">f = {f0:.4f}</text>
+  <text x="{_px + 12:.1f}" y="{_ty:.1f}" font-size="15" fill="#333333">
+    <tspan x="{_px + 12:.1f}">Re={Re0:.2e}</tspan><tspan x="{_px + 12:.1f}" dy="18">ε/D={rr0:.4f}</tspan>
+  </text>
+</svg>"""
+    )
+    grafico
+    return f0, grafico
+
+
+@app.cell
+def _(mo, nombre_asset, origen_curvas):
+    mo.md(
+        rf"""
+# Diagrama de Moody — versión liviana para el navegador (WASM)
+
+Misma física que `00_moody.py` (factor de **Fanning**, $f_F = 16/Re$ en laminar, Colebrook-White en turbulento),
+pensada para abrirse en Pyodide:
+
+- Solo biblioteca estándar: sin `numpy` ni `matplotlib`, que dominan la descarga y el arranque en el navegador.
+- El diagrama es SVG generado en Python; el punto se calcula con Colebrook escalar (3 pasos de Newton).
+- Las curvas de fondo vienen de `public/{nombre_asset}` (pares $\log_{{10}} Re$, $f$ en float32).
+  Si el asset no está disponible se calculan al abrir, con el mismo muestreo adaptativo.
+- `f_fanning` y `muestrear` son **copias en Python puro** de `friccion_derivadas` (`11_sensibilidades.py`, sin las
+  derivadas) y de `muestreo_adaptativo` (`muestreo.py`, sin caché): numpy no está disponible aquí. Si cambia el
+  original hay que cambiar la copia; `test_curvas_iguales_a_00_moody` compara las curvas de ambos notebooks.
+
+Curvas: **{origen_curvas}**.
+"""
+    )
+    return
+
+
+@app.cell
+def _(mo, nombre_asset, sys):
+    # Regenerar el asset (solo local; en el navegador no hay disco donde escribir)
+    regenerar = mo.ui.run_button(label="Regenerar public/" + nombre_asset, disabled=sys.platform == "emscripten")
+    regenerar
+    return (regenerar,)
+
+
+@app.cell
+def _(calcular_curvas, empaquetar_curvas, mo, nombre_asset, regenerar):
+    mo.stop(not regenerar.value)
+    _ruta = mo.notebook_dir() / "public" / nombre_asset
+    _ruta.parent.mkdir(exist_ok=True)
+    _ruta.write_bytes(empaquetar_curvas(calcular_curvas()))
+    mo.md(f"Escrito `{_ruta}` ({_ruta.stat().st_size:,} bytes).")
+    return
+
+
+if __name__ == "__main__":
+    app.run()
@@ -94,7 +94,7 @@ def _(math):
 
 
 @app.cell
-def _(colebrook_f, math):
+def _(colebrook_f, math, np):
     # Datos
     Q1 = 0.35
     L1 = 150.0
@@ -103,35 +103,37 @@ def _(colebrook_f, math):
     nu = 1.65e-5
     eps = 1.5e-6
 
-    # Iteración parte (a)
+    # Iteración parte (a); resultados en columnas (un arreglo por variable)
     n_iter = 5
     f_guess_a = 0.02
-    rows_a = []
+    res_a = {k: np.empty(n_iter) for k in ("f_sup", "Re", "f_corr", "D", "V")}
+    res_a["iteracion"] = np.arange(1, n_iter + 1)
 
-    for _i_a in range(1, n_iter + 1):
+    for _k in range(n_iter):
         D = ((8.0 * f_guess_a * L1 * Q1 * Q1) / (g * math.pi * math.pi * h)) ** (1.0 / 5.0)
         V = 4.0 * Q1 / (math.pi * D * D)
         Re = V * D / nu
         rr = eps / D
         f_corr_a = colebrook_f(Re, rr, f0=f_guess_a, n=35)
-        rows_a.append((_i_a, f_guess_a, Re, f_corr_a, D, V))
+        for _c, _v in zip(("f_sup", "Re", "f_corr", "D", "V"), (f_guess_a, Re, f_corr_a, D, V)):
+            res_a[_c][_k] = _v
         f_guess_a = f_corr_a
 
-    D_min = rows_a[-1][4]
-    V1 = rows_a[-1][5]
-    Re1 = rows_a[-1][2]
-    f1 = rows_a[-1][3]
+    D_min = float(res_a["D"][-1])
+    V1 = float(res_a["V"][-1])
+    Re1 = float(res_a["Re"][-1])
+    f1 = float(res_a["f_corr"][-1])
 
-    return D_min, L1, Q1, Re1, V1, f1, g, h, n_iter, nu, eps, rows_a
+    return D_min, L1, Q1, Re1, V1, f1, g, h, n_iter, nu, eps, res_a
 
 
 @app.cell
-def _(D_min, L1, Q1, Re1, V1, f1, mo, rows_a):
+def _(D_min, L1, Q1, Re1, V1, f1, mo, res_a):
     table_a = [
         "| iteración | f (suposición) | Re | f (corregido) |",
         "|---:|---:|---:|---:|",
     ]
-    for _i, _fg, _re, _fc, _, _ in rows_a:
+    for _i, _fg, _re, _fc in zip(res_a["iteracion"], res_a["f_sup"], res_a["Re"], res_a["f_corr"]):
         table_a.append(f"| {_i} | {_fg:.6f} | {_re:.3e} | {_fc:.6f} |")
 
     mo.md(
@@ -142,7 +144,7 @@ En esta primera parte buscamos el diámetro mínimo del ducto que permita transp
 
 {chr(10).join(table_a)}
 
-**Valores convergidos (iteración {rows_a[-1][0]}):**
+**Valores convergidos (iteración {res_a['iteracion'][-1]}):**
 
 - $D_{{\min}} \approx {D_min:.4f}\ \text{{m}}$
 - $V \approx {V1:.3f}\ \text{{m/s}}$
@@ -156,36 +158,38 @@ Interpretación: el ducto mínimo para cumplir $h_f\le 20\,\text{{m}}$ a $Q=0.35
 
 
 @app.cell
-def _(D_min, Q1, colebrook_f, g, h, math, nu, eps):
+def _(D_min, Q1, colebrook_f, g, h, math, np, nu, eps):
     # Parte (b): L se duplica, D constante, h constante -> hallar Q2
     L2 = 300.0
     n_iter_b = 5
     f_guess_b = 0.02
-    rows_b = []
+    res_b = {k: np.empty(n_iter_b) for k in ("f_sup", "Re", "f_corr", "Q", "V")}
+    res_b["iteracion"] = np.arange(1, n_iter_b + 1)
 
-    for _i_b in range(1, n_iter_b + 1):
+    for _k in range(n_iter_b):
         Q2 = (math.pi * D_min * D_min / 4.0) * math.sqrt((2.0 * g * h * D_min) / (f_guess_b * L2))
         V2 = 4.0 * Q2 / (math.pi * D_min * D_min)
         Re2 = V2 * D_min / nu
         rr2 = eps / D_min
         f_corr_b = colebrook_f(Re2, rr2, f0=f_guess_b, n=35)
-        rows_b.append((_i_b, f_guess_b, Re2, f_corr_b, Q2, V2))
+        for _c, _v in zip(("f_sup", "Re", "f_corr", "Q", "V"), (f_guess_b, Re2, f_corr_b, Q2, V2)):
+            res_b[_c][_k] = _v
         f_guess_b = f_corr_b
 
-    Q2_final = rows_b[-1][4]
+    Q2_final = float(res_b["Q"][-1])
     drop = Q1 - Q2_final
     drop_pct = 100.0 * drop / Q1
 
-    return L2, Q2_final, drop, drop_pct, rows_b
+    return L2, Q2_final, drop, drop_pct, res_b
 
 
 @app.cell
-def _(L2, Q2_final, drop, drop_pct, mo, rows_b):
+def _(L2, Q2_final, drop, drop_pct, mo, res_b):
     table_b = [
         "| iteración | f (suposición) | Re | f (corregido) |",
         "|---:|---:|---:|---:|",
     ]
-    for _i, _fg, _re, _fc, _, _ in rows_b:
+    for _i, _fg, _re, _fc in zip(res_b["iteracion"], res_b["f_sup"], res_b["Re"], res_b["f_corr"]):
         table_b.append(f"| {_i} | {_fg:.6f} | {_re:.3e} | {_fc:.6f} |")
 
     mo.md(
@@ -207,14 +211,9 @@ Se usa $L_2 = {L2:.0f}\,\text{{m}}$ y se itera para encontrar el nuevo caudal.
 
 
 @app.cell
-def _(np, plt, rows_a, rows_b):
-    it_a = np.array([r[0] for r in rows_a])
-    fg_a = np.array([r[1] for r in rows_a])
-    fc_a = np.array([r[3] for r in rows_a])
-
-    it_b = np.array([r[0] for r in rows_b])
-    fg_b = np.array([r[1] for r in rows_b])
-    fc_b = np.array([r[3] for r in rows_b])
+def _(plt, res_a, res_b):
+    it_a, fg_a, fc_a = res_a["iteracion"], res_a["f_sup"], res_a["f_corr"]
+    it_b, fg_b, fc_b = res_b["iteracion"], res_b["f_sup"], res_b["f_corr"]
 
     fig, ax = plt.subplots(1, 2, figsize=(12, 4.5), constrained_layout=True)
 
@@ -7,9 +7,15 @@ app = marimo.App(width="full")
 @app.cell
 def _():
     import marimo as mo
+    import sys
     import numpy as np
     import matplotlib.pyplot as plt
-    return mo, np, plt
+
+    # Módulo compartido de recursos/ (también lo usa 00_moody): muestreo adaptativo y su caché
+    if str(mo.notebook_dir()) not in sys.path:
+        sys.path.insert(0, str(mo.notebook_dir()))
+    from muestreo import cache_curva, muestreo_adaptativo
+    return cache_curva, mo, muestreo_adaptativo, np, plt
 
 
 @app.cell
@@ -25,6 +31,9 @@ Este recurso muestra en un solo gráfico (mismo eje X) las curvas típicas de un
 - **Potencia al eje** $P(Q)$
 - **NPSHr**
 
+Las curvas se muestrean de forma adaptativa (más puntos solo donde se apartan de la cuerda más de 1/4 de píxel)
+y terminan exactamente en $H = 0$ cuando ese corte cae dentro del rango de caudal.
+
 ## Ecuaciones base (modelo didáctico)
 
 1) Curva de carga (aproximada):
@@ -116,34 +125,58 @@ def _(mo):
 
 
 @app.cell
-def _(np, D_ref, D, Qmax_ref, H0, a, b, eta_max, Qbep_ref, k_eta, eta_m, rho, npsh0, c_npsh):
-    g = 9.81
+def _(np):
+    def curvas_bomba(Q_ref, rD, H0, a, b, eta_max, Qbep_ref, k_eta, eta_m, rho, npsh0, c_npsh, g=9.81):
+        # Curvas de referencia (Q en m3/h)
+        H_ref = H0 - a * Q_ref - b * (Q_ref**2)
 
-    rD = max(D.value / D_ref.value, 1e-6)
+        eta_ref = eta_max - k_eta * (Q_ref - Qbep_ref) ** 2
+        eta_ref = np.clip(eta_ref, 0.05, 0.9)
+
+        NPSHr_ref = npsh0 + c_npsh * (Q_ref**2)
+
+        # Escalado por diámetro
+        Q = Q_ref * rD
+        H = H_ref * (rD**2)
+        eta = eta_ref  # aproximación didáctica
+        NPSHr = NPSHr_ref * (rD**2)
 
-    Q_ref = np.linspace(0.0, Qmax_ref.value, 240)  # m3/h
-    H_ref = H0.value - a.value * Q_ref - b.value * (Q_ref**2)
+        # Potencia eje
+        Q_m3s = Q / 3600.0
+        P_eje_W = rho * g * Q_m3s * np.maximum(H, 0.0) / np.clip(eta * eta_m, 0.05, 1.0)
+        P_eje_kW = P_eje_W / 1000.0
+        return Q, H, eta, NPSHr, P_eje_kW
 
-    eta_ref = eta_max.value - k_eta.value * (Q_ref - Qbep_ref.value) ** 2
-    eta_ref = np.clip(eta_ref, 0.05, 0.9)
+    def caudal_corte(H0, a, b, Q_max):
+        # Raíz no negativa de H0 - aQ - bQ² = 0 (fin útil de la curva), acotada por Q_max
+        r = np.roots([-b, -a, H0]) if H0 > 0 else np.array([0.0])
+        r = r[np.isreal(r) & (r.real >= 0)].real
+        return float(min(Q_max, r.min())) if r.size else float(Q_max)
 
-    NPSHr_ref = npsh0.value + c_npsh.value * (Q_ref**2)
+    return caudal_corte, curvas_bomba
 
-    # Escalado por diámetro
-    Q = Q_ref * rD
-    H = H_ref * (rD**2)
-    eta = eta_ref  # aproximación didáctica
-    NPSHr = NPSHr_ref * (rD**2)
 
-    # Potencia eje
-    Q_m3s = Q / 3600.0
-    P_eje_W = rho.value * g * Q_m3s * np.maximum(H, 0.0) / np.clip(eta * eta_m.value, 0.05, 1.0)
-    P_eje_kW = P_eje_W / 1000.0
+@app.cell
+def _(np, cache_curva, caudal_corte, curvas_bomba, muestreo_adaptativo, D_ref, D, Qmax_ref, H0, a, b, eta_max, Qbep_ref, k_eta, eta_m, rho, npsh0, c_npsh):
+    rD = max(D.value / D_ref.value, 1e-6)
+    coef = (H0.value, a.value, b.value, eta_max.value, Qbep_ref.value, k_eta.value, eta_m.value, rho.value, npsh0.value, c_npsh.value)
+
+    # La curva termina exactamente donde H = 0 (raíz positiva de H0 - aQ - bQ²), sin recortar con máscara
+    Q_corte = caudal_corte(H0.value, a.value, b.value, Qmax_ref.value)
 
-    mask = H > 0
-    Q, H, eta, NPSHr, P_eje_kW = Q[mask], H[mask], eta[mask], NPSHr[mask], P_eje_kW[mask]
+    # Muestreo adaptativo en las curvas de referencia (rD = 1): las leyes de afinidad solo escalan los ejes,
+    # así que los puntos elegidos sirven para cualquier D y la caché se indexa sin D.
+    # Tolerancia: 1/4 de píxel del rango de cada curva sobre el alto del área de ejes (6.5 in · 100 dpi · 0.77)
+    def _ref(q):
+        return np.stack(curvas_bomba(q, 1.0, *coef)[1:])
+
+    _rango = np.ptp(_ref(np.linspace(0.0, Q_corte, 17)), axis=1)
+    Q_ref, _, muestreo = muestreo_adaptativo(
+        _ref, 0.0, Q_corte, 0.25 * np.maximum(_rango, 1e-12) / (6.5 * 100 * 0.77), cache=cache_curva(("02_pumps",) + coef)
+    )
+    Q, H, eta, NPSHr, P_eje_kW = curvas_bomba(Q_ref, rD, *coef)
 
-    return Q, H, eta, NPSHr, P_eje_kW, rD
+    return Q, H, eta, NPSHr, P_eje_kW, Q_corte, Q_ref, muestreo, rD
 
 
 @app.cell
@@ -0,0 +1,323 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import time
+    import numpy as np
+    import matplotlib.pyplot as plt
+
+    try:
+        import scipy.sparse as sp
+        import scipy.sparse.linalg as spla
+    except ImportError:  # sin SciPy se usa álgebra densa (solo redes pequeñas)
+        sp = None
+        spla = None
+    return mo, np, plt, sp, spla, time
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 03_redes — Redes de tuberías malladas (Newton global)
+
+Se resuelve una red de distribución con mallas: caudales $Q_p$ en cada tubería y cargas $H_n$ en cada nodo,
+dados los niveles de los estanques (nodos de carga fija) y las demandas $q_n$ en los nodos de consumo.
+
+## Ecuaciones
+
+Pérdida por fricción en cada tubería (Darcy-Weisbach, con signo):
+
+$$
+h_p = r_p\,Q_p|Q_p|, \qquad r_p = \frac{8 f_p L_p}{g\pi^2 D_p^5}
+$$
+
+con $f_p$ de Colebrook-White evaluado con $Re_p = \dfrac{4|Q_p|}{\pi D_p \nu}$ (laminar: $f = 64/Re$ bajo $Re = 2000$,
+interpolación lineal en la transición $2000 < Re < 4000$).
+
+Energía en cada tubería que va del nodo $i$ al nodo $j$:
+
+$$
+h_p(Q_p) - (H_i - H_j) = 0
+$$
+
+Continuidad en cada nodo de consumo (entradas menos salidas igual a la demanda):
+
+$$
+\sum_{p\,\to\,n} Q_p - \sum_{p\,\leftarrow\,n} Q_p = q_n
+$$
+
+## Método del gradiente (Newton-Raphson global)
+
+Con la matriz de incidencia $A$ (tuberías × nodos) y $D = \operatorname{diag}\left(\dfrac{\partial h_p}{\partial Q_p}\right)
+= \operatorname{diag}\left(\left(2 + \dfrac{d\ln f_p}{d\ln Re_p}\right) r_p |Q_p|\right)$, cada iteración resuelve
+el sistema reducido (simétrico, definido positivo y **disperso**):
+
+$$
+\left(A^T D^{-1} A\right)\Delta H = C - A^T D^{-1} E, \qquad \Delta Q = -D^{-1}\left(E + A\,\Delta H\right)
+$$
+
+donde $E$ es el residuo de energía y $C$ el de continuidad. Los factores de fricción de todas las tuberías
+se actualizan en bloque (vectorizado) en cada iteración.
+"""
+    )
+    return
+
+
+@app.cell
+def _(np):
+    def f_darcy_swamee_jain(Re, rr):
+        return 0.25 / (np.log10(rr / 3.7 + 5.74 / (Re**0.9)) ** 2)
+
+    def f_darcy(Re, rr, it=4):
+        # Colebrook vectorizado (semilla Swamee-Jain), laminar 64/Re y transición
+        # lineal 2000–4000. Devuelve también d ln f / d ln Re para el jacobiano.
+        Re = np.maximum(np.asarray(Re, dtype=float), 1.0)
+        rr = np.maximum(np.asarray(rr, dtype=float), 1e-12)
+        Re_t = np.maximum(Re, 4000.0)
+        fD = np.maximum(f_darcy_swamee_jain(Re_t, rr), 1e-6)
+        for _ in range(it):
+            inv = -2 * np.log10(rr / 3.7 + 2.51 / (Re_t * np.sqrt(fD)))
+            fD = 1 / (inv**2)
+        x = 1 / np.sqrt(fD)
+        s = rr / 3.7 + 2.51 * x / Re_t
+        c = 2 * 2.51 / (np.log(10) * Re_t * s)
+        dlnf = -2 * c / (1 + c)
+
+        f_lam = 64 / Re
+        f_2000 = 64 / 2000.0
+        f_tr = f_2000 + (fD - f_2000) * (Re - 2000.0) / 2000.0
+        trans = (Re >= 2000) & (Re < 4000)
+        f = np.where(Re < 2000, f_lam, np.where(trans, f_tr, fD))
+        dlnf = np.where(Re < 2000, -1.0, np.where(trans, Re * (fD - f_2000) / (2000.0 * f), dlnf))
+        return f, dlnf
+
+    return (f_darcy,)
+
+
+@app.cell
+def _(f_darcy, np, sp, spla, time):
+    def resolver_red(red, nu=1.0e-6, g=9.81, tol=1e-8, max_iter=50):
+        t0 = time.perf_counter()
+
+        i_de = np.asarray(red["desde"], dtype=int)
+        i_a = np.asarray(red["hasta"], dtype=int)
+        L = np.asarray(red["L"], dtype=float)
+        D = np.asarray(red["D"], dtype=float)
+        eps = np.broadcast_to(np.asarray(red["eps"], dtype=float), L.shape)
+        H_fijo = np.asarray(red["H_fijo"], dtype=float)
+        demanda = np.asarray(red["demanda"], dtype=float)
+
+        fijo = ~np.isnan(H_fijo)
+        if not fijo.any():
+            # Sin un nivel de referencia las cargas quedan indeterminadas (el sistema es singular)
+            raise ValueError("La red no tiene nodos de carga fija: 'H_fijo' debe tener al menos un valor no NaN")
+        n_tub = L.size
+        n_inc = int((~fijo).sum())
+        idx = np.full(H_fijo.size, -1)
+        idx[~fijo] = np.arange(n_inc)
+
+        # Incidencia: (A H)_p = H_hasta - H_desde, solo sobre nodos de consumo
+        filas = np.arange(n_tub)
+        m_de = ~fijo[i_de]
+        m_a = ~fijo[i_a]
+        rows = np.concatenate([filas[m_de], filas[m_a]])
+        cols = np.concatenate([idx[i_de[m_de]], idx[i_a[m_a]]])
+        vals = np.concatenate([-np.ones(m_de.sum()), np.ones(m_a.sum())])
+        if sp is not None:
+            A = sp.csr_matrix((vals, (rows, cols)), shape=(n_tub, n_inc))
+            AT = A.T.tocsr()
+        else:
+            A = np.zeros((n_tub, n_inc))
+            np.add.at(A, (rows, cols), vals)
+            AT = A.T
+
+        H0 = np.where(fijo, H_fijo, 0.0)
+        dH_fijo = H0[i_a] - H0[i_de]
+        q = demanda[~fijo]
+
+        k = 8.0 * L / (g * np.pi**2 * D**5)
+        Q = np.pi * D**2 / 4.0  # semilla: v = 1 m/s en el sentido desde→hasta
+        H = np.full(n_inc, H0[fijo].max())
+
+        historial = []
+        convergio = False
+        for it in range(1, max_iter + 1):
+            aQ = np.maximum(np.abs(Q), 1e-10)
+            Re = 4.0 * aQ / (np.pi * D * nu)
+            f, dlnf = f_darcy(Re, eps / D)
+            r = k * f
+            inv_d = 1.0 / np.maximum((2.0 + dlnf) * r * aQ, 1e-12)
+
+            E = r * Q * aQ + A @ H + dH_fijo
+            C = AT @ Q - q
+            rhs = C - AT @ (inv_d * E)
+            if sp is not None:
+                M = (AT @ sp.diags(inv_d) @ A).tocsc()
+                dH = spla.spsolve(M, rhs)
+            else:
+                dH = np.linalg.solve(AT @ (inv_d[:, None] * A), rhs)
+            dQ = -inv_d * (E + A @ dH)
+
+            Q = Q + dQ
+            H = H + dH
+            err = float(np.abs(dQ).sum() / np.abs(Q).sum())
+            historial.append(err)
+            if err < tol:
+                convergio = True
+                break
+
+        H_todos = H0.copy()
+        H_todos[~fijo] = H
+        return {
+            "Q": Q,
+            "H": H_todos,
+            "f": f,
+            "iteraciones": it,
+            "tiempo_s": time.perf_counter() - t0,
+            "convergio": convergio,
+            "historial": historial,
+        }
+
+    return (resolver_red,)
+
+
+@app.cell
+def _(np):
+    # Red de ejemplo: 1 estanque + 6 nodos de consumo, 2 mallas
+    #
+    #   E(0) ── 1 ── 2 ── 3
+    #           |    |    |
+    #           4 ── 5 ── 6
+    xy_ejemplo = np.array([[-1.0, 1.0], [0, 1], [1, 1], [2, 1], [0, 0], [1, 0], [2, 0]])
+    red_ejemplo = {
+        "desde": np.array([0, 1, 2, 1, 2, 3, 4, 5]),
+        "hasta": np.array([1, 2, 3, 4, 5, 6, 5, 6]),
+        "L": np.array([1000.0, 1000, 1000, 1000, 1000, 1000, 1000, 1000]),
+        "D": np.array([0.457, 0.254, 0.152, 0.406, 0.305, 0.102, 0.254, 0.203]),
+        "eps": 1.0e-4,
+        "H_fijo": np.array([210.0] + [np.nan] * 6),
+        "demanda": np.array([0.0, 0.0278, 0.0278, 0.0333, 0.0750, 0.0917, 0.0556]),
+    }
+    return red_ejemplo, xy_ejemplo
+
+
+@app.cell
+def _(mo, np, plt, red_ejemplo, resolver_red, xy_ejemplo):
+    sol_ej = resolver_red(red_ejemplo)
+
+    tabla_ej = [
+        "| tubería | desde → hasta | D (mm) | Q (L/s) | f |",
+        "|---:|:---:|---:|---:|---:|",
+    ]
+    for _p in range(red_ejemplo["L"].size):
+        tabla_ej.append(
+            f"| {_p} | {red_ejemplo['desde'][_p]} → {red_ejemplo['hasta'][_p]} | "
+            f"{red_ejemplo['D'][_p] * 1000:.0f} | {sol_ej['Q'][_p] * 1000:.2f} | {sol_ej['f'][_p]:.5f} |"
+        )
+
+    fig_ej, ax_ej = plt.subplots(figsize=(9, 4.5))
+    _qmax = np.abs(sol_ej["Q"]).max()
+    for _p in range(red_ejemplo["L"].size):
+        _i, _j = red_ejemplo["desde"][_p], red_ejemplo["hasta"][_p]
+        ax_ej.plot(*xy_ejemplo[[_i, _j]].T, color="steelblue", lw=1 + 6 * abs(sol_ej["Q"][_p]) / _qmax)
+    ax_ej.scatter(*xy_ejemplo.T, s=80, color="#444444", zorder=5)
+    for _n, (_x, _y) in enumerate(xy_ejemplo):
+        ax_ej.text(_x, _y + 0.08, f"{_n}: H={sol_ej['H'][_n]:.1f} m", ha="center", fontsize=10)
+    ax_ej.set_title("Red de ejemplo — grosor proporcional a |Q|", fontsize=13, fontweight="bold")
+    ax_ej.set_axis_off()
+
+    mo.vstack(
+        [
+            mo.md(
+                f"""
+## Red de ejemplo
+
+Convergencia en **{sol_ej['iteraciones']} iteraciones** ({sol_ej['tiempo_s'] * 1000:.1f} ms).
+
+{chr(10).join(tabla_ej)}
+"""
+            ),
+            fig_ej,
+        ]
+    )
+    return
+
+
+@app.cell
+def _(np):
+    def red_malla(n, H_estanque=80.0, q_nodo=5.0e-5, seed=0):
+        # Malla n×n de nodos de consumo alimentada por 4 estanques en las esquinas
+        rng = np.random.default_rng(seed)
+        ids = np.arange(n * n).reshape(n, n)
+        h_de, h_a = ids[:, :-1].ravel(), ids[:, 1:].ravel()
+        v_de, v_a = ids[:-1, :].ravel(), ids[1:, :].ravel()
+        esquinas = ids[[0, 0, -1, -1], [0, -1, 0, -1]]
+        estanques = n * n + np.arange(4)
+
+        desde = np.concatenate([h_de, v_de, estanques])
+        hasta = np.concatenate([h_a, v_a, esquinas])
+        n_int = desde.size - 4
+        D = np.concatenate([rng.choice([0.10, 0.15, 0.20, 0.25], n_int), np.full(4, 1.0)])
+        L = np.concatenate([rng.uniform(80.0, 120.0, n_int), np.full(4, 50.0)])
+        H_fijo = np.concatenate([np.full(n * n, np.nan), np.full(4, H_estanque)])
+        demanda = np.concatenate([rng.uniform(0.5, 1.5, n * n) * q_nodo, np.zeros(4)])
+        return {"desde": desde, "hasta": hasta, "L": L, "D": D, "eps": 1.0e-4, "H_fijo": H_fijo, "demanda": demanda}
+
+    return (red_malla,)
+
+
+@app.cell
+def _(mo):
+    n_malla = mo.ui.slider(10, 160, value=60, step=10, label="Nodos por lado de la malla", show_value=True)
+    resolver_btn = mo.ui.run_button(label="Resolver red grande")
+    mo.vstack(
+        [
+            mo.md("## Red grande (prueba de escala)\n\nMalla cuadrada con 4 estanques; 160 nodos por lado son ≈ 51 000 tuberías."),
+            mo.hstack([n_malla, resolver_btn], justify="start", gap="2rem"),
+        ]
+    )
+    return n_malla, resolver_btn
+
+
+@app.cell
+def _(mo, n_malla, plt, red_malla, resolver_btn, resolver_red, sp):
+    mo.stop(not resolver_btn.value, mo.md("*Presiona el botón para resolver.*"))
+
+    _n = int(n_malla.value)
+    red_grande = red_malla(_n)
+    sol_grande = resolver_red(red_grande)
+
+    fig_g, ax_g = plt.subplots(1, 2, figsize=(13, 5), constrained_layout=True)
+    _im = ax_g[0].imshow(sol_grande["H"][: _n * _n].reshape(_n, _n), cmap="viridis", origin="lower")
+    fig_g.colorbar(_im, ax=ax_g[0], label="H (m)")
+    ax_g[0].set_title("Carga en los nodos")
+    ax_g[1].semilogy(range(1, sol_grande["iteraciones"] + 1), sol_grande["historial"], "o-")
+    ax_g[1].set_xlabel("Iteración")
+    ax_g[1].set_ylabel("Σ|ΔQ| / Σ|Q|")
+    ax_g[1].set_title("Convergencia de Newton")
+    ax_g[1].grid(alpha=0.3)
+
+    mo.vstack(
+        [
+            mo.md(
+                f"""
+- Tuberías: **{red_grande['L'].size}**, nodos de consumo: **{_n * _n}**
+- Álgebra: **{'dispersa (scipy.sparse)' if sp is not None else 'densa (sin SciPy)'}**
+- Iteraciones: **{sol_grande['iteraciones']}** ({'convergió' if sol_grande['convergio'] else 'no convergió'})
+- Tiempo de resolución: **{sol_grande['tiempo_s']:.3f} s**
+"""
+            ),
+            fig_g,
+        ]
+    )
+    return
+
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,458 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import hashlib
+    import itertools
+    import os
+    import pickle
+    import tempfile
+    import time
+    import types
+    import zipfile
+    from pathlib import Path
+    import numpy as np
+    import matplotlib.pyplot as plt
+    return Path, hashlib, itertools, mo, np, os, pickle, plt, tempfile, time, types, zipfile
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 04_barrido — Exploración del espacio de diseño
+
+En `bernoulli_bombeo.py` (Ejercicios 1–4) y en `01_iterative.py` los parámetros se varían a mano, un valor a la vez.
+Aquí se evalúa el **producto cartesiano** de rangos completos de parámetros:
+
+- Los puntos de la grilla se recorren por **bloques** (a lo más `bloque` puntos), cada bloque se calcula **vectorizado**.
+- Cada bloque es una **subgrilla** (los ejes finales completos y un tramo del primero que no cabe) y se guarda en
+  disco (`.npz`) con una clave *hash* de los valores que cubre, del tipo de dato y del modelo (código, constantes,
+  parámetros por defecto y valores capturados). Al repetir un barrido, o al ampliar el eje que se corta en
+  tramos, los bloques con la misma subgrilla se leen de la caché; cambiar un eje que va completo en cada bloque
+  (p. ej. otra cantidad de valores de hf) recalcula todo. La caché vive en el directorio temporal del usuario
+  (o en `IIQ2013_CACHE_BARRIDO`), cada bloque se escribe a un temporal y se renombra (otra sesión nunca lee uno
+  a medias) y se poda por antigüedad de uso al superar 512 MB.
+- El resultado son arreglos con la forma de la grilla (listos para mapas de calor) o columnas planas (formato largo).
+- Las columnas se exportan por bloques a Parquet o Arrow (si `pyarrow` está instalado) o a `.npz` comprimido,
+  sin armar la tabla completa en memoria.
+
+## Modelos
+
+Bombeo (Bernoulli, como en `bernoulli_bombeo.py`):
+
+$$
+H_b = z_2 + \frac{v^2}{2g} + h_f, \qquad Q = \frac{\pi D^2}{4} v, \qquad P = \rho g Q H_b
+$$
+
+Ducto (parte (a) de `01_iterative.py`), iteración $D$–$f$ con Colebrook-White:
+
+$$
+D = \left(\frac{8 f L Q^2}{g\pi^2 h_f}\right)^{1/5}
+$$
+"""
+    )
+    return
+
+
+@app.cell
+def _(np):
+    def modelo_bernoulli(z2, v, D_mm, hf, g=9.81, rho=1000.0):
+        Q = np.pi * (D_mm / 1000.0) ** 2 / 4 * v
+        Hb = z2 + v**2 / (2 * g) + hf
+        return {"Hb": Hb, "Q_lps": Q * 1000, "Pb_kW": rho * g * Q * Hb / 1000}
+
+    def modelo_ducto(Q, L, hf, eps=1.5e-6, nu=1.65e-5, g=9.81, n_iter=8):
+        # Iteración D–f de la parte (a) de 01_iterative, para todos los puntos a la vez
+        f = np.full(np.broadcast(Q, L, hf).shape, 0.02)
+        for _ in range(n_iter):
+            D = ((8.0 * f * L * Q * Q) / (g * np.pi**2 * hf)) ** 0.2
+            V = 4.0 * Q / (np.pi * D * D)
+            Re = V * D / nu
+            for _ in range(4):
+                f = 1.0 / (-2.0 * np.log10(eps / D / 3.7 + 2.51 / (Re * np.sqrt(f)))) ** 2
+        return {"D_min": D, "V": V, "Re": Re, "f": f}
+
+    return modelo_bernoulli, modelo_ducto
+
+
+@app.cell
+def _(Path, hashlib, itertools, np, os, pickle, tempfile, time, types, zipfile):
+    # Caché fuera del repositorio (directorio temporal del usuario o IIQ2013_CACHE_BARRIDO),
+    # acotada: al superar el tope se borran los bloques usados hace más tiempo
+    dir_cache = Path(os.environ.get("IIQ2013_CACHE_BARRIDO") or Path(tempfile.gettempdir()) / "iiq2013_barrido")
+    tope_cache_mb = 512
+
+    def _huella(h, obj, vistos):
+        # Valores del modelo (código, constantes, defaults, capturas), nunca direcciones de memoria.
+        # Lo que no se puede reducir a valores levanta TypeError: ese modelo se calcula sin caché.
+        if isinstance(obj, (type(None), bool, int, float, complex, str, bytes)):
+            h.update(f"{type(obj).__name__}:{obj!r};".encode())
+        elif isinstance(obj, (np.ndarray, np.generic)):
+            obj = np.asarray(obj)
+            if obj.dtype.hasobject:
+                raise TypeError("arreglo de objetos")
+            h.update(f"{obj.dtype.str}{obj.shape};".encode())
+            h.update(np.ascontiguousarray(obj).tobytes())
+        elif id(obj) in vistos:  # referencias circulares (funciones recursivas)
+            h.update(b"<ciclo>")
+        elif isinstance(obj, types.CodeType):
+            vistos.add(id(obj))
+            h.update(obj.co_code)
+            _huella(h, obj.co_names, vistos)
+            _huella(h, obj.co_consts, vistos)
+        elif isinstance(obj, types.FunctionType):
+            vistos.add(id(obj))
+            _huella(h, obj.__qualname__, vistos)
+            _huella(h, obj.__code__, vistos)
+            _huella(h, obj.__defaults__, vistos)
+            _huella(h, obj.__kwdefaults__, vistos)
+            _huella(h, [c.cell_contents for c in obj.__closure__ or ()], vistos)
+        elif isinstance(obj, (types.ModuleType, type, types.BuiltinFunctionType, np.ufunc)):
+            h.update(f"{getattr(obj, '__module__', '')}.{obj.__name__};".encode())
+        elif isinstance(obj, (tuple, list)):
+            vistos.add(id(obj))
+            h.update(f"{type(obj).__name__}{len(obj)};".encode())
+            for o in obj:
+                _huella(h, o, vistos)
+        elif isinstance(obj, dict):
+            vistos.add(id(obj))
+            h.update(f"dict{len(obj)};".encode())
+            for k in sorted(obj, key=repr):
+                _huella(h, k, vistos)
+                _huella(h, obj[k], vistos)
+        else:
+            try:  # otros objetos: por su contenido serializado
+                h.update(pickle.dumps(obj, protocol=4))
+            except Exception as e:
+                raise TypeError(f"no se puede fijar la huella de {type(obj).__name__}") from e
+
+    def _huella_modelo(modelo, dtype):
+        # Parte de la clave común a todos los bloques; None si el modelo no admite caché
+        h = hashlib.sha1()
+        try:
+            _huella(h, modelo, set())
+        except TypeError:
+            return None
+        h.update(np.dtype(dtype).str.encode())
+        return h
+
+    def _clave(base, sub_ejes):
+        # Cada bloque se identifica por los valores que cubre: barridos que se solapan comparten bloques
+        h = base.copy()
+        for nombre, valores in sub_ejes.items():
+            h.update(nombre.encode())
+            h.update(np.ascontiguousarray(valores, dtype=float).tobytes())
+        return h.hexdigest()
+
+    def _tramos(forma, bloque):
+        # Subgrillas de a lo más `bloque` puntos: los ejes finales van completos y el primero que no cabe
+        # se corta en tramos; los anteriores van de a un valor
+        paso, resto = [], bloque
+        for n in reversed(forma):
+            paso.insert(0, max(1, min(n, resto)))
+            resto //= n
+        return itertools.product(*[[slice(i, min(i + p, n)) for i in range(0, n, p)] for n, p in zip(forma, paso)])
+
+    def _leer(archivo):
+        try:
+            with np.load(archivo) as datos:
+                res = {k: datos[k] for k in datos.files}
+            os.utime(archivo)
+            return res
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):  # no existe, lo borró otra sesión o está dañado
+            return None
+
+    def _guardar(archivo, res):
+        # Se escribe a un temporal del mismo directorio y se renombra: otra sesión nunca ve un .npz a medias
+        fd, tmp = tempfile.mkstemp(dir=archivo.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **res)
+            os.replace(tmp, archivo)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def podar_cache(directorio, tope_mb=tope_cache_mb):
+        # LRU por fecha de modificación: cada lectura desde la caché la actualiza
+        archivos = []
+        for a in directorio.glob("*.npz"):
+            try:
+                archivos.append((a.stat().st_mtime, a.stat().st_size, a))
+            except FileNotFoundError:  # otra sesión lo borró
+                pass
+        total = sum(t for _, t, _ in archivos)
+        for _, tam, a in sorted(archivos):
+            if total <= tope_mb * 2**20:
+                break
+            a.unlink(missing_ok=True)
+            total -= tam
+
+    def barrer(modelo, ejes, bloque=1_000_000, cache=True, dtype=np.float32):
+        # cache: False (sin caché), True (dir_cache) o el directorio a usar
+        t0 = time.perf_counter()
+        directorio = Path(cache) if not isinstance(cache, bool) else dir_cache
+        nombres = list(ejes)
+        valores = [np.asarray(ejes[n], dtype=float) for n in nombres]
+        forma = tuple(v.size for v in valores)
+        n_total = int(np.prod(forma))
+
+        base = _huella_modelo(modelo, dtype) if cache else None
+        if base is not None:
+            directorio.mkdir(parents=True, exist_ok=True)
+        salidas = None
+        n_bloques = n_cache = 0
+        for tramo in _tramos(forma, bloque):
+            sub = {n: v[t] for n, v, t in zip(nombres, valores, tramo)}
+            archivo = directorio / f"{_clave(base, sub)}.npz" if base is not None else None
+            res = _leer(archivo) if archivo is not None else None
+            if res is not None:
+                n_cache += 1
+            else:
+                mallas = np.meshgrid(*sub.values(), indexing="ij")
+                res = {k: np.asarray(a, dtype=dtype) for k, a in modelo(**{n: m.ravel() for n, m in zip(sub, mallas)}).items()}
+                if archivo is not None:
+                    _guardar(archivo, res)
+            if salidas is None:
+                salidas = {k: np.empty(forma, dtype=dtype) for k in res}
+            for k, a in res.items():
+                salidas[k][tramo] = a.reshape([t.stop - t.start for t in tramo])
+            n_bloques += 1
+        if base is not None:
+            podar_cache(directorio)
+
+        return {
+            "ejes": dict(zip(nombres, valores)),
+            "salidas": salidas,
+            "n_puntos": n_total,
+            "n_bloques": n_bloques,
+            "n_bloques_cache": n_cache,
+            "tiempo_s": time.perf_counter() - t0,
+        }
+
+    def a_columnas(resultado):
+        # Formato largo: una columna por eje y por salida, una fila por punto de la grilla
+        ejes = resultado["ejes"]
+        mallas = np.meshgrid(*ejes.values(), indexing="ij")
+        cols = {n: m.ravel() for n, m in zip(ejes, mallas)}
+        cols.update({k: a.ravel() for k, a in resultado["salidas"].items()})
+        return cols
+
+    return a_columnas, barrer, dir_cache, podar_cache
+
+
+@app.cell
+def _(Path, np, tempfile, time, zipfile):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        pa = pq = None
+
+    def bloques_columnas(resultado, bloque=1_000_000):
+        # Formato largo por bloques: los ejes se generan por índice, las salidas son vistas (sin copia)
+        ejes = resultado["ejes"]
+        forma = tuple(v.size for v in ejes.values())
+        planas = {k: a.reshape(-1) for k, a in resultado["salidas"].items()}
+        n_total = int(np.prod(forma))
+        for i0 in range(0, n_total, bloque):
+            i1 = min(i0 + bloque, n_total)
+            idx = np.unravel_index(np.arange(i0, i1), forma)
+            cols = {n: v[i] for (n, v), i in zip(ejes.items(), idx)}
+            cols.update({k: a[i0:i1] for k, a in planas.items()})
+            yield cols
+
+    def _npz_por_bloques(bloques, ruta, n_total):
+        # Cada columna es un .npy dentro del zip, con el largo total en el encabezado. Un zip admite una sola
+        # entrada abierta a la vez: en una pasada por los bloques cada columna se escribe a su propio .npy
+        # temporal, y después cada archivo se comprime en el zip por partes (memoria acotada a un bloque).
+        with tempfile.TemporaryDirectory() as tmp:
+            archivos = {}
+            try:
+                for cols in bloques:
+                    for nombre, a in cols.items():
+                        if nombre not in archivos:
+                            archivos[nombre] = f = open(Path(tmp) / f"{nombre}.npy", "wb")
+                            np.lib.format.write_array_header_1_0(
+                                f, {"descr": np.lib.format.dtype_to_descr(a.dtype), "fortran_order": False, "shape": (n_total,)}
+                            )
+                        archivos[nombre].write(memoryview(np.ascontiguousarray(a)).cast("B"))
+            finally:
+                for f in archivos.values():
+                    f.close()
+            with zipfile.ZipFile(ruta, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+                for nombre, f in archivos.items():
+                    zf.write(f.name, f"{nombre}.npy")
+
+    def exportar_columnas(resultado, ruta, formato="auto", bloque=1_000_000):
+        t0 = time.perf_counter()
+        if formato == "auto":
+            formato = "parquet" if pa is not None else "npz"
+        if formato in ("parquet", "arrow") and pa is None:
+            raise ImportError(f"El formato '{formato}' requiere pyarrow")
+        ruta = ruta.with_suffix({"parquet": ".parquet", "arrow": ".arrow", "npz": ".npz"}[formato])
+
+        if formato == "npz":
+            _npz_por_bloques(bloques_columnas(resultado, bloque), ruta, resultado["n_puntos"])
+        else:
+            escritor = None
+            try:
+                for cols in bloques_columnas(resultado, bloque):
+                    # pa.array sobre un arreglo numérico contiguo reutiliza su memoria
+                    lote = pa.record_batch([pa.array(a) for a in cols.values()], names=list(cols))
+                    if escritor is None:
+                        escritor = (
+                            pq.ParquetWriter(ruta, lote.schema, compression="zstd")
+                            if formato == "parquet"
+                            else pa.ipc.new_file(ruta, lote.schema)
+                        )
+                    escritor.write_batch(lote)
+            finally:
+                if escritor is not None:
+                    escritor.close()
+
+        return {"ruta": ruta, "formato": formato, "bytes": ruta.stat().st_size, "tiempo_s": time.perf_counter() - t0}
+
+    return bloques_columnas, exportar_columnas, pa
+
+
+@app.cell
+def _(mo):
+    hf_puntos = mo.ui.slider(1, 61, value=7, step=1, label="Valores de hf en el barrido", show_value=True)
+    usar_cache = mo.ui.switch(value=True, label="Usar caché en disco")
+    mo.vstack(
+        [
+            mo.md(
+                "## Barrido del sistema de bombeo\n\n"
+                "Grilla de los sliders de `bernoulli_bombeo.py`: z₂ 5–100 (paso 1), v 0.1–8 (paso 0.1), "
+                "D 25–300 (paso 5) y hf 0–30 (submuestreado)."
+            ),
+            mo.hstack([hf_puntos, usar_cache], justify="start", gap="2rem"),
+        ]
+    )
+    return hf_puntos, usar_cache
+
+
+@app.cell
+def _(barrer, hf_puntos, mo, modelo_bernoulli, np, usar_cache):
+    ejes_bombeo = {
+        "z2": np.arange(5, 101, 1.0),
+        "v": np.round(np.arange(0.1, 8.05, 0.1), 1),
+        "D_mm": np.arange(25, 301, 5.0),
+        "hf": np.linspace(0.0, 30.0, int(hf_puntos.value)),
+    }
+    res_bombeo = barrer(modelo_bernoulli, ejes_bombeo, cache=usar_cache.value)
+
+    mo.md(
+        f"""
+- Puntos evaluados: **{res_bombeo['n_puntos']:,}** en {res_bombeo['n_bloques']} bloques
+  ({res_bombeo['n_bloques_cache']} leídos desde caché)
+- Tiempo total: **{res_bombeo['tiempo_s']:.3f} s**
+"""
+    )
+    return (res_bombeo,)
+
+
+@app.cell
+def _(mo, res_bombeo):
+    _ejes = res_bombeo["ejes"]
+    sel_z2 = mo.ui.slider(steps=list(_ejes["z2"]), value=_ejes["z2"][25], label="z₂ [m]", show_value=True)
+    sel_hf = mo.ui.slider(steps=list(_ejes["hf"]), value=_ejes["hf"][len(_ejes["hf"]) // 2], label="hf [m]", show_value=True)
+    mo.hstack([sel_z2, sel_hf], justify="start", gap="4rem")
+    return sel_hf, sel_z2
+
+
+@app.cell
+def _(np, plt, res_bombeo, sel_hf, sel_z2):
+    _ejes = res_bombeo["ejes"]
+    _i = int(np.argmin(np.abs(_ejes["z2"] - sel_z2.value)))
+    _l = int(np.argmin(np.abs(_ejes["hf"] - sel_hf.value)))
+
+    fig_b, ax_b = plt.subplots(1, 2, figsize=(14, 5.5), constrained_layout=True)
+    for _ax, _k, _titulo in zip(ax_b, ["Pb_kW", "Q_lps"], ["Potencia hidráulica P [kW]", "Caudal Q [L/s]"]):
+        _mapa = res_bombeo["salidas"][_k][_i, :, :, _l]
+        _im = _ax.pcolormesh(_ejes["D_mm"], _ejes["v"], _mapa, shading="nearest", cmap="viridis")
+        fig_b.colorbar(_im, ax=_ax, label=_titulo)
+        _ax.contour(_ejes["D_mm"], _ejes["v"], _mapa, levels=8, colors="white", linewidths=0.6)
+        _ax.set_xlabel("D [mm]")
+        _ax.set_ylabel("v [m/s]")
+        _ax.set_title(f"{_titulo} — z₂={_ejes['z2'][_i]:.0f} m, hf={_ejes['hf'][_l]:.1f} m")
+    fig_b
+    return
+
+
+@app.cell
+def _(mo, pa):
+    _opciones = ["npz"] + (["parquet", "arrow"] if pa is not None else [])
+    formato_export = mo.ui.dropdown(options=_opciones, value=_opciones[-1] if pa is not None else "npz", label="Formato")
+    boton_export = mo.ui.run_button(label="Exportar barrido de bombeo")
+    mo.vstack(
+        [
+            mo.md(
+                "### Exportar columnas\n\n"
+                + ("" if pa is not None else "`pyarrow` no está instalado: solo `.npz` comprimido.\n\n")
+                + "El archivo se escribe en `resultados/`, junto al notebook."
+            ),
+            mo.hstack([formato_export, boton_export], justify="start", gap="2rem"),
+        ]
+    )
+    return boton_export, formato_export
+
+
+@app.cell
+def _(Path, boton_export, exportar_columnas, formato_export, mo, res_bombeo):
+    mo.stop(not boton_export.value)
+    _dir = Path(mo.notebook_dir() or Path.cwd()) / "resultados"
+    _dir.mkdir(exist_ok=True)
+    _info = exportar_columnas(res_bombeo, _dir / "barrido_bombeo", formato=formato_export.value)
+    mo.md(
+        f"`{_info['ruta'].name}` ({_info['formato']}): {res_bombeo['n_puntos']:,} filas, "
+        f"{_info['bytes'] / 1e6:.1f} MB en **{_info['tiempo_s']:.2f} s**"
+    )
+    return
+
+
+@app.cell
+def _(barrer, mo, modelo_ducto, np, plt):
+    ejes_ducto = {
+        "Q": np.linspace(0.05, 1.0, 200),
+        "L": np.linspace(50.0, 500.0, 200),
+        "hf": np.array([10.0, 20.0, 40.0]),
+    }
+    res_ducto = barrer(modelo_ducto, ejes_ducto)
+
+    fig_d, ax_d = plt.subplots(figsize=(8, 5.5), constrained_layout=True)
+    _im = ax_d.pcolormesh(
+        ejes_ducto["L"], ejes_ducto["Q"], 1000 * res_ducto["salidas"]["D_min"][:, :, 1], shading="nearest", cmap="magma"
+    )
+    fig_d.colorbar(_im, ax=ax_d, label="D mínimo [mm]")
+    ax_d.plot(150.0, 0.35, "c*", ms=14, label="Ejemplo 01_iterative")
+    ax_d.set_xlabel("L [m]")
+    ax_d.set_ylabel("Q [m³/s]")
+    ax_d.set_title("Ducto de aire: D mínimo para hf = 20 m", fontweight="bold")
+    ax_d.legend(loc="lower right")
+
+    mo.vstack(
+        [
+            mo.md(
+                f"""
+## Barrido del ducto (01_iterative)
+
+{res_ducto['n_puntos']:,} diseños en **{res_ducto['tiempo_s'] * 1000:.0f} ms**
+({res_ducto['n_bloques_cache']} de {res_ducto['n_bloques']} bloques desde caché).
+"""
+            ),
+            fig_d,
+        ]
+    )
+    return
+
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,244 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import time
+    import numpy as np
+    import matplotlib.pyplot as plt
+    return mo, np, plt, time
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 05_diseno_optimo — Diámetro de costo mínimo para una línea de bombeo
+
+El Ejercicio 4 de `bernoulli_bombeo.py` pide elegir a tanteo el diámetro y la potencia para elevar 8 L/s a 65 m.
+Aquí el diámetro se elige **minimizando el costo total** (inversión + energía de bombeo durante la vida útil),
+con las pérdidas calculadas por Colebrook-White en lugar de un $h_f$ fijo.
+
+## Modelo
+
+Para cada diámetro candidato $D$:
+
+$$
+v = \frac{4Q}{\pi D^2}, \qquad h_f = f\,\frac{L}{D}\,\frac{v^2}{2g}, \qquad H_b = z_2 + \frac{v^2}{2g} + h_f
+$$
+
+$$
+P = \frac{\rho g Q H_b}{\eta}
+$$
+
+Costo total (valor presente):
+
+$$
+C(D) = \underbrace{c_t D^{\beta} L + c_b P^{0.7}}_{\text{inversión}}
++ \underbrace{P\,t_{op}\,p_e\,\frac{1-(1+i)^{-n}}{i}}_{\text{energía}}
+$$
+
+Todos los diámetros candidatos (continuos o de catálogo) se evalúan en un solo lote vectorizado;
+el mismo cálculo acepta muchas líneas a la vez (arreglos de $z_2$, $Q$, $L$).
+"""
+    )
+    return
+
+
+@app.cell
+def _(np):
+    def f_darcy_colebrook(Re, rr, it=6):
+        Re = np.maximum(Re, 1.0)
+        rr = np.maximum(rr, 1e-12)
+        fD = np.maximum(0.25 / (np.log10(rr / 3.7 + 5.74 / (Re**0.9)) ** 2), 1e-6)
+        for _ in range(it):
+            inv = -2 * np.log10(rr / 3.7 + 2.51 / (Re * np.sqrt(fD)))
+            fD = 1 / (inv**2)
+        return np.where(Re < 2300, 64 / Re, fD)
+
+    return (f_darcy_colebrook,)
+
+
+@app.cell
+def _(np):
+    # Diámetros interiores de catálogo (PVC PN10, mm)
+    catalogo_mm = np.array([44.0, 57.0, 67.8, 81.4, 99.4, 113.0, 126.6, 144.6, 180.8, 226.2, 285.0, 321.2, 361.8])
+
+    costos_base = {
+        "c_t": 800.0,  # USD/m por m^beta de diámetro
+        "beta": 1.4,
+        "c_b": 1500.0,  # USD/kW^0.7, estación de bombeo
+        "eta": 0.70,
+        "horas": 4380.0,  # h/año
+        "precio": 0.12,  # USD/kWh
+        "tasa": 0.08,
+        "anios": 20,
+    }
+    return catalogo_mm, costos_base
+
+
+@app.cell
+def _(f_darcy_colebrook, np):
+    def costo_linea(z2, Q, L, D, costos, eps=1.5e-6, nu=1.0e-6, rho=1000.0, g=9.81):
+        # z2, Q, L: (n_lineas, 1); D: (n_D,) → todas las salidas (n_lineas, n_D)
+        v = 4.0 * Q / (np.pi * D**2)
+        Re = v * D / nu
+        f = f_darcy_colebrook(Re, eps / D)
+        hv = v**2 / (2 * g)
+        hf = f * L / D * hv
+        Hb = z2 + hv + hf
+        P_kW = rho * g * Q * Hb / costos["eta"] / 1000
+
+        i, n = costos["tasa"], costos["anios"]
+        fvp = (1 - (1 + i) ** -n) / i
+        c_cap = costos["c_t"] * D ** costos["beta"] * L + costos["c_b"] * P_kW**0.7
+        c_ene = P_kW * costos["horas"] * costos["precio"] * fvp
+        return {"v": v, "hf": hf, "Hb": Hb, "P_kW": P_kW, "capital": c_cap, "energia": c_ene, "total": c_cap + c_ene}
+
+    def diametro_optimo(z2, Q, L, costos, D=None, v_lim=(0.5, 3.0), **kw):
+        # Sin catálogo se usa una grilla continua densa y se afina con una parábola local
+        continuo = D is None
+        if continuo:
+            D = np.geomspace(0.02, 1.0, 400)
+        D = np.asarray(D, dtype=float)
+        z2, Q, L = (np.atleast_1d(np.asarray(x, dtype=float))[:, None] for x in np.broadcast_arrays(z2, Q, L))
+
+        c = costo_linea(z2, Q, L, D, costos, **kw)
+        total = c["total"]
+        if v_lim is not None:
+            total = np.where((c["v"] >= v_lim[0]) & (c["v"] <= v_lim[1]), total, np.inf)
+        k = np.argmin(total, axis=1)
+        filas = np.arange(k.size)
+        factible = np.isfinite(total[filas, k])
+
+        if continuo:
+            kk = np.clip(k, 1, D.size - 2)
+            x = np.log(D)
+            y0, y1, y2 = (c["total"][filas, kk + j] for j in (-1, 0, 1))
+            den = y0 - 2 * y1 + y2
+            paso = np.where(den > 0, 0.5 * (y0 - y2) / np.where(den > 0, den, 1.0), 0.0)
+            D_opt = np.exp(x[kk] + np.clip(paso, -1, 1) * (x[1] - x[0]))
+            interior = (k == kk) & np.isfinite(total[filas, kk - 1]) & np.isfinite(total[filas, kk + 1])
+            D_opt = np.where(interior, D_opt, D[k])
+            sel = costo_linea(z2, Q, L, D_opt[:, None], costos, **kw)
+            sel = {nombre: a[:, 0] for nombre, a in sel.items()}
+        else:
+            D_opt = D[k]
+            sel = {nombre: a[filas, k] for nombre, a in c.items()}
+
+        # Filas sin candidato factible (argmin de puros inf cae en k=0): todos los campos en NaN
+        sel = {nombre: np.where(factible, a, np.nan) for nombre, a in sel.items()}
+        sel["D"] = np.where(factible, D_opt, np.nan)
+        sel["factible"] = factible
+        return sel, c
+
+    return costo_linea, diametro_optimo
+
+
+@app.cell
+def _(mo):
+    z2_in = mo.ui.slider(5, 150, value=65, step=1, label="z₂ [m]", show_value=True)
+    Q_in = mo.ui.slider(1.0, 100.0, value=8.0, step=0.5, label="Q [L/s]", show_value=True)
+    L_in = mo.ui.slider(100, 10000, value=1500, step=100, label="L [m]", show_value=True)
+    precio_in = mo.ui.slider(0.02, 0.40, value=0.12, step=0.01, label="Energía [USD/kWh]", show_value=True)
+    usar_catalogo = mo.ui.switch(value=True, label="Solo diámetros de catálogo")
+    mo.vstack(
+        [
+            mo.md("## Línea del Ejercicio 4"),
+            mo.hstack([z2_in, Q_in], justify="start", gap="4rem"),
+            mo.hstack([L_in, precio_in], justify="start", gap="4rem"),
+            usar_catalogo,
+        ]
+    )
+    return L_in, Q_in, precio_in, usar_catalogo, z2_in
+
+
+@app.cell
+def _(
+    L_in,
+    Q_in,
+    catalogo_mm,
+    costo_linea,
+    costos_base,
+    diametro_optimo,
+    mo,
+    np,
+    plt,
+    precio_in,
+    usar_catalogo,
+    z2_in,
+):
+    costos = dict(costos_base, precio=precio_in.value)
+    _Q = Q_in.value / 1000
+    _D_cand = catalogo_mm / 1000 if usar_catalogo.value else None
+    opt, _ = diametro_optimo(z2_in.value, _Q, L_in.value, costos, D=_D_cand)
+
+    _D_curva = np.geomspace(0.03, 0.5, 300)
+    _c = costo_linea(z2_in.value, _Q, L_in.value, _D_curva, costos)
+
+    fig_c, ax_c = plt.subplots(figsize=(11, 6))
+    ax_c.plot(_D_curva * 1000, _c["capital"] / 1e3, color="#795548", lw=2, label="Inversión")
+    ax_c.plot(_D_curva * 1000, _c["energia"] / 1e3, color="#FF9800", lw=2, label="Energía (valor presente)")
+    ax_c.plot(_D_curva * 1000, _c["total"] / 1e3, color="#1f77b4", lw=2.8, label="Total")
+    _v = 4 * _Q / (np.pi * _D_curva**2)
+    ax_c.axvspan(_D_curva[_v <= 3.0].min() * 1000, _D_curva[_v >= 0.5].max() * 1000, color="#c8e6c9", alpha=0.35,
+                 label="0.5 ≤ v ≤ 3 m/s")
+    if usar_catalogo.value:
+        _cc = costo_linea(z2_in.value, _Q, L_in.value, catalogo_mm / 1000, costos)
+        ax_c.plot(catalogo_mm, _cc["total"] / 1e3, "ks", ms=5, label="Catálogo")
+    if opt["factible"][0]:
+        ax_c.plot(opt["D"][0] * 1000, opt["total"][0] / 1e3, "r*", ms=18, zorder=10, label="Óptimo")
+    ax_c.set_xscale("log")
+    ax_c.set_ylim(0, float(np.nanmin(_c["total"])) / 1e3 * 3)
+    ax_c.set_xlabel("Diámetro interior D [mm]", fontsize=12)
+    ax_c.set_ylabel("Costo [miles de USD]", fontsize=12)
+    ax_c.set_title("Costo total vs diámetro", fontsize=14, fontweight="bold")
+    ax_c.grid(True, which="both", ls="--", alpha=0.3)
+    ax_c.legend(loc="upper right")
+
+    _res = (
+        mo.md(
+            f"""
+**Diámetro óptimo: {opt['D'][0] * 1000:.1f} mm** — $v$ = {opt['v'][0]:.2f} m/s, $h_f$ = {opt['hf'][0]:.2f} m,
+$H_b$ = {opt['Hb'][0]:.2f} m, potencia al eje **{opt['P_kW'][0]:.2f} kW**.
+Costo total {opt['total'][0] / 1e3:,.1f} mil USD (inversión {opt['capital'][0] / 1e3:,.1f}, energía {opt['energia'][0] / 1e3:,.1f}).
+"""
+        )
+        if opt["factible"][0]
+        else mo.md("**Ningún diámetro candidato cumple 0.5 ≤ v ≤ 3 m/s.**")
+    )
+    mo.vstack([mo.callout(_res, kind="info"), fig_c])
+    return (costos,)
+
+
+@app.cell
+def _(catalogo_mm, costos, diametro_optimo, mo, np, time):
+    # Lote de muchas líneas a la vez
+    _rng = np.random.default_rng(1)
+    _n = 20000
+    _t0 = time.perf_counter()
+    lote, _ = diametro_optimo(
+        _rng.uniform(10, 120, _n), _rng.uniform(0.002, 0.08, _n), _rng.uniform(200, 8000, _n), costos, D=catalogo_mm / 1000
+    )
+    _dt = time.perf_counter() - _t0
+
+    _D, _cuenta = np.unique(np.round(lote["D"][lote["factible"]] * 1000, 1), return_counts=True)
+    _tabla = ["| D (mm) | líneas |", "|---:|---:|"] + [f"| {d:.1f} | {c} |" for d, c in zip(_D, _cuenta)]
+    mo.md(
+        f"""
+## Lote de {_n:,} líneas
+
+Optimización de {_n:,} líneas × {catalogo_mm.size} diámetros de catálogo en **{_dt * 1000:.0f} ms**.
+
+{chr(10).join(_tabla)}
+"""
+    )
+    return
+
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,270 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import time
+    import numpy as np
+    import matplotlib.pyplot as plt
+    return mo, np, plt, time
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 06_montecarlo — Propagación de incertidumbre (Monte Carlo)
+
+`01_iterative.py` usa valores puntuales de $\nu$ y $\varepsilon$ y entrega un único $D_{\min}$; `02_pumps.py` usa
+coeficientes de curva fijos. Aquí esos datos se tratan como **variables aleatorias** y se obtienen bandas P5/P50/P95.
+
+## Variables inciertas
+
+| Variable | Distribución | Valor central |
+|---|---|---|
+| Rugosidad $\varepsilon$ | log-normal | $1.5\times 10^{-6}$ m |
+| Viscosidad $\nu$ | normal | $1.65\times 10^{-5}$ m²/s |
+| Curva de bomba $H_0$, $a$, $b$ | normal | 62 m, 0.06, 0.00035 |
+| Eficiencia $\eta_{max}$ | normal | 0.82 |
+
+## Cálculo por lotes
+
+- Cada bloque de muestras pasa **completo** por la iteración $D$–$f$ (parte a), la iteración $Q$–$f$ (parte b)
+  y el punto de operación de la bomba, sin bucles de Python por muestra.
+- Los cuantiles se acumulan en **histogramas de 4096 bins** (memoria acotada, independiente del número de muestras).
+  Los bordes iniciales salen de una muestra piloto; si un bloque cae fuera, el rango se duplica fusionando pares
+  de bins, en vez de recortar las colas en los bins extremos. Las muestras `NaN` o $\pm\infty$ no entran al
+  histograma: se cuentan aparte (columna *no finitos*).
+- Cada variable tiene su propio generador derivado de la semilla y el rango final solo depende de los extremos de
+  las muestras: el resultado no depende del tamaño de bloque.
+
+Punto de operación de la bomba con la curva del sistema $H_s(Q) = H_{est} + K Q^2$:
+
+$$
+H_0 - aQ - bQ^2 = H_{est} + KQ^2 \;\Rightarrow\; Q = \frac{-a + \sqrt{a^2 + 4(b+K)(H_0-H_{est})}}{2(b+K)}
+$$
+"""
+    )
+    return
+
+
+@app.cell
+def _(np):
+    def colebrook_lote(Re, rr, f, n=4):
+        for _ in range(n):
+            f = 1.0 / (-2.0 * np.log10(rr / 3.7 + 2.51 / (Re * np.sqrt(f)))) ** 2
+        return f
+
+    def ducto_lote(eps, nu, Q1=0.35, L1=150.0, L2=300.0, h=20.0, g=9.81, n_iter=6):
+        # Parte (a): D mínimo; parte (b): nuevo caudal con L duplicado (01_iterative)
+        f = np.full_like(eps, 0.02)
+        for _ in range(n_iter):
+            D = ((8.0 * f * L1 * Q1 * Q1) / (g * np.pi**2 * h)) ** 0.2
+            Re = 4.0 * Q1 / (np.pi * D * nu)
+            f = colebrook_lote(Re, eps / D, f)
+        D_min = D
+
+        f = np.full_like(eps, 0.02)
+        for _ in range(n_iter):
+            Q2 = (np.pi * D_min**2 / 4.0) * np.sqrt((2.0 * g * h * D_min) / (f * L2))
+            Re = 4.0 * Q2 / (np.pi * D_min * nu)
+            f = colebrook_lote(Re, eps / D_min, f)
+        return {"D_min_mm": 1000 * D_min, "caida_pct": 100 * (Q1 - Q2) / Q1}
+
+    def bomba_lote(H0, a, b, eta_max, H_est=25.0, K=0.0008, Qbep=180.0, k_eta=7.5e-6, eta_m=0.95, rho=998.0, g=9.81):
+        # Q en m³/h, como en 02_pumps
+        Q = (-a + np.sqrt(a * a + 4 * (b + K) * np.maximum(H0 - H_est, 0.0))) / (2 * (b + K))
+        H = H0 - a * Q - b * Q * Q
+        eta = np.clip(eta_max - k_eta * (Q - Qbep) ** 2, 0.05, 0.9)
+        P_kW = rho * g * (Q / 3600) * H / np.clip(eta * eta_m, 0.05, 1.0) / 1000
+        return {"Q_m3h": Q, "P_eje_kW": P_kW}
+
+    return bomba_lote, ducto_lote
+
+
+@app.cell
+def _(np):
+    def histograma_nuevo(lo, hi, n_bins=4096):
+        return {
+            "lo": lo,
+            "hi": hi,
+            "cuentas": np.zeros(n_bins, dtype=np.int64),
+            "n": 0,
+            "no_finitos": 0,
+            "suma": 0.0,
+            "suma2": 0.0,
+        }
+
+    def ampliar(hist):
+        # Duplica el rango alrededor del centro: cada par de bins se fusiona en uno (exacto, n_bins múltiplo de 4)
+        c, nb = hist["cuentas"], hist["cuentas"].size
+        medio = 0.5 * (hist["lo"] + hist["hi"])
+        nuevas = np.zeros_like(c)
+        nuevas[nb // 4 : nb // 4 + nb // 2] = c.reshape(-1, 2).sum(axis=1)
+        hist["cuentas"] = nuevas
+        hist["lo"], hist["hi"] = 2 * hist["lo"] - medio, 2 * hist["hi"] - medio
+
+    def acumular(hist, x):
+        # NaN/±inf (p. ej. una raíz de un número negativo) se cuentan aparte: no caben en ningún rango
+        finitos = np.isfinite(x)
+        hist["no_finitos"] += int(x.size - finitos.sum())
+        x = x[finitos]
+        if x.size == 0:
+            return
+        # Fuera de rango no se recorta en los bins extremos: se amplía hasta que todo x cabe
+        while x.min() < hist["lo"] or x.max() >= hist["hi"]:
+            ampliar(hist)
+        nb = hist["cuentas"].size
+        k = ((x - hist["lo"]) * (nb / (hist["hi"] - hist["lo"]))).astype(np.int64)
+        hist["cuentas"] += np.bincount(np.clip(k, 0, nb - 1), minlength=nb)
+        hist["n"] += x.size
+        hist["suma"] += float(x.sum())
+        hist["suma2"] += float((x * x).sum())
+
+    def cuantiles(hist, q):
+        # Interpolación lineal dentro del bin que contiene cada cuantil
+        if hist["n"] == 0:
+            return np.full(np.shape(q), np.nan)
+        cdf = np.cumsum(hist["cuentas"]) / hist["n"]
+        bordes = np.linspace(hist["lo"], hist["hi"], hist["cuentas"].size + 1)
+        return np.interp(q, np.concatenate([[0.0], cdf]), bordes)
+
+    def resumen(hist):
+        if hist["n"] == 0:
+            return {"media": np.nan, "desv": np.nan}
+        media = hist["suma"] / hist["n"]
+        return {"media": media, "desv": np.sqrt(max(hist["suma2"] / hist["n"] - media**2, 0.0))}
+
+    return acumular, ampliar, cuantiles, histograma_nuevo, resumen
+
+
+@app.cell
+def _(acumular, bomba_lote, ducto_lote, histograma_nuevo, np, time):
+    def monte_carlo(n, seed, cv, bloque=100_000):
+        t0 = time.perf_counter()
+        nombres = ["eps", "nu", "H0", "a", "b", "eta_max"]
+        _base = np.random.default_rng(seed)
+        rngs = dict(zip(nombres, _base.spawn(len(nombres))))
+        rngs_piloto = dict(zip(nombres, _base.spawn(len(nombres))))
+
+        def muestrear(k, rngs=rngs):
+            s_ln = np.sqrt(np.log1p(cv["eps"] ** 2))
+            return {
+                "eps": 1.5e-6 * np.exp(rngs["eps"].normal(-0.5 * s_ln**2, s_ln, k)),
+                "nu": 1.65e-5 * (1 + cv["nu"] * rngs["nu"].standard_normal(k)),
+                "H0": 62.0 * (1 + cv["curva"] * rngs["H0"].standard_normal(k)),
+                "a": 0.06 * (1 + cv["curva"] * rngs["a"].standard_normal(k)),
+                "b": 0.00035 * (1 + cv["curva"] * rngs["b"].standard_normal(k)),
+                "eta_max": 0.82 * (1 + cv["eta"] * rngs["eta_max"].standard_normal(k)),
+            }
+
+        def evaluar(m):
+            salida = ducto_lote(m["eps"], m["nu"])
+            salida.update(bomba_lote(m["H0"], m["a"], m["b"], m["eta_max"]))
+            return salida
+
+        # Bordes iniciales desde una muestra piloto de tamaño fijo (generadores propios), con holgura para las
+        # colas; lo que caiga fuera amplía el histograma. Así los bordes finales no dependen del tamaño de bloque.
+        hists = {}
+        for nombre, x in evaluar(muestrear(4096, rngs_piloto)).items():
+            x = x[np.isfinite(x)]
+            lo, hi = (np.min(x), np.max(x)) if x.size else (0.0, 1.0)
+            ancho = max(hi - lo, 1e-12 * max(abs(hi), 1.0))
+            hists[nombre] = histograma_nuevo(lo - 0.5 * ancho, hi + 0.5 * ancho)
+
+        hechos = 0
+        while hechos < n:
+            k = min(bloque, n - hechos)
+            for nombre, x in evaluar(muestrear(k)).items():
+                acumular(hists[nombre], x)
+            hechos += k
+
+        return {"hist": hists, "n": n, "tiempo_s": time.perf_counter() - t0}
+
+    return (monte_carlo,)
+
+
+@app.cell
+def _(mo):
+    n_muestras = mo.ui.dropdown(
+        options={"10⁴": 10_000, "10⁵": 100_000, "10⁶": 1_000_000}, value="10⁵", label="Muestras"
+    )
+    semilla = mo.ui.number(value=2013, step=1, label="Semilla")
+    cv_eps = mo.ui.slider(0.0, 1.0, value=0.5, step=0.05, label="CV rugosidad", show_value=True)
+    cv_nu = mo.ui.slider(0.0, 0.10, value=0.03, step=0.005, label="CV viscosidad", show_value=True)
+    cv_curva = mo.ui.slider(0.0, 0.10, value=0.03, step=0.005, label="CV coef. curva H–Q", show_value=True)
+    cv_eta = mo.ui.slider(0.0, 0.10, value=0.02, step=0.005, label="CV η_max", show_value=True)
+    mo.vstack(
+        [
+            mo.hstack([n_muestras, semilla], justify="start", gap="2rem"),
+            mo.hstack([cv_eps, cv_nu], justify="start", gap="4rem"),
+            mo.hstack([cv_curva, cv_eta], justify="start", gap="4rem"),
+        ]
+    )
+    return cv_curva, cv_eps, cv_eta, cv_nu, n_muestras, semilla
+
+
+@app.cell
+def _(cv_curva, cv_eps, cv_eta, cv_nu, monte_carlo, n_muestras, semilla):
+    mc = monte_carlo(
+        n_muestras.value,
+        int(semilla.value),
+        {"eps": cv_eps.value, "nu": cv_nu.value, "curva": cv_curva.value, "eta": cv_eta.value},
+    )
+    return (mc,)
+
+
+@app.cell
+def _(cuantiles, mc, mo, np, plt, resumen):
+    etiquetas = {
+        "D_min_mm": "D mínimo [mm]",
+        "caida_pct": "Caída de caudal parte (b) [%]",
+        "Q_m3h": "Caudal de operación [m³/h]",
+        "P_eje_kW": "Potencia al eje [kW]",
+    }
+    _filas = ["| Resultado | media | desv. | P5 | P50 | P95 | no finitos |", "|---|---:|---:|---:|---:|---:|---:|"]
+    fig_mc, ax_mc = plt.subplots(1, 4, figsize=(18, 4.2), constrained_layout=True)
+    for _ax, (_k, _et) in zip(ax_mc, etiquetas.items()):
+        _h = mc["hist"][_k]
+        _p5, _p50, _p95 = cuantiles(_h, [0.05, 0.5, 0.95])
+        _r = resumen(_h)
+        _filas.append(
+            f"| {_et} | {_r['media']:.4g} | {_r['desv']:.3g} | {_p5:.4g} | {_p50:.4g} | {_p95:.4g} | {_h['no_finitos']:,} |"
+        )
+
+        # Histograma re-agrupado para graficar
+        _c = _h["cuentas"].reshape(-1, 32).sum(axis=1)
+        _b = np.linspace(_h["lo"], _h["hi"], _c.size + 1)
+        _m = _c > 0
+        if _m.any():
+            _ax.stairs(_c / _h["n"], _b, fill=True, color="steelblue", alpha=0.6)
+            _ax.set_xlim(_b[:-1][_m].min(), _b[1:][_m].max())
+        for _q, _ls in zip([_p5, _p50, _p95], ["--", "-", "--"]):
+            _ax.axvline(_q, color="#d62728", ls=_ls, lw=1.5)
+        _ax.set_title(_et, fontsize=11)
+        _ax.set_yticks([])
+        _ax.grid(alpha=0.3)
+
+    mo.vstack(
+        [
+            mo.md(
+                f"""
+## Resultados
+
+{mc['n']:,} muestras en **{mc['tiempo_s']:.2f} s**; líneas rojas: P5, P50 y P95.
+
+{chr(10).join(_filas)}
+"""
+            ),
+            fig_mc,
+        ]
+    )
+    return
+
+
+if __name__ == "__main__":
+    app.run()
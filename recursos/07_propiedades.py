@@ -0,0 +1,271 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import time
+    from functools import lru_cache
+    import numpy as np
+    import matplotlib.pyplot as plt
+    return lru_cache, mo, np, plt, time
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 07_propiedades — Propiedades de agua y aire en función de la temperatura
+
+En los recursos anteriores las propiedades son constantes: $\nu = 1.65\times10^{-5}$ m²/s (aire a 35 °C) en
+`01_iterative.py` y $\rho = 1000$ o $998$ kg/m³ en `bernoulli_bombeo.py` y `02_pumps.py`.
+Aquí se tabulan $\rho(T)$ y $\mu(T)$ a 1 atm y se obtiene
+
+$$
+\nu(T) = \frac{\mu(T)}{\rho(T)}
+$$
+
+## Interpolación rápida
+
+1. Datos base tabulados (Çengel & Cimbala, tablas A-3 y A-15).
+2. Una **tabla fina derivada** con paso uniforme (0.1 °C por defecto), calculada una sola vez y guardada en caché.
+   La viscosidad se interpola en $\ln\mu$, porque varía casi exponencialmente con $T$.
+3. La búsqueda sobre la tabla fina es aritmética (índice $= (T - T_0)/\Delta T$), sin búsqueda binaria,
+   y funciona sobre arreglos de temperaturas de cualquier forma.
+
+Fuera del rango tabulado los valores se fijan al extremo más cercano.
+"""
+    )
+    return
+
+
+@app.cell
+def _(np):
+    # T [°C], rho [kg/m³], mu [Pa·s]
+    tablas_base = {
+        "agua": np.array(
+            [
+                [0, 999.8, 1.792e-3],
+                [5, 999.9, 1.519e-3],
+                [10, 999.7, 1.307e-3],
+                [15, 999.1, 1.138e-3],
+                [20, 998.0, 1.002e-3],
+                [25, 997.0, 0.891e-3],
+                [30, 996.0, 0.798e-3],
+                [35, 994.0, 0.720e-3],
+                [40, 992.1, 0.653e-3],
+                [45, 990.1, 0.596e-3],
+                [50, 988.1, 0.547e-3],
+                [55, 985.2, 0.504e-3],
+                [60, 983.3, 0.467e-3],
+                [65, 980.4, 0.433e-3],
+                [70, 977.5, 0.404e-3],
+                [75, 974.7, 0.378e-3],
+                [80, 971.8, 0.355e-3],
+                [85, 968.1, 0.333e-3],
+                [90, 965.3, 0.315e-3],
+                [95, 961.5, 0.297e-3],
+                [100, 957.9, 0.282e-3],
+            ]
+        ),
+        "aire": np.array(
+            [
+                [-20, 1.394, 1.630e-5],
+                [-10, 1.341, 1.680e-5],
+                [0, 1.292, 1.729e-5],
+                [5, 1.269, 1.754e-5],
+                [10, 1.246, 1.778e-5],
+                [15, 1.225, 1.802e-5],
+                [20, 1.204, 1.825e-5],
+                [25, 1.184, 1.849e-5],
+                [30, 1.164, 1.872e-5],
+                [35, 1.145, 1.895e-5],
+                [40, 1.127, 1.918e-5],
+                [45, 1.109, 1.941e-5],
+                [50, 1.092, 1.963e-5],
+                [60, 1.059, 2.008e-5],
+                [70, 1.028, 2.052e-5],
+                [80, 0.9994, 2.096e-5],
+                [90, 0.9718, 2.139e-5],
+                [100, 0.9458, 2.181e-5],
+                [120, 0.8977, 2.264e-5],
+                [140, 0.8542, 2.345e-5],
+                [160, 0.8148, 2.420e-5],
+                [180, 0.7788, 2.504e-5],
+                [200, 0.7459, 2.577e-5],
+            ]
+        ),
+    }
+    return (tablas_base,)
+
+
+@app.cell
+def _(lru_cache, np, tablas_base):
+    @lru_cache(maxsize=None)
+    def tabla_fina(fluido, paso=0.1):
+        base = tablas_base[fluido]
+        T = np.arange(base[0, 0], base[-1, 0] + 0.5 * paso, paso)
+        rho = np.interp(T, base[:, 0], base[:, 1])
+        mu = np.exp(np.interp(T, base[:, 0], np.log(base[:, 2])))
+        tabla = {"T0": float(T[0]), "paso": paso, "n": T.size}
+        for nombre, y in (("rho", rho), ("mu", mu), ("nu", mu / rho)):
+            # valor y pendiente por intervalo, compartidos (solo lectura) por todas las consultas
+            tabla[nombre] = (y, np.diff(y))
+            for a in tabla[nombre]:
+                a.flags.writeable = False
+        return tabla
+
+    def _indice(tabla, T):
+        x = np.array(T, dtype=float)
+        x -= tabla["T0"]
+        x *= 1.0 / tabla["paso"]
+        # T no finita (NaN, ±inf) no tiene índice: se consulta el primer intervalo y se marca para devolver NaN
+        malos = ~np.isfinite(x)
+        if not malos.any():
+            malos = None
+        else:
+            x[malos] = 0.0
+        np.clip(x, 0.0, tabla["n"] - 1.0, out=x)
+        i = x.astype(np.intp)
+        np.minimum(i, tabla["n"] - 2, out=i)
+        x -= i
+        return i, x, malos
+
+    def _evaluar(tabla, nombre, i, w, malos):
+        y, dy = tabla[nombre]
+        r = dy.take(i)
+        r *= w
+        r += y.take(i)
+        return r if malos is None else np.where(malos, np.nan, r)
+
+    def propiedades(fluido, T, nombres=("rho", "mu", "nu"), paso=0.1):
+        # Un solo cálculo de índice y peso para todas las propiedades pedidas
+        tabla = tabla_fina(fluido, paso)
+        i, w, malos = _indice(tabla, T)
+        return {nombre: _evaluar(tabla, nombre, i, w, malos) for nombre in nombres}
+
+    def rho_T(fluido, T):
+        return propiedades(fluido, T, ("rho",))["rho"]
+
+    def mu_T(fluido, T):
+        return propiedades(fluido, T, ("mu",))["mu"]
+
+    def nu_T(fluido, T):
+        return propiedades(fluido, T, ("nu",))["nu"]
+
+    return mu_T, nu_T, propiedades, rho_T, tabla_fina
+
+
+@app.cell
+def _(mo, mu_T, np, nu_T, plt, rho_T, tablas_base):
+    fig_p, ax_p = plt.subplots(2, 2, figsize=(13, 7.5), constrained_layout=True)
+    for _j, (_fl, _color) in enumerate([("agua", "#1f77b4"), ("aire", "#d62728")]):
+        _base = tablas_base[_fl]
+        _T = np.linspace(_base[0, 0], _base[-1, 0], 400)
+        ax_p[0, _j].plot(_T, rho_T(_fl, _T), color=_color, lw=2)
+        ax_p[0, _j].plot(_base[:, 0], _base[:, 1], "ko", ms=4, label="Tabla")
+        ax_p[0, _j].set_ylabel("ρ [kg/m³]")
+        ax_p[1, _j].semilogy(_T, nu_T(_fl, _T), color=_color, lw=2)
+        ax_p[1, _j].semilogy(_base[:, 0], _base[:, 2] / _base[:, 1], "ko", ms=4, label="Tabla")
+        ax_p[1, _j].set_ylabel("ν [m²/s]")
+        ax_p[1, _j].set_xlabel("T [°C]")
+        ax_p[0, _j].set_title(_fl.capitalize(), fontsize=13, fontweight="bold")
+        for _ax in ax_p[:, _j]:
+            _ax.grid(alpha=0.3)
+            _ax.legend()
+
+    mo.vstack(
+        [
+            mo.md(
+                f"""
+## Tablas
+
+Control: aire a 35 °C → $\\nu$ = {nu_T('aire', 35.0):.4e} m²/s (01_iterative usa 1.65e-5);
+agua a 20 °C → $\\rho$ = {rho_T('agua', 20.0):.1f} kg/m³, $\\mu$ = {mu_T('agua', 20.0):.4e} Pa·s.
+"""
+            ),
+            fig_p,
+        ]
+    )
+    return
+
+
+@app.cell
+def _(mo):
+    T_min = mo.ui.slider(-20, 100, value=0, step=5, label="T mínima [°C]", show_value=True)
+    T_max = mo.ui.slider(0, 200, value=60, step=5, label="T máxima [°C]", show_value=True)
+    mo.vstack(
+        [
+            mo.md("## Ducto de 01_iterative en función de la temperatura del aire"),
+            mo.hstack([T_min, T_max], justify="start", gap="4rem"),
+        ]
+    )
+    return T_max, T_min
+
+
+@app.cell
+def _(T_max, T_min, mo, np, nu_T, plt):
+    def d_min_lote(nu, Q1=0.35, L1=150.0, h=20.0, eps=1.5e-6, g=9.81, n_iter=6):
+        f = np.full_like(nu, 0.02)
+        for _ in range(n_iter):
+            D = ((8.0 * f * L1 * Q1 * Q1) / (g * np.pi**2 * h)) ** 0.2
+            Re = 4.0 * Q1 / (np.pi * D * nu)
+            for _ in range(4):
+                f = 1.0 / (-2.0 * np.log10(eps / D / 3.7 + 2.51 / (Re * np.sqrt(f)))) ** 2
+        return D
+
+    _T = np.linspace(T_min.value, max(T_max.value, T_min.value + 5), 200)
+    _D = d_min_lote(nu_T("aire", _T))
+
+    fig_d, ax_d = plt.subplots(figsize=(9, 4.5), constrained_layout=True)
+    ax_d.plot(_T, _D * 1000, lw=2.5, color="#d62728")
+    ax_d.axvline(35, color="gray", ls="--", label="35 °C (01_iterative)")
+    ax_d.set_xlabel("T del aire [°C]")
+    ax_d.set_ylabel("D mínimo [mm]")
+    ax_d.set_title("Q = 0.35 m³/s, L = 150 m, hf = 20 m", fontweight="bold")
+    ax_d.grid(alpha=0.3)
+    ax_d.legend()
+    mo.vstack([fig_d])
+    return
+
+
+@app.cell
+def _(mo, np, propiedades, tabla_fina, time):
+    # Costo de la consulta frente a una evaluación de Colebrook del mismo tamaño. La construcción de la tabla se
+    # mide sobre la función sin caché (__wrapped__): la caché que usa el resto del notebook no se toca.
+    _t0 = time.perf_counter()
+    tabla_fina.__wrapped__("agua")
+    _t_tabla = time.perf_counter() - _t0
+
+    _n = 2_000_000
+    _T = np.random.default_rng(0).uniform(0, 100, _n)
+    _t0 = time.perf_counter()
+    _prop = propiedades("agua", _T, ("rho", "nu"))
+    _t_prop = time.perf_counter() - _t0
+
+    _Re = 1.0 * 0.1 / _prop["nu"]
+    _f = np.full(_n, 0.02)
+    _t0 = time.perf_counter()
+    for _ in range(4):
+        _f = 1.0 / (-2.0 * np.log10(1e-3 / 3.7 + 2.51 / (_Re * np.sqrt(_f)))) ** 2
+    _t_cole = time.perf_counter() - _t0
+
+    mo.md(
+        f"""
+## Costo
+
+| Operación | Tiempo |
+|---|---:|
+| Construir tabla fina de agua (una vez, en caché) | {_t_tabla * 1000:.2f} ms |
+| $\\nu(T)$ y $\\rho(T)$ para {_n:,} temperaturas | {_t_prop * 1000:.1f} ms |
+| Colebrook (4 iteraciones) para {_n:,} puntos | {_t_cole * 1000:.1f} ms |
+"""
+    )
+    return
+
+
+if __name__ == "__main__":
+    app.run()
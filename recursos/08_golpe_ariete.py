@@ -0,0 +1,299 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import io
+    import math
+    import time
+    import numpy as np
+    import matplotlib.pyplot as plt
+    return io, math, mo, np, plt, time
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 08_golpe_ariete — Transitorios en la línea bomba–cerro (método de las características)
+
+`bernoulli_bombeo.py` resuelve el régimen permanente $H_b = z_2 + v^2/2g + h_f$. El caso que dimensiona la tubería
+es el **transitorio**: parada súbita de la bomba o cierre de la válvula de descarga.
+
+## Ecuaciones
+
+Continuidad y cantidad de movimiento en la tubería (celeridad de onda $a$, área $A$, fricción de Darcy $f$):
+
+$$
+\frac{\partial H}{\partial t} + \frac{a^2}{gA}\frac{\partial Q}{\partial x} = 0, \qquad
+\frac{\partial Q}{\partial t} + gA\frac{\partial H}{\partial x} + \frac{f\,Q|Q|}{2DA} = 0
+$$
+
+Sobre las características $dx/dt = \pm a$ (con $\Delta t = \Delta x / a$), con $B = a/gA$ y $R = f\Delta x / 2gDA^2$:
+
+$$
+C^+:\; H_P = C_P - B Q_P, \quad C_P = H_{i-1} + BQ_{i-1} - RQ_{i-1}|Q_{i-1}|
+$$
+$$
+C^-:\; H_P = C_M + B Q_P, \quad C_M = H_{i+1} - BQ_{i+1} + RQ_{i+1}|Q_{i+1}|
+$$
+
+Todos los nodos interiores se actualizan a la vez (operaciones sobre arreglos, sin bucle por nodo).
+
+## Condiciones de borde
+
+- **Aguas arriba (bomba)**: curva $H = \alpha^2 H_0 - k Q^2$ con válvula de retención ($Q \ge 0$), con
+  $H_0 \ge H_b$ (`H0_rel` $\ge 1$; con `H0_rel` $= 1$ la curva es plana, $k = 0$).
+  En la parada, la velocidad relativa decae como $\alpha(t) = 1/(1 + t/T)$ ($T$: constante de inercia).
+- **Aguas abajo (descarga en el cerro, cota $z_2$)**: válvula con $Q|Q| = (\tau Q_0)^2 (H - z_2)/(v_0^2/2g)$;
+  en régimen permanente la pérdida de la válvula abierta es la altura cinética de salida, como en `bernoulli_bombeo.py`.
+  En el cierre, $\tau(t) = (1 - t/T)^{1.5}$.
+
+El permanente inicial usa Colebrook-White para $f$. De la historia completa solo se guarda la **envolvente**
+(máximo y mínimo de $H$ en cada nodo, actualizados en cada paso) y la serie de tiempo en tres sondas.
+
+Sobrepresión de referencia (Joukowsky, cierre instantáneo): $\Delta H = a\,v_0/g$.
+"""
+    )
+    return
+
+
+@app.cell
+def _(math):
+    def colebrook_f(Re, rel_rough, f0=0.02, n=30):
+        f = max(f0, 1e-6)
+        Re = max(Re, 1.0)
+        rr = max(rel_rough, 1e-12)
+        for _ in range(n):
+            inv = -2.0 * math.log10(rr / 3.7 + 2.51 / (Re * math.sqrt(f)))
+            f = 1.0 / (inv * inv)
+        return f
+
+    return (colebrook_f,)
+
+
+@app.cell
+def _(colebrook_f, math, np, time):
+    def permanente(z2, D, v0, L, eps=1.5e-6, nu=1.0e-6, g=9.81, f=None):
+        A = math.pi * D * D / 4
+        if f is None:
+            f = colebrook_f(v0 * D / nu, eps / D)
+        hv = v0 * v0 / (2 * g)
+        hf = f * L / D * hv
+        return {"A": A, "Q0": v0 * A, "f": f, "hv": hv, "hf": hf, "Hb": z2 + hv + hf}
+
+    def golpe_ariete(
+        z2, D, v0, L, a, escenario="bomba", T=2.0, n_tramos=200, t_fin=None, H0_rel=1.25,
+        eps=1.5e-6, nu=1.0e-6, g=9.81, f=None,
+    ):
+        t0 = time.perf_counter()
+        if H0_rel < 1.0:
+            raise ValueError(f"H0_rel={H0_rel}: la carga a válvula cerrada no puede ser menor que la de operación")
+        p = permanente(z2, D, v0, L, eps, nu, g, f)
+        A, Q0, hv, hf = p["A"], p["Q0"], p["hv"], p["hf"]
+        n = int(n_tramos)
+        dx = L / n
+        dt = dx / a
+        if t_fin is None:
+            t_fin = 20 * L / a  # cinco periodos 4L/a
+        n_pasos = int(math.ceil(t_fin / dt))
+
+        B = a / (g * A)
+        R = p["f"] * dx / (2 * g * D * A * A)
+        H0 = H0_rel * p["Hb"]  # carga a válvula cerrada de la bomba
+        k_b = (H0 - p["Hb"]) / (Q0 * Q0)  # 0 con H0_rel = 1: curva plana H = α²H0
+        c_v0 = Q0 * Q0 / hv  # válvula: Q|Q| = tau² c_v0 (H - z2)
+
+        x = np.linspace(0.0, L, n + 1)
+        H = z2 + hv + hf * (1 - x / L)
+        Q = np.full(n + 1, Q0)
+        H_max, H_min = H.copy(), H.copy()
+
+        # Buffers reutilizados en cada paso (sin asignar memoria dentro del bucle)
+        cp, cm, w = np.empty(n), np.empty(n), np.empty(n)
+        sondas = np.array([0, n // 2, n])
+        t_hist = np.arange(n_pasos + 1) * dt
+        H_hist = np.empty((n_pasos + 1, sondas.size))
+        Q_hist = np.empty((n_pasos + 1, sondas.size))
+        H_hist[0], Q_hist[0] = H[sondas], Q[sondas]
+
+        for k in range(1, n_pasos + 1):
+            t = k * dt
+            # C+ desde los nodos 0..n-1 y C- desde los nodos 1..n
+            np.abs(Q[:-1], out=w)
+            w *= -R
+            w += B
+            np.multiply(w, Q[:-1], out=cp)
+            cp += H[:-1]
+            np.abs(Q[1:], out=w)
+            w *= R
+            w -= B
+            np.multiply(w, Q[1:], out=cm)
+            cm += H[1:]
+
+            # Nodos interiores
+            np.add(cp[:-1], cm[1:], out=H[1:-1])
+            H[1:-1] *= 0.5
+            np.subtract(cp[:-1], cm[1:], out=Q[1:-1])
+            Q[1:-1] *= 0.5 / B
+
+            # Bomba (aguas arriba) con válvula de retención
+            alfa = 1.0 / (1.0 + t / T) if escenario == "bomba" else 1.0
+            c_m, h_bomba = cm[0], alfa * alfa * H0
+            if c_m >= h_bomba:
+                Q[0] = 0.0
+            else:
+                # Raíz positiva de k Q² + B Q - (h - C_M) = 0 en la forma sin cancelación, válida también con k = 0
+                Q[0] = 2 * (h_bomba - c_m) / (B + math.sqrt(B * B + 4 * k_b * (h_bomba - c_m)))
+            H[0] = c_m + B * Q[0]
+
+            # Válvula de descarga (aguas abajo)
+            tau = max(1.0 - t / T, 0.0) ** 1.5 if escenario == "valvula" else 1.0
+            c, d = tau * tau * c_v0, cp[-1] - z2
+            if c == 0.0:
+                Q[-1] = 0.0
+            elif d >= 0:
+                Q[-1] = 0.5 * (-c * B + math.sqrt(c * c * B * B + 4 * c * d))
+            else:
+                Q[-1] = 0.5 * (c * B - math.sqrt(c * c * B * B - 4 * c * d))
+            H[-1] = cp[-1] - B * Q[-1]
+
+            # Envolvente en línea: solo máximos y mínimos
+            np.maximum(H_max, H, out=H_max)
+            np.minimum(H_min, H, out=H_min)
+            H_hist[k], Q_hist[k] = H[sondas], Q[sondas]
+
+        return {
+            "x": x,
+            "H_max": H_max,
+            "H_min": H_min,
+            "H_ini": z2 + hv + hf * (1 - x / L),
+            "t": t_hist,
+            "sondas": x[sondas],
+            "H_sondas": H_hist,
+            "Q_sondas": Q_hist,
+            "permanente": p,
+            "dt": dt,
+            "n_pasos": n_pasos,
+            "joukowsky": a * v0 / g,
+            "tiempo_s": time.perf_counter() - t0,
+        }
+
+    return golpe_ariete, permanente
+
+
+@app.cell
+def _(mo):
+    escenario = mo.ui.dropdown(
+        options={"Parada de bomba": "bomba", "Cierre de válvula": "valvula"}, value="Parada de bomba", label="Escenario"
+    )
+    z2_in = mo.ui.slider(5, 100, value=30, step=1, label="z₂ [m]", show_value=True)
+    v_in = mo.ui.slider(0.1, 4.0, value=2.0, step=0.1, label="v [m/s]", show_value=True)
+    D_in = mo.ui.slider(25, 300, value=100, step=5, label="D [mm]", show_value=True)
+    L_in = mo.ui.slider(100, 5000, value=1000, step=100, label="L [m]", show_value=True)
+    a_in = mo.ui.slider(200, 1400, value=400, step=50, label="Celeridad a [m/s]", show_value=True)
+    T_in = mo.ui.slider(0.1, 30.0, value=3.0, step=0.1, label="T (inercia / cierre) [s]", show_value=True)
+    n_in = mo.ui.dropdown(options=["100", "400", "1000", "4000"], value="400", label="Tramos")
+    mo.vstack(
+        [
+            mo.md("## Línea del sistema de bombeo\n\nCeleridades típicas: PVC 300–500 m/s, HDPE 200–350 m/s, acero 900–1300 m/s."),
+            mo.hstack([escenario, n_in], justify="start", gap="2rem"),
+            mo.hstack([z2_in, v_in, D_in], justify="start", gap="3rem"),
+            mo.hstack([L_in, a_in, T_in], justify="start", gap="3rem"),
+        ]
+    )
+    return D_in, L_in, T_in, a_in, escenario, n_in, v_in, z2_in
+
+
+@app.cell
+def _(D_in, L_in, T_in, a_in, escenario, golpe_ariete, n_in, v_in, z2_in):
+    ga = golpe_ariete(
+        z2_in.value, D_in.value / 1000, v_in.value, L_in.value, a_in.value,
+        escenario=escenario.value, T=T_in.value, n_tramos=int(n_in.value),
+    )
+    return (ga,)
+
+
+@app.cell
+def _(ga, io, mo, np, plt, z2_in):
+    _x = ga["x"]
+    _z = z2_in.value * _x / _x[-1]  # perfil de la tubería: de la bomba (cota 0) al cerro
+    _p_min = ga["H_min"] - _z
+    _p = ga["permanente"]
+
+    fig_g, (ax_e, ax_t) = plt.subplots(1, 2, figsize=(16, 5.5), constrained_layout=True)
+    ax_e.fill_between(_x, ga["H_min"], ga["H_max"], color="#90caf9", alpha=0.5, label="Envolvente")
+    ax_e.plot(_x, ga["H_max"], color="#c62828", lw=2, label="H máx")
+    ax_e.plot(_x, ga["H_min"], color="#1565c0", lw=2, label="H mín")
+    ax_e.plot(_x, ga["H_ini"], "k--", lw=1.5, label="Permanente")
+    ax_e.plot(_x, _z, color="#795548", lw=3, label="Tubería")
+    ax_e.plot(_x, _z - 9.7, color="#795548", lw=1, ls=":", label="Presión de vapor")
+    ax_e.set_xlabel("x [m]")
+    ax_e.set_ylabel("Carga piezométrica H [m]")
+    ax_e.set_title("Envolvente de carga a lo largo de la línea", fontweight="bold")
+    ax_e.grid(alpha=0.3)
+    ax_e.legend(fontsize=9)
+
+    for _j, (_nombre, _color) in enumerate(zip(["Bomba", "Centro", "Descarga"], ["#2e7d32", "#6a1b9a", "#ef6c00"])):
+        ax_t.plot(ga["t"], ga["H_sondas"][:, _j], color=_color, lw=1.4, label=_nombre)
+    ax_t.set_xlabel("t [s]")
+    ax_t.set_ylabel("H [m]")
+    ax_t.set_title("Carga en las sondas", fontweight="bold")
+    ax_t.grid(alpha=0.3)
+    ax_t.legend(fontsize=9)
+
+    def _envolvente_npz():
+        buf = io.BytesIO()
+        np.savez_compressed(buf, x=ga["x"], H_max=ga["H_max"], H_min=ga["H_min"], H_ini=ga["H_ini"])
+        return buf.getvalue()
+
+    _cav = _p_min < -9.7
+    mo.vstack(
+        [
+            mo.callout(
+                mo.md(
+                    f"""
+Permanente: $f$ = {_p['f']:.4f}, $h_f$ = {_p['hf']:.2f} m, $H_b$ = {_p['Hb']:.2f} m.
+Joukowsky $a v_0/g$ = **{ga['joukowsky']:.1f} m**.
+
+Sobrepresión máxima: **{np.max(ga['H_max'] - ga['H_ini']):.1f} m**; depresión máxima:
+**{np.max(ga['H_ini'] - ga['H_min']):.1f} m**. Presión mínima en la tubería {_p_min.min():.1f} m c.a.
+{'— **posible cavitación / separación de columna** en ' + f'{_cav.mean() * 100:.0f} % de la línea' if _cav.any() else ''}
+
+{ga['x'].size - 1} tramos × {ga['n_pasos']:,} pasos ($\\Delta t$ = {ga['dt'] * 1000:.2f} ms) en **{ga['tiempo_s']:.2f} s**.
+"""
+                ),
+                kind="warn" if _cav.any() else "info",
+            ),
+            fig_g,
+            mo.download(_envolvente_npz, filename="envolvente_golpe_ariete.npz", label="Descargar envolvente (.npz)"),
+        ]
+    )
+    return
+
+
+@app.cell
+def _(mo):
+    boton_escala = mo.ui.run_button(label="Ejecutar 10⁴ tramos × 10⁵ pasos")
+    mo.vstack([mo.md("## Prueba de escala"), boton_escala])
+    return (boton_escala,)
+
+
+@app.cell
+def _(boton_escala, golpe_ariete, mo):
+    mo.stop(not boton_escala.value)
+    # t_fin elegido para exactamente 10⁵ pasos (Δt = L / (n a))
+    _g = golpe_ariete(30.0, 0.1, 2.0, 10_000.0, 1000.0, n_tramos=10_000, t_fin=1e5 * 1.0 / 1000.0)
+    mo.md(
+        f"{_g['x'].size - 1:,} tramos × {_g['n_pasos']:,} pasos en **{_g['tiempo_s']:.1f} s** "
+        f"({_g['tiempo_s'] / (_g['n_pasos'] * (_g['x'].size - 1)) * 1e9:.1f} ns por nodo y paso)"
+    )
+    return
+
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,242 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import time
+    import numpy as np
+    import matplotlib.pyplot as plt
+    return mo, np, plt, time
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 09_ajuste_bombas — Ajuste por lotes de curvas de bomba a datos de ensayo
+
+`02_pumps.py` pide escribir a mano $H_0$, $a$, $b$, $\eta_{max}$, $Q_{BEP}$, $k_\eta$, $NPSH_{r0}$ y $c_{NPSHr}$.
+Aquí esos coeficientes se obtienen de registros de ensayo $(Q, H, \eta, NPSH_r)$ de **muchas bombas a la vez**.
+
+## Modelos (los de `02_pumps.py`, Q en m³/h)
+
+$$
+H = H_0 - aQ - bQ^2, \qquad \eta = \eta_{max} - k_\eta (Q - Q_{BEP})^2, \qquad NPSH_r = NPSH_{r0} + c\,Q^2
+$$
+
+Los tres son lineales en sus coeficientes. La eficiencia se ajusta como polinomio $c_0 + c_1 Q + c_2 Q^2$ y luego
+
+$$
+k_\eta = -c_2, \qquad Q_{BEP} = \frac{c_1}{2k_\eta}, \qquad \eta_{max} = c_0 + k_\eta Q_{BEP}^2
+$$
+
+## Mínimos cuadrados por lotes
+
+- Los registros (formato largo, una fila por punto medido) se agrupan por bomba en matrices rellenas
+  $(n_{bombas}, n_{max})$ con una máscara de pesos; los valores faltantes (`NaN`) tienen peso cero.
+- Las ecuaciones normales $X^T W X\,c = X^T W y$ de todas las bombas se arman con `einsum` y se resuelven juntas
+  con `np.linalg.solve` sobre la pila de matrices de $3\times3$ — sin bucle de Python por bomba.
+- $Q$ se escala por el caudal máximo de cada bomba para que las ecuaciones normales estén bien condicionadas.
+- Una bomba con menos caudales **distintos** que coeficientes (p. ej. tres ensayos en el mismo $Q$) o con matriz
+  mal condicionada no tiene ajuste: se resuelve con la identidad y sus coeficientes quedan en `NaN`.
+"""
+    )
+    return
+
+
+@app.cell
+def _(np):
+    nombres_coef = ("H0", "a", "b", "eta_max", "Qbep_ref", "k_eta", "npsh0", "c_npsh")
+
+    def agrupar(id_bomba, *columnas):
+        # Formato largo -> matrices rellenas (n_bombas, n_max) con NaN donde no hay dato
+        ids, inv, cuenta = np.unique(id_bomba, return_inverse=True, return_counts=True)
+        orden = np.argsort(inv, kind="stable")
+        inicio = np.concatenate([[0], np.cumsum(cuenta)[:-1]])
+        pos = np.arange(inv.size) - np.repeat(inicio, cuenta)
+        filas = inv[orden]
+        salida = []
+        for c in columnas:
+            m = np.full((ids.size, cuenta.max()), np.nan)
+            m[filas, pos] = np.asarray(c, dtype=float)[orden]
+            salida.append(m)
+        return ids, salida
+
+    def _resolver(X, y, w):
+        # X (n, m, p), y y w (n, m): ecuaciones normales apiladas
+        p = X.shape[-1]
+        y = np.where(w > 0, y, 0.0)
+        A = np.einsum("nmp,nm,nmq->npq", X, w, X)
+        r = np.einsum("nmp,nm,nm->np", X, w, y)
+        n_pts = w.sum(axis=1)
+        # Valores distintos de Q con dato: varios ensayos en el mismo caudal no aportan rango
+        qv = np.sort(np.where(w > 0, X[..., 1], np.nan), axis=1)
+        n_q = (np.diff(qv, axis=1) > 0).sum(axis=1) + (w > 0).any(axis=1)
+        ok = (n_pts >= p) & (n_q >= p)
+        A[~ok] = np.eye(p)  # evita matrices singulares; esas bombas quedan en NaN
+        ok &= np.linalg.cond(A) < 1e12
+        A[~ok] = np.eye(p)
+        c = np.linalg.solve(A, r[..., None])[..., 0]
+        c[~ok] = np.nan
+        res = y - np.einsum("nmp,np->nm", X, c)
+        rms = np.sqrt((w * res * res).sum(axis=1) / np.maximum(n_pts - p, 1))
+        return c, rms, n_pts
+
+    def ajustar_bombas(Q, H, eta, npsh):
+        # Q, H, eta, npsh: (n_bombas, n_max) con NaN para datos faltantes o relleno
+        Qs = np.max(np.where(np.isfinite(Q), Q, -np.inf), axis=1, keepdims=True)
+        Qs = np.where(Qs > 0, Qs, 1.0)  # todo en Q=0 o sin Q: sin escala (la bomba queda en NaN)
+        q = np.nan_to_num(Q / Qs)
+        X = np.stack([np.ones_like(q), q, q * q], axis=-1)
+        vq = np.isfinite(Q)
+
+        cH, rms_H, n_H = _resolver(X, H, (vq & np.isfinite(H)).astype(float))
+        cE, rms_E, n_E = _resolver(X, eta, (vq & np.isfinite(eta)).astype(float))
+        cN, rms_N, n_N = _resolver(X[..., ::2], npsh, (vq & np.isfinite(npsh)).astype(float))
+
+        # Volver a Q en unidades físicas
+        Qs = Qs[:, 0]
+        k_eta = -cE[:, 2] / Qs**2
+        Qbep = np.where(k_eta > 0, cE[:, 1] / Qs / (2 * np.where(k_eta > 0, k_eta, 1.0)), np.nan)
+        coef = np.column_stack(
+            [
+                cH[:, 0],
+                -cH[:, 1] / Qs,
+                -cH[:, 2] / Qs**2,
+                cE[:, 0] + k_eta * Qbep**2,
+                Qbep,
+                k_eta,
+                cN[:, 0],
+                cN[:, 1] / Qs**2,
+            ]
+        )
+        residuos = {"H": rms_H, "eta": rms_E, "NPSHr": rms_N}
+        n_puntos = {"H": n_H, "eta": n_E, "NPSHr": n_N}
+        return coef, residuos, n_puntos
+
+    def evaluar_bombas(coef, Q):
+        # Modelo de 02_pumps para todas las bombas a la vez; Q: (n_max,) o (n_bombas, n_max)
+        c = {k: coef[:, j, None] for j, k in enumerate(nombres_coef)}
+        H = c["H0"] - c["a"] * Q - c["b"] * Q**2
+        eta = np.clip(c["eta_max"] - c["k_eta"] * (Q - c["Qbep_ref"]) ** 2, 0.05, 0.9)
+        npsh = c["npsh0"] + c["c_npsh"] * Q**2
+        return H, eta, npsh
+
+    return agrupar, ajustar_bombas, evaluar_bombas, nombres_coef
+
+
+@app.cell
+def _(np):
+    def registros_sinteticos(n_bombas, seed=7, falta_npsh=0.2, ruido=1.0):
+        # Ensayos simulados: 6-15 puntos por bomba, ruido de medición y NPSHr no siempre medido
+        rng = np.random.default_rng(seed)
+        verdad = np.column_stack(
+            [
+                rng.uniform(40, 90, n_bombas),
+                rng.uniform(0.0, 0.1, n_bombas),
+                rng.uniform(2e-4, 6e-4, n_bombas),
+                rng.uniform(0.70, 0.88, n_bombas),
+                rng.uniform(100, 250, n_bombas),
+                rng.uniform(4e-6, 1e-5, n_bombas),
+                rng.uniform(1.0, 3.0, n_bombas),
+                rng.uniform(1e-4, 2e-4, n_bombas),
+            ]
+        )
+        n_pts = rng.integers(6, 16, n_bombas)
+        idx = np.repeat(np.arange(n_bombas), n_pts)
+        H0, a, b, eta_max, Qbep, k_eta, npsh0, c_npsh = verdad[idx].T
+        Q = rng.uniform(0.1, 1.4, idx.size) * Qbep
+        H = (H0 - a * Q - b * Q**2) * (1 + ruido * 0.01 * rng.standard_normal(idx.size))
+        eta = eta_max - k_eta * (Q - Qbep) ** 2 + ruido * 0.005 * rng.standard_normal(idx.size)
+        npsh = npsh0 + c_npsh * Q**2 + ruido * 0.05 * rng.standard_normal(idx.size)
+        npsh[rng.random(idx.size) < falta_npsh] = np.nan
+        mezcla = rng.permutation(idx.size)  # los registros no vienen ordenados por bomba
+        registros = {"id": 1000 + idx[mezcla], "Q": Q[mezcla], "H": H[mezcla], "eta": eta[mezcla], "NPSHr": npsh[mezcla]}
+        return registros, verdad
+
+    return (registros_sinteticos,)
+
+
+@app.cell
+def _(mo):
+    n_bombas = mo.ui.dropdown(
+        options={"1 000": 1_000, "10 000": 10_000, "100 000": 100_000}, value="10 000", label="Bombas ensayadas"
+    )
+    n_bombas
+    return (n_bombas,)
+
+
+@app.cell
+def _(agrupar, ajustar_bombas, n_bombas, registros_sinteticos, time):
+    registros, verdad = registros_sinteticos(n_bombas.value)
+    _t0 = time.perf_counter()
+    ids, (Q_m, H_m, eta_m, npsh_m) = agrupar(registros["id"], registros["Q"], registros["H"], registros["eta"], registros["NPSHr"])
+    _t1 = time.perf_counter()
+    coef, residuos, n_puntos = ajustar_bombas(Q_m, H_m, eta_m, npsh_m)
+    _t2 = time.perf_counter()
+    tiempos_ajuste = {"agrupar": _t1 - _t0, "ajustar": _t2 - _t1}
+    return H_m, Q_m, coef, eta_m, ids, npsh_m, registros, residuos, tiempos_ajuste, verdad
+
+
+@app.cell
+def _(coef, ids, mo, nombres_coef, np, registros, residuos, tiempos_ajuste, verdad):
+    _err = np.nanmedian(np.abs(coef / verdad - 1), axis=0)
+    _filas = ["| coeficiente | error relativo mediano |", "|---|---:|"] + [
+        f"| {k} | {e * 100:.2f} % |" for k, e in zip(nombres_coef, _err)
+    ]
+    mo.md(
+        f"""
+## Resultados del lote
+
+{registros['id'].size:,} registros de {ids.size:,} bombas: agrupación en **{tiempos_ajuste['agrupar'] * 1000:.1f} ms**,
+ajuste de las tres curvas en **{tiempos_ajuste['ajustar'] * 1000:.1f} ms**.
+
+Residuo RMS mediano: $H$ {np.nanmedian(residuos['H']):.3f} m, $\\eta$ {np.nanmedian(residuos['eta']):.4f},
+$NPSH_r$ {np.nanmedian(residuos['NPSHr']):.3f} m.
+
+{chr(10).join(_filas)}
+
+`coef` es un arreglo ({coef.shape[0]:,} × {coef.shape[1]}) con columnas `{', '.join(nombres_coef)}`:
+cada fila se pasa tal cual a la curva de `02_pumps.py` (`dict(zip(nombres_coef, coef[i]))`).
+"""
+    )
+    return
+
+
+@app.cell
+def _(ids, mo):
+    sel_bomba = mo.ui.slider(0, ids.size - 1, value=0, step=1, label="Bomba (índice)", show_value=True)
+    sel_bomba
+    return (sel_bomba,)
+
+
+@app.cell
+def _(H_m, Q_m, coef, eta_m, evaluar_bombas, ids, nombres_coef, np, npsh_m, plt, residuos, sel_bomba):
+    _i = sel_bomba.value
+    _Q = np.linspace(0, np.nanmax(Q_m[_i]) * 1.05, 200)
+    _H, _eta, _N = (a[0] for a in evaluar_bombas(coef[_i : _i + 1], _Q))
+
+    fig_aj, _ax = plt.subplots(1, 3, figsize=(16, 4.5), constrained_layout=True)
+    for _a, _y, _m, _et, _r in zip(
+        _ax, [_H, 100 * _eta, _N], [H_m, 100 * eta_m, npsh_m], ["H [m]", "η [%]", "NPSHr [m]"], ["H", "eta", "NPSHr"]
+    ):
+        _a.plot(_Q, _y, lw=2.2, label="Ajuste")
+        _a.plot(Q_m[_i], _m[_i], "ko", ms=5, label="Ensayo")
+        _a.set_xlabel("Q [m³/h]")
+        _a.set_ylabel(_et)
+        _a.set_title(f"{_et} — RMS {residuos[_r][_i]:.3g}")
+        _a.grid(alpha=0.3)
+        _a.legend()
+    fig_aj.suptitle(
+        f"Bomba {ids[_i]}: " + ", ".join(f"{k}={v:.4g}" for k, v in zip(nombres_coef, coef[_i])), fontsize=11
+    )
+    fig_aj
+    return
+
+
+if __name__ == "__main__":
+    app.run()
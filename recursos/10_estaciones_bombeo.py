@@ -0,0 +1,266 @@
+import marimo
+
+__generated_with = "0.20.2"
+app = marimo.App(width="full")
+
+
+@app.cell
+def _():
+    import marimo as mo
+    import itertools
+    import time
+    import numpy as np
+    import matplotlib.pyplot as plt
+    return itertools, mo, np, plt, time
+
+
+@app.cell
+def _(mo):
+    mo.md(
+        r"""
+# 10_estaciones_bombeo — Bombas en paralelo y en serie, y escalonamiento de mínima potencia
+
+`02_pumps.py` trata una bomba a la vez. Una estación opera de 2 a 6 bombas y enciende más o menos unidades según la demanda.
+Se usa el mismo modelo cuadrático (Q en m³/h):
+
+$$
+H_i(Q) = H_{0,i} - a_i Q - b_i Q^2, \qquad
+Q_i(H) = \frac{-a_i + \sqrt{a_i^2 + 4 b_i (H_{0,i} - H)}}{2 b_i} \quad (H \le H_{0,i})
+$$
+
+- **Paralelo**: a igual altura se suman caudales, $Q(H) = \sum_i k_i\,Q_i(H)$ (requiere la inversa $Q_i(H)$).
+  Las válvulas de retención hacen $Q_i = 0$ si $H > H_{0,i}$.
+- **Serie**: a igual caudal se suman alturas, $H(Q) = \sum_i k_i\,H_i(Q)$.
+
+## Escalonamiento
+
+Cada configuración es un número de unidades encendidas por tipo de bomba ($k_i$). Para una demanda $Q_d$ con curva del
+sistema $H_s(Q) = H_{est} + K Q^2$, la estación entrega $Q_d$ estrangulando la descarga:
+
+- en paralelo, la altura común $H$ cumple $\sum_i k_i Q_i(H) = Q_d$ (para todas las configuraciones y demandas a la vez:
+  interpolación en la curva combinada tabulada y pulido de Newton con la derivada analítica $dQ_i/dH$)
+  y la configuración es factible si $H \ge H_s(Q_d)$;
+- en serie, factible si $\sum_i k_i H_i(Q_d) \ge H_s(Q_d)$.
+
+La potencia es $P = \sum_i k_i\,\rho g Q_i H_i / (\eta_i \eta_m)$ y para cada demanda se elige la configuración
+factible de menor potencia.
+"""
+    )
+    return
+
+
+@app.cell
+def _(itertools, np):
+    def H_bomba(t, Q):
+        # t: dict de arreglos (un valor por tipo de bomba), Q broadcast contra ellos
+        return t["H0"] - t["a"] * Q - t["b"] * Q * Q
+
+    def Q_bomba(t, H):
+        disc = t["a"] ** 2 + 4 * t["b"] * np.maximum(t["H0"] - H, 0.0)
+        return (np.sqrt(disc) - t["a"]) / (2 * t["b"])
+
+    def eta_bomba(t, Q):
+        return np.clip(t["eta_max"] - t["k_eta"] * (Q - t["Qbep"]) ** 2, 0.05, 0.9)
+
+    def configuraciones(cantidades):
+        # Todas las combinaciones de unidades encendidas por tipo (sin la estación apagada): (n_cfg, n_tipos)
+        k = np.array(list(itertools.product(*(range(n + 1) for n in cantidades))), dtype=float)
+        k = k[k.sum(axis=1) > 0]
+        return k[np.lexsort((k[:, ::-1].T))]
+
+    def curva_paralelo(t, k, H):
+        # k: (n_cfg, n_tipos), H: (n_H,) -> Q total (n_cfg, n_H)
+        return np.einsum("ct,ht->ch", k, Q_bomba(t, H[:, None]))
+
+    def curva_serie(t, k, Q):
+        return np.einsum("ct,qt->cq", k, H_bomba(t, Q[:, None]))
+
+    def escalonar(t, cantidades, Q_d, H_est, K, modo="paralelo", eta_m=0.95, rho=998.0, g=9.81, n_tabla=2048, n_newton=2):
+        k = configuraciones(cantidades)
+        Q_d = np.asarray(Q_d, dtype=float)
+        Hs = H_est + K * Q_d * Q_d
+
+        if modo == "paralelo":
+            # 1) Inversión tabulada de Q_total(H) de todas las configuraciones con un solo searchsorted:
+            #    cada fila (Q creciente) se desplaza por un múltiplo de un offset para que el arreglo plano quede ordenado
+            n_c, H_max = k.shape[0], float(np.max(t["H0"]))
+            Hr = np.linspace(H_max, 0.0, n_tabla)
+            Qr = curva_paralelo(t, k, Hr)
+            off = (Qr[:, -1].max() + Q_d.max() + 1.0) * np.arange(n_c)[:, None]
+            j = np.searchsorted((Qr + off).ravel(), (Q_d + off).ravel()).reshape(n_c, Q_d.size)
+            j = np.clip(j - n_tabla * np.arange(n_c)[:, None], 1, n_tabla - 1)
+            fila = np.arange(n_c)[:, None]
+            Q0, Q1 = Qr[fila, j - 1], Qr[fila, j]
+            w = np.clip((Q_d - Q0) / np.where(Q1 > Q0, Q1 - Q0, 1.0), 0.0, 1.0)
+            H = Hr[j - 1] + w * (Hr[j] - Hr[j - 1])
+            # 2) Pulido con Newton: dQ_t/dH = -1/sqrt(disc_t) es analítica
+            kk = k[:, None, :]
+            for _ in range(n_newton):
+                raiz = np.sqrt(t["a"] ** 2 + 4 * t["b"] * np.maximum(t["H0"] - H[..., None], 0.0))
+                F = ((raiz - t["a"]) / (2 * t["b"]) * kk).sum(axis=-1) - Q_d
+                dF = -(np.where(H[..., None] < t["H0"], 1.0 / raiz, 0.0) * kk).sum(axis=-1)
+                H = np.clip(H - F / np.where(dF < 0, dF, -np.inf), 0.0, H_max)
+            Qi = Q_bomba(t, H[..., None])  # caudal de cada tipo (c, d, t)
+            Hi = np.broadcast_to(H[..., None], Qi.shape)
+            # Factible: altura suficiente y ninguna unidad encendida trabajando contra la válvula cerrada
+            factible = (H >= Hs) & np.all((Qi > 0) | (k[:, None, :] == 0), axis=-1)
+            factible &= np.abs(np.einsum("ct,cdt->cd", k, Qi) - Q_d) <= 1e-6 * np.maximum(Q_d, 1.0)
+        else:
+            Qi = np.broadcast_to(Q_d[None, :, None], (k.shape[0], Q_d.size, len(cantidades)))
+            Hi = H_bomba(t, Qi)
+            H = np.einsum("ct,cdt->cd", k, Hi)
+            factible = (H >= Hs) & np.all((Hi > 0) | (k[:, None, :] == 0), axis=-1)
+
+        P_i = rho * g * (Qi / 3600) * np.maximum(Hi, 0.0) / (eta_bomba(t, Qi) * eta_m) / 1000
+        P = np.einsum("ct,cdt->cd", k, P_i)
+        P_f = np.where(factible, P, np.inf)
+        mejor = np.argmin(P_f, axis=0)
+        d = np.arange(Q_d.size)
+        ok = np.isfinite(P_f[mejor, d])
+        return {
+            "k": k,
+            "Q_d": Q_d,
+            "Hs": Hs,
+            "H": H,
+            "P": P,
+            "factible": factible,
+            "mejor": np.where(ok, mejor, -1),
+            "P_min": np.where(ok, P_f[mejor, d], np.nan),
+        }
+
+    def tabla_escalonamiento(esc):
+        # Rangos contiguos de demanda con la misma configuración
+        m = esc["mejor"]
+        cortes = np.flatnonzero(np.diff(m)) + 1
+        inicios = np.concatenate([[0], cortes])
+        finales = np.concatenate([cortes, [m.size]]) - 1
+        return [(esc["Q_d"][i], esc["Q_d"][j], m[i]) for i, j in zip(inicios, finales)]
+
+    return (
+        H_bomba,
+        Q_bomba,
+        configuraciones,
+        curva_paralelo,
+        curva_serie,
+        escalonar,
+        tabla_escalonamiento,
+    )
+
+
+@app.cell
+def _(mo):
+    modo = mo.ui.dropdown(options={"Paralelo": "paralelo", "Serie": "serie"}, value="Paralelo", label="Conexión")
+    n_grandes = mo.ui.slider(1, 6, value=3, step=1, label="Bombas principales (02_pumps)", show_value=True)
+    n_chicas = mo.ui.slider(0, 2, value=1, step=1, label="Bombas auxiliares", show_value=True)
+    H_est = mo.ui.slider(0.0, 60.0, value=25.0, step=1.0, label="H estática [m]", show_value=True)
+    K_sis = mo.ui.slider(0.0, 0.002, value=0.00015, step=0.00001, label="K sistema [m/(m³/h)²]", show_value=True)
+    mo.vstack(
+        [
+            mo.md("## Estación"),
+            mo.hstack([modo, n_grandes, n_chicas], justify="start", gap="3rem"),
+            mo.hstack([H_est, K_sis], justify="start", gap="3rem"),
+        ]
+    )
+    return H_est, K_sis, modo, n_chicas, n_grandes
+
+
+@app.cell
+def _(np):
+    # Tipo 0: bomba de 02_pumps (D = D_ref); tipo 1: bomba auxiliar de menor caudal
+    tipos = {
+        "nombre": ["Principal", "Auxiliar"],
+        "H0": np.array([62.0, 58.0]),
+        "a": np.array([0.06, 0.10]),
+        "b": np.array([0.00035, 0.0016]),
+        "eta_max": np.array([0.82, 0.74]),
+        "Qbep": np.array([180.0, 70.0]),
+        "k_eta": np.array([7.5e-6, 5.0e-5]),
+    }
+    return (tipos,)
+
+
+@app.cell
+def _(H_bomba, H_est, K_sis, Q_bomba, escalonar, modo, n_chicas, n_grandes, np, time, tipos):
+    cantidades = [n_grandes.value, n_chicas.value]
+    # Rango de demanda: hasta el cruce de la curva del sistema con todas las unidades encendidas
+    _Q = np.linspace(0.0, float(np.dot(cantidades, Q_bomba(tipos, 0.0))), 2000)
+    if modo.value == "paralelo":
+        _ok = np.dot(Q_bomba(tipos, (H_est.value + K_sis.value * _Q * _Q)[:, None]), cantidades) >= _Q
+    else:
+        _ok = np.dot(H_bomba(tipos, _Q[:, None]), cantidades) >= H_est.value + K_sis.value * _Q * _Q
+    Q_demanda = np.linspace(0.0, 1.1 * max(_Q[_ok].max(initial=0.0), 1.0), 2001)[1:]
+    _t0 = time.perf_counter()
+    esc = escalonar(tipos, cantidades, Q_demanda, H_est.value, K_sis.value, modo=modo.value)
+    t_esc = time.perf_counter() - _t0
+    return cantidades, esc, t_esc
+
+
+@app.cell
+def _(curva_paralelo, curva_serie, esc, modo, mo, np, plt, t_esc, tabla_escalonamiento, tipos):
+    def _etiqueta(kc):
+        return " + ".join(f"{int(n)}×{nom}" for n, nom in zip(kc, tipos["nombre"]) if n > 0)
+
+    _k = esc["k"]
+    _Q_ok = esc["Q_d"][esc["mejor"] >= 0]
+    fig_e, (ax_c, ax_p) = plt.subplots(1, 2, figsize=(16, 5.8), constrained_layout=True)
+    _cmap = plt.get_cmap("tab20")
+    _H = np.linspace(0.0, float(tipos["H0"].max()) * (1 if modo.value == "paralelo" else _k.sum(axis=1).max()), 400)
+    _Q = np.linspace(0.0, esc["Q_d"][-1], 400)
+    if modo.value == "paralelo":
+        _curvas = curva_paralelo(tipos, _k, _H)
+        for _c in range(_k.shape[0]):
+            ax_c.plot(_curvas[_c], _H, color=_cmap(_c % 20), lw=1.6, label=_etiqueta(_k[_c]))
+    else:
+        _curvas = curva_serie(tipos, _k, _Q)
+        for _c in range(_k.shape[0]):
+            _m = _curvas[_c] > 0
+            ax_c.plot(_Q[_m], _curvas[_c][_m], color=_cmap(_c % 20), lw=1.6, label=_etiqueta(_k[_c]))
+    ax_c.plot(esc["Q_d"], esc["Hs"], "k--", lw=2.2, label="Sistema")
+    ax_c.set_xlim(0, esc["Q_d"][-1])
+    ax_c.set_ylim(0, None)
+    ax_c.set_xlabel("Q [m³/h]")
+    ax_c.set_ylabel("H [m]")
+    ax_c.set_title(f"Curvas combinadas ({modo.value})", fontweight="bold")
+    ax_c.grid(alpha=0.3)
+    ax_c.legend(fontsize=7, ncol=2)
+
+    for _c in range(_k.shape[0]):
+        _P = np.where(esc["factible"][_c], esc["P"][_c], np.nan)
+        ax_p.plot(esc["Q_d"], _P, color=_cmap(_c % 20), lw=1, alpha=0.6)
+    ax_p.plot(esc["Q_d"], esc["P_min"], "k", lw=2.8, label="Escalonamiento óptimo")
+    ax_p.set_xlabel("Demanda Q [m³/h]")
+    ax_p.set_ylabel("Potencia eléctrica [kW]")
+    ax_p.set_title("Potencia por configuración factible", fontweight="bold")
+    ax_p.grid(alpha=0.3)
+    ax_p.legend()
+
+    _filas = ["| Demanda [m³/h] | Configuración | Potencia [kW] |", "|---|---|---:|"]
+    for _q0, _q1, _c in tabla_escalonamiento(esc):
+        if _c < 0:
+            _filas.append(f"| {_q0:.0f} – {_q1:.0f} | *ninguna factible* | — |")
+        else:
+            _sel = (esc["Q_d"] >= _q0) & (esc["Q_d"] <= _q1)
+            _filas.append(
+                f"| {_q0:.0f} – {_q1:.0f} | {_etiqueta(_k[_c])} | "
+                f"{np.nanmin(esc['P_min'][_sel]):.1f} – {np.nanmax(esc['P_min'][_sel]):.1f} |"
+            )
+    mo.vstack(
+        [
+            mo.md(
+                f"""
+## Escalonamiento
+
+{_k.shape[0]} configuraciones × {esc['Q_d'].size:,} demandas en **{t_esc * 1000:.1f} ms**.
+Demanda máxima atendible: **{_Q_ok.max() if _Q_ok.size else 0:.0f} m³/h**.
+
+{chr(10).join(_filas)}
+"""
+            ),
+            fig_e,
+        ]
+    )
+    return
+
+
+if __name__ == "__main__":
+    app.run()
@@ -5,38 +5,40 @@ app = marimo.App(width="full", app_title="💧 Bernoulli — Sistema de Bombeo")
 
 
 @app.cell(hide_code=True)
-def _(mo):
-    mo.md(r"""
-    # 💧 Ecuación de Bernoulli: Sistema de Bombeo de Agua
-    ## Análisis gráfico e interactivo — Ingeniería Civil / Mecánica de Fluidos
+def _(medir, mo):
+    with medir("markdown", celda="fundamento"):
+        _md = mo.md(r"""
+        # 💧 Ecuación de Bernoulli: Sistema de Bombeo de Agua
+        ## Análisis gráfico e interactivo — Ingeniería Civil / Mecánica de Fluidos
 
-    ---
+        ---
 
-    ### 📚 Fundamento Teórico
+        ### 📚 Fundamento Teórico
 
-    La **Ecuación de Bernoulli generalizada** expresa la conservación de energía entre dos puntos de un fluido en movimiento, incluyendo el aporte de una bomba y las pérdidas de carga:
+        La **Ecuación de Bernoulli generalizada** expresa la conservación de energía entre dos puntos de un fluido en movimiento, incluyendo el aporte de una bomba y las pérdidas de carga:
 
-    $$\frac{P_1}{\rho g} + \frac{v_1^2}{2g} + z_1 + H_b = \frac{P_2}{\rho g} + \frac{v_2^2}{2g} + z_2 + h_f$$
+        $$\frac{P_1}{\rho g} + \frac{v_1^2}{2g} + z_1 + H_b = \frac{P_2}{\rho g} + \frac{v_2^2}{2g} + z_2 + h_f$$
 
-    | Término | Nombre | Unidad |
-    |---|---|---|
-    | $P/\rho g$ | Altura de presión | m |
-    | $v^2/2g$ | Altura cinética | m |
-    | $z$ | Altura potencial (cota) | m |
-    | $H_b$ | Altura de la bomba | m |
-    | $h_f$ | Pérdidas de carga | m |
+        | Término | Nombre | Unidad |
+        |---|---|---|
+        | $P/\rho g$ | Altura de presión | m |
+        | $v^2/2g$ | Altura cinética | m |
+        | $z$ | Altura potencial (cota) | m |
+        | $H_b$ | Altura de la bomba | m |
+        | $h_f$ | Pérdidas de carga | m |
 
-    ### 🔧 Condiciones del problema de bombeo
+        ### 🔧 Condiciones del problema de bombeo
 
-    - **Punto 1** (superficie estanque): $P_1 = P_{atm}$, $v_1 \approx 0$, $z_1 = 0$ (referencia)
-    - **Punto 2** (descarga en el cerro): $P_2 = P_{atm}$, $v_2 = v_{tubería}$, $z_2 = $ altura cerro
+        - **Punto 1** (superficie estanque): $P_1 = P_{atm}$, $v_1 \approx 0$, $z_1 = 0$ (referencia)
+        - **Punto 2** (descarga en el cerro): $P_2 = P_{atm}$, $v_2 = v_{tubería}$, $z_2 = $ altura cerro
 
-    Simplificando con presiones manométricas nulas:
+        Simplificando con presiones manométricas nulas:
 
-    $$\boxed{H_b = z_2 + \frac{v_2^2}{2g} + h_f}$$
+        $$\boxed{H_b = z_2 + \frac{v_2^2}{2g} + h_f}$$
 
-    > 💡 La bomba debe suministrar energía para vencer la **diferencia de cota**, la **energía cinética** y las **pérdidas por fricción**.
-    """)
+        > 💡 La bomba debe suministrar energía para vencer la **diferencia de cota**, la **energía cinética** y las **pérdidas por fricción**.
+        """)
+    _md
     return
 
 
@@ -79,58 +81,60 @@ def _(mo):
 
 
 @app.cell(hide_code=True)
-def _(mo, np, slider_D, slider_hf, slider_v, slider_z2):
+def _(medir, mo, np, slider_D, slider_hf, slider_v, slider_z2):
     # ── Parámetros desde sliders ──────────────────────────────
     z2   = slider_z2.value
     v2   = slider_v.value
     D_mm = slider_D.value
     hf   = slider_hf.value
 
-    # ── Constantes físicas ────────────────────────────────────
-    g   = 9.81
-    rho = 1000.0
-
-    # ── Cálculos hidráulicos ──────────────────────────────────
-    z1  = 0.0
-    v1  = 0.0
-    D   = D_mm / 1000.0
-    A   = np.pi * D**2 / 4
-    Q   = A * v2
-    Q_lps = Q * 1000
-
-    hv1 = v1**2 / (2 * g)
-    hv2 = v2**2 / (2 * g)
-
-    Hb    = z2 + hv2 + hf          # altura de la bomba [m]
-    Pb    = rho * g * Q * Hb       # potencia hidráulica [W]
-    Pb_kW = Pb / 1000
-
-    # ── Líneas de energía (EGL) y piezométrica (HGL) ─────────
-    # Puntos: estanque → entrada bomba → salida bomba → cerro
-    EGL_0 = z1 + hv1                    # estanque
-    EGL_1 = EGL_0 - hf * 0.15          # antes de bomba (pérdidas succión)
-    EGL_2 = EGL_1 + Hb                  # después de bomba
-    EGL_3 = z2 + hv2                    # cerro
-
-    HGL_0 = EGL_0 - hv1
-    HGL_1 = EGL_1 - hv2
-    HGL_2 = EGL_2 - hv2
-    HGL_3 = EGL_3 - hv2
+    with medir("calculo"):
+        # ── Constantes físicas ────────────────────────────────────
+        g   = 9.81
+        rho = 1000.0
+
+        # ── Cálculos hidráulicos ──────────────────────────────────
+        z1  = 0.0
+        v1  = 0.0
+        D   = D_mm / 1000.0
+        A   = np.pi * D**2 / 4
+        Q   = A * v2
+        Q_lps = Q * 1000
+
+        hv1 = v1**2 / (2 * g)
+        hv2 = v2**2 / (2 * g)
+
+        Hb    = z2 + hv2 + hf          # altura de la bomba [m]
+        Pb    = rho * g * Q * Hb       # potencia hidráulica [W]
+        Pb_kW = Pb / 1000
+
+        # ── Líneas de energía (EGL) y piezométrica (HGL) ─────────
+        # Puntos: estanque → entrada bomba → salida bomba → cerro
+        EGL_0 = z1 + hv1                    # estanque
+        EGL_1 = EGL_0 - hf * 0.15          # antes de bomba (pérdidas succión)
+        EGL_2 = EGL_1 + Hb                  # después de bomba
+        EGL_3 = z2 + hv2                    # cerro
+
+        HGL_0 = EGL_0 - hv1
+        HGL_1 = EGL_1 - hv2
+        HGL_2 = EGL_2 - hv2
+        HGL_3 = EGL_3 - hv2
 
     # ── Callout con resultados ────────────────────────────────
-    resumen = mo.callout(
-        mo.md(f"""
-        **Resultados de la Ecuación de Bernoulli**
-
-        | Variable | Fórmula | Valor |
-        |---|---|---|
-        | Altura de la bomba | $H_b = z_2 + v^2/2g + h_f = {z2:.1f} + {hv2:.3f} + {hf:.1f}$ | **{Hb:.2f} m** |
-        | Caudal | $Q = A \\cdot v = \\frac{{\\pi ({D_mm:.0f}\\text{{mm}})^2}}{{4}} \\cdot {v2:.1f}$ m/s | **{Q_lps:.3f} L/s** |
-        | Potencia hidráulica | $P = \\rho g Q H_b$ | **{Pb_kW:.3f} kW** |
-        | Altura cinética | $v^2/2g$ | **{hv2:.4f} m** |
-        """),
-        kind="info",
-    )
+    with medir("markdown", celda="resultados"):
+        resumen = mo.callout(
+            mo.md(f"""
+            **Resultados de la Ecuación de Bernoulli**
+
+            | Variable | Fórmula | Valor |
+            |---|---|---|
+            | Altura de la bomba | $H_b = z_2 + v^2/2g + h_f = {z2:.1f} + {hv2:.3f} + {hf:.1f}$ | **{Hb:.2f} m** |
+            | Caudal | $Q = A \\cdot v = \\frac{{\\pi ({D_mm:.0f}\\text{{mm}})^2}}{{4}} \\cdot {v2:.1f}$ m/s | **{Q_lps:.3f} L/s** |
+            | Potencia hidráulica | $P = \\rho g Q H_b$ | **{Pb_kW:.3f} kW** |
+            | Altura cinética | $v^2/2g$ | **{hv2:.4f} m** |
+            """),
+            kind="info",
+        )
     mo.vstack([resumen])
     return (
         D_mm,
@@ -175,170 +179,33 @@ def _(
     Hb,
     Pb_kW,
     Q_lps,
+    figura_diferida,
+    figuras,
     hf,
-    np,
-    plt,
     v2,
     z2,
 ):
-    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
-    fig.patch.set_facecolor('#f8f9fa')
-
-    # ══════════════════════════════════════════════════════════
-    # PANEL IZQUIERDO — Esquema físico del sistema
-    # ══════════════════════════════════════════════════════════
-    ax1 = axes[0]
-    ax1.set_facecolor('#e8f4f8')
-    ax1.set_xlim(-1.2, 11.5)
-    ax1.set_ylim(-6, z2 + 10)
-    ax1.set_title('📐 Esquema del Sistema de Bombeo', fontsize=13,
-                  fontweight='bold', pad=10)
-    ax1.set_xlabel('Distancia (esquemática)', fontsize=10)
-    ax1.set_ylabel('Cota  z  [m]', fontsize=10)
-    ax1.grid(True, alpha=0.25, linestyle='--')
-
-    # Perfil del terreno / cerro
-    xT = np.array([0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 0])
-    zT = np.array([0, 0, .05, .15, .35, .60, .78, .90, .97, 1, -.05, -.05]) * z2
-    ax1.fill(xT, zT, color='#8B7355', alpha=0.65)
-    ax1.fill([0, 0, 2, 2], [-6, 0, 0, -6], color='#8B7355', alpha=0.65)
-    # Pasto
-    ax1.fill_between([0, 2], [0, 0], [0.25, 0.25], color='#4CAF50', alpha=0.7)
-    ax1.fill_between(xT[:10], zT[:10], zT[:10] + 0.2, color='#4CAF50', alpha=0.7)
-
-    # Estanque
-    eh = min(3.5, z2 * 0.12 + 1.5)
-    from matplotlib.patches import FancyBboxPatch
-    ax1.add_patch(FancyBboxPatch((-1.0, -eh), 2.0, eh,
-                                  boxstyle='square', lw=2,
-                                  edgecolor='#1565C0', facecolor='#BBDEFB', alpha=0.85))
-    ax1.fill([-0.95, -0.95, 0.9, 0.9],
-             [-eh, -0.1, -0.1, -eh], color='#2196F3', alpha=0.55)
-    ax1.axhline(0, xmin=0.0, xmax=0.18, color='#1976D2', lw=3, alpha=0.9)
-    ax1.text(0, 0.5, 'Nivel libre', ha='center', fontsize=8, color='#1565C0')
-    ax1.text(0, -eh - 0.9, 'Estanque\n(Punto 1)', ha='center',
-             fontsize=8, color='#1565C0', fontweight='bold')
-    ax1.text(0, -eh - 1.7, '$z_1 = 0$ m', ha='center', fontsize=8, color='#1565C0')
-
-    # Tubería
-    x_pipe = np.linspace(2.0, 10.0, 200)
-    z_pipe = np.linspace(-2.0, z2, 200)
-    ax1.plot([0.6, 1.5], [0, 0], color='#37474F', lw=5, zorder=5, solid_capstyle='round')
-    ax1.plot([1.5, 1.5], [0, -2], color='#37474F', lw=5, zorder=5)
-    ax1.plot(x_pipe, z_pipe, color='#37474F', lw=5, zorder=5, solid_capstyle='round')
-
-    # Flechas de flujo
-    for pct in [0.25, 0.5, 0.75]:
-        xi = 2 + pct * 8
-        zi = -2 + pct * (z2 + 2)
-        dz = (z2 + 2) / 8 * 0.6
-        ax1.annotate('', xy=(xi + 0.5, zi + dz), xytext=(xi, zi),
-                     arrowprops=dict(arrowstyle='->', color='#2196F3', lw=2))
-
-    # Bomba
-    bomba_circ = plt.Circle((1.5, -3.0), 0.55, color='#FF5722', zorder=10, ec='#BF360C', lw=2)
-    ax1.add_patch(bomba_circ)
-    ax1.text(1.5, -3.0, '⚙', fontsize=18, ha='center', va='center', zorder=11)
-    ax1.annotate(f'BOMBA\n$H_b = {Hb:.1f}$ m\n$P = {Pb_kW:.2f}$ kW',
-                 xy=(1.5, -3.6), fontsize=8, ha='center', fontweight='bold',
-                 color='#BF360C',
-                 bbox=dict(boxstyle='round,pad=0.35', facecolor='#FFCCBC', alpha=0.9))
-
-    # Punto de llegada
-    ax1.plot(10, z2, 'o', color='#E91E63', ms=11, zorder=10, mec='#880E4F', mew=2)
-    ax1.annotate(f'Punto 2\n$z_2 = {z2:.0f}$ m',
-                 xy=(10, z2), xytext=(8.0, z2 + 2.5),
-                 fontsize=9, fontweight='bold', color='#880E4F',
-                 arrowprops=dict(arrowstyle='->', color='#880E4F', lw=1.5),
-                 bbox=dict(boxstyle='round,pad=0.3', facecolor='#FCE4EC', alpha=0.85))
-
-    # Cotas de referencia
-    ax1.axhline(0,  color='#FF9800', ls=':', lw=1.5, alpha=0.8)
-    ax1.axhline(z2, color='#9C27B0', ls=':', lw=1.5, alpha=0.8)
-    ax1.annotate('', xy=(10.8, z2), xytext=(10.8, 0),
-                 arrowprops=dict(arrowstyle='<->', color='#9C27B0', lw=2))
-    ax1.text(11.1, z2 / 2, f'$z_2={z2:.0f}$ m', fontsize=9,
-             color='#9C27B0', va='center', fontweight='bold')
-
-    # ══════════════════════════════════════════════════════════
-    # PANEL DERECHO — Líneas EGL y HGL
-    # ══════════════════════════════════════════════════════════
-    ax2 = axes[1]
-    ax2.set_facecolor('#f0f4e8')
-    ax2.set_title('📊 Líneas de Energía (EGL) y Piezométrica (HGL)',
-                  fontsize=13, fontweight='bold', pad=10)
-    ax2.set_xlabel('Posición en el sistema', fontsize=10)
-    ax2.set_ylabel('Altura de energía  [m]', fontsize=10)
-    ax2.grid(True, alpha=0.25, linestyle='--')
-
-    X  = [0, 1.5, 1.5, 10]
-    Zc = [0, -2,  -2,  z2]   # cotas del eje de la tubería
-
-    # Rellenos por componente de energía
-    ax2.fill_between([0, 1.5], [EGL_0, EGL_1], [HGL_0, HGL_1],
-                     alpha=0.3, color='#FF9800', label='$v^2/2g$ (cinética)')
-    ax2.fill_between([1.5, 10], [EGL_2, EGL_3], [HGL_2, HGL_3],
-                     alpha=0.3, color='#FF9800')
-    ax2.fill_between([0, 1.5], [HGL_0, HGL_1], [Zc[0], Zc[1]],
-                     alpha=0.25, color='#2196F3', label='$P/\\rho g$ (presión)')
-    ax2.fill_between([1.5, 10], [HGL_2, HGL_3], [Zc[2], Zc[3]],
-                     alpha=0.25, color='#2196F3')
-    ax2.fill_between([0, 10], [0, 0], -1,
-                     alpha=0.0)   # referencia invisible
-    # Cota positiva
-    z_pos_0 = max(Zc[0], 0); z_pos_3 = max(Zc[3], 0)
-    if z_pos_3 > 0:
-        ax2.fill_between([1.5, 10], [Zc[2], Zc[3]], [0, 0],
-                         where=[Zc[2] >= 0, Zc[3] >= 0],
-                         alpha=0.3, color='#795548', label='$z$ (potencial)')
-
-    # Cota del terreno
-    ax2.plot([0, 1.5, 1.5, 10], [0, -2, -2, z2],
-             'k--', lw=1.5, alpha=0.45, label='Cota tubería')
-
-    # HGL
-    ax2.plot([0, 1.5], [HGL_0, HGL_1], 'b-', lw=2.5, label='HGL (piezométrica)')
-    ax2.plot([1.5, 1.5], [HGL_1, HGL_2], 'b-', lw=2.5)
-    ax2.plot([1.5, 10], [HGL_2, HGL_3], 'b-', lw=2.5)
-
-    # EGL
-    ax2.plot([0, 1.5], [EGL_0, EGL_1], 'r-', lw=2.5, label='EGL (energía total)')
-    ax2.plot([1.5, 1.5], [EGL_1, EGL_2], 'r-', lw=2.5)
-    ax2.plot([1.5, 10], [EGL_2, EGL_3], 'r-', lw=2.5)
-
-    # Puntos clave
-    for xi, ei, hi in zip([0, 1.5, 1.5, 10],
-                           [EGL_0, EGL_1, EGL_2, EGL_3],
-                           [HGL_0, HGL_1, HGL_2, HGL_3]):
-        ax2.plot(xi, ei, 'ro', ms=8, zorder=10)
-        ax2.plot(xi, hi, 'bo', ms=8, zorder=10)
-
-    # Flecha de aporte de la bomba
-    ax2.annotate('', xy=(1.5, EGL_2), xytext=(1.5, EGL_1),
-                 arrowprops=dict(arrowstyle='->', color='#FF5722', lw=2.5))
-    ax2.text(1.65, (EGL_1 + EGL_2) / 2, f'$H_b = {Hb:.1f}$ m',
-             fontsize=9, color='#BF360C', fontweight='bold')
-
-    # Etiquetas de pérdidas
-    perdida_total = EGL_2 - EGL_3
-    ax2.annotate('', xy=(10, EGL_3), xytext=(10, EGL_2),
-                 arrowprops=dict(arrowstyle='->', color='gray', lw=1.5))
-    ax2.text(9.0, (EGL_2 + EGL_3) / 2, f'$h_f={hf:.1f}$ m',
-             fontsize=8, color='gray', ha='right')
-
-    ax2.set_xticks([0, 1.5, 10])
-    ax2.set_xticklabels(['Estanque (1)', 'Bomba', 'Cerro (2)'], fontsize=10)
-    ax2.legend(loc='upper left', fontsize=9, framealpha=0.9)
-
-    fig.suptitle(
-        f'💧 Bernoulli — z₂={z2} m  |  v={v2} m/s  |  D={D_mm} mm  |  hf={hf} m'
-        f'   →   Hb={Hb:.2f} m  |  Q={Q_lps:.2f} L/s  |  P={Pb_kW:.3f} kW',
-        fontsize=11, fontweight='bold', color='#1A237E', y=1.01,
-        bbox=dict(boxstyle='round,pad=0.4', facecolor='#E3F2FD', alpha=0.9)
+    grafico_sistema = figura_diferida(
+        figuras.dibujar_sistema,
+        "sistema",
+        D_mm=D_mm,
+        EGL_0=EGL_0,
+        EGL_1=EGL_1,
+        EGL_2=EGL_2,
+        EGL_3=EGL_3,
+        HGL_0=HGL_0,
+        HGL_1=HGL_1,
+        HGL_2=HGL_2,
+        HGL_3=HGL_3,
+        Hb=Hb,
+        Pb_kW=Pb_kW,
+        Q_lps=Q_lps,
+        hf=hf,
+        v2=v2,
+        z2=z2,
     )
-    plt.tight_layout()
-    plt.gca()
-    return
+    grafico_sistema
+    return (grafico_sistema,)
 
 
 @app.cell(hide_code=True)
@@ -351,60 +218,71 @@ def _(mo):
 
 
 @app.cell(hide_code=True)
-def _(EGL_0, EGL_1, EGL_2, EGL_3, Hb, hf, hv2, np, plt, z2):
-    def _():
-        fig2, ax3 = plt.subplots(figsize=(10, 5))
-        fig2.patch.set_facecolor('#f5f5f5')
-        ax3.set_facecolor('#fafafa')
-
-        cats   = ['Estanque (1)', 'Antes\nBomba', 'Después\nBomba', 'Cerro (2)']
-        z_v    = np.array([0.0,  -2.0,  -2.0,  z2])
-        hv_v   = np.array([0.0,  hv2,   hv2,   hv2])
-        # Altura de presión = EGL - z - hv (solo parte positiva para graficar)
-        hp_v   = np.array([EGL_0, EGL_1, EGL_2, EGL_3]) - z_v - hv_v
-        hp_v   = np.maximum(hp_v, 0)
-        z_plot = np.maximum(z_v, 0)
-
-        x = np.arange(len(cats))
-        w = 0.5
-
-        ax3.bar(x, z_plot,  w, label='Cota  z [m]',          color='#795548', alpha=0.85)
-        ax3.bar(x, hp_v,    w, bottom=z_plot,
-                label='Presión  $P/\\rho g$ [m]',             color='#2196F3', alpha=0.8)
-        ax3.bar(x, hv_v,    w, bottom=z_plot + hp_v,
-                label='Cinética  $v^2/2g$ [m]',               color='#FF9800', alpha=0.8)
-
-        # Línea de energía total
-        energias = np.array([EGL_0, EGL_1, EGL_2, EGL_3])
-        ax3.plot(x, energias, 'r-o', lw=2.5, ms=9, label='Energía total H [m]', zorder=10)
-        for xi, ei in zip(x, energias):
-            ax3.text(xi, ei + 0.4, f'{ei:.1f} m', ha='center',
-                     fontsize=9, fontweight='bold', color='darkred')
-
-        # Flecha de la bomba
-        ax3.annotate('', xy=(x[2], EGL_2), xytext=(x[1], EGL_1),
-                     arrowprops=dict(arrowstyle='->', color='#FF5722', lw=2))
-        ax3.text(1.5, (EGL_1 + EGL_2) / 2 + 1, f'+{Hb:.1f} m\n(Bomba)',
-                 ha='center', fontsize=8, color='#BF360C', fontweight='bold')
-
-        # Flecha de pérdidas
-        ax3.annotate('', xy=(x[3], EGL_3), xytext=(x[2], EGL_2),
-                     arrowprops=dict(arrowstyle='->', color='gray', lw=1.5))
-        ax3.text(2.5, (EGL_2 + EGL_3) / 2 + 1, f'−{hf:.1f} m\n(Pérdidas)',
-                 ha='center', fontsize=8, color='gray')
-
-        ax3.set_title('⚡ Desglose de Energía en cada Punto del Sistema',
-                      fontsize=12, fontweight='bold', pad=8)
-        ax3.set_ylabel('Altura de energía [m]', fontsize=10)
-        ax3.set_xticks(x)
-        ax3.set_xticklabels(cats, fontsize=11)
-        ax3.legend(loc='upper right', fontsize=9, framealpha=0.92)
-        ax3.grid(True, axis='y', alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        return plt.gca()
-
-
-    _()
+def _(EGL_0, EGL_1, EGL_2, EGL_3, Hb, figura_diferida, figuras, hf, hv2, z2):
+    grafico_energia = figura_diferida(
+        figuras.dibujar_energia, "energia", EGL_0=EGL_0, EGL_1=EGL_1, EGL_2=EGL_2, EGL_3=EGL_3, Hb=Hb, hf=hf, hv2=hv2, z2=z2
+    )
+    grafico_energia
+    return (grafico_energia,)
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mostrar_diag = mo.ui.switch(value=False, label="Mostrar diagnóstico de rendimiento")
+    mostrar_diag
+    return (mostrar_diag,)
+
+
+@app.cell(hide_code=True)
+def _(
+    contadores,
+    grafico_energia,
+    grafico_sistema,
+    mo,
+    mostrar_diag,
+    np,
+    perfil_chrome,
+    perfil_json,
+    pool_trabajo,
+    tramos,
+):
+    _ = (grafico_sistema, grafico_energia)  # dependencia: el panel se actualiza tras cada cambio de los sliders
+    mo.stop(not mostrar_diag.value)
+
+    _por_nombre = {}
+    for _t in tramos:
+        _clave = _t["nombre"] + (f" ({_t['args']['figura']})" if "figura" in _t["args"] else "")
+        _por_nombre.setdefault(_clave, []).append(_t["dt"] * 1000)
+    _filas = ["| etapa | n | última (ms) | mediana (ms) | máx (ms) |", "|---|---:|---:|---:|---:|"]
+    for _k, _v in _por_nombre.items():
+        _filas.append(f"| {_k} | {len(_v)} | {_v[-1]:.2f} | {np.median(_v):.2f} | {max(_v):.2f} |")
+    _cont = ["| contador | total |", "|---|---:|"] + [f"| {k} | {v:,} |" for k, v in contadores.items()]
+    _ep = pool_trabajo.estado()
+    _pool = mo.md(
+        f"""
+**Pool de trabajo** ({_ep['tipo']}, {_ep['trabajadores']} trabajadores, compartido entre sesiones)
+
+- En cola / en curso: **{_ep['en_cola']}**
+- Latencia (n={_ep['n']}): p50 {_ep['p50_ms']:.1f} ms · p95 {_ep['p95_ms']:.1f} ms · p99 {_ep['p99_ms']:.1f} ms
+"""
+    )
+
+    mo.accordion(
+        {
+            "🔎 Diagnóstico de rendimiento": mo.vstack(
+                [
+                    mo.hstack([mo.md(chr(10).join(_filas)), mo.md(chr(10).join(_cont)), _pool], justify="start", gap="3rem"),
+                    mo.hstack(
+                        [
+                            mo.download(lambda: perfil_json().encode(), filename="perfil_bernoulli.json", label="JSON"),
+                            mo.download(lambda: perfil_chrome().encode(), filename="traza_bernoulli.json", label="Chrome trace"),
+                        ],
+                        justify="start",
+                    ),
+                ]
+            )
+        }
+    )
     return
 
 
@@ -439,13 +317,308 @@ def _(mo):
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    ---
+    ## 📦 Versión estática (sin kernel)
+
+    Todas las salidas son sumas o productos de términos que dependen de **un solo slider** (o del par $v$–$D$):
+
+    $$H_b = z_2 + \underbrace{v^2/2g}_{\text{tabla}(v)} + h_f, \qquad Q = \underbrace{A(D)\,v}_{\text{tabla}(v, D)}, \qquad P = \rho g\, Q\, H_b$$
+
+    Por eso basta precalcular tablas por eje (y una tabla $v \times D$) para cubrir **toda la retícula** de sliders
+    (96 × 80 × 56 × 61 ≈ 26 millones de combinaciones) con unos pocos kB. La página descargable contiene las tablas
+    en binario y dibuja los gráficos en el navegador: cada movimiento de slider es una consulta a la tabla.
+    """)
+    return
+
+
+@app.cell(hide_code=True)
+def _(json, np):
+    def tablas_reticulado(ejes, g=9.81, rho=1000.0):
+        # ejes: valores de cada slider (z2, v, D_mm, hf); todo en float64
+        z2, v, D_mm, hf = (np.asarray(ejes[k], dtype=np.float64) for k in ("z2", "v", "D_mm", "hf"))
+        A = np.pi * (D_mm / 1000.0) ** 2 / 4
+        return {
+            "z2": z2,
+            "v": v,
+            "D_mm": D_mm,
+            "hf": hf,
+            "hv2": v**2 / (2 * g),
+            "Q_lps": np.outer(v, A) * 1000,  # (n_v, n_D)
+            "perdida_succion": 0.15 * hf,
+            "k_potencia": np.array([rho * g / 1e6]),  # Pb_kW = k · Q_lps · Hb
+        }
+
+    def consultar(tablas, iz, iv, iD, ih):
+        # La misma consulta que hace la página estática (índices de slider, escalares o arreglos)
+        z2, hv2, hf = tablas["z2"][iz], tablas["hv2"][iv], tablas["hf"][ih]
+        Hb = z2 + hv2 + hf
+        Q_lps = tablas["Q_lps"][iv, iD]
+        EGL_1 = -tablas["perdida_succion"][ih]
+        EGL_2 = EGL_1 + Hb
+        EGL_3 = z2 + hv2
+        return {
+            "Hb": Hb,
+            "Q_lps": Q_lps,
+            "Pb_kW": tablas["k_potencia"][0] * Q_lps * Hb,
+            "EGL": [0.0 * Hb, EGL_1, EGL_2, EGL_3],
+            "HGL": [0.0 * Hb, EGL_1 - hv2, EGL_2 - hv2, EGL_3 - hv2],
+        }
+
+    def empaquetar(tablas, iniciales=None):
+        # Encabezado JSON (nombre, forma, desplazamiento, índice inicial de los ejes de slider)
+        # + datos float64 little-endian contiguos
+        meta, partes, pos = {}, [], 0
+        for nombre, a in tablas.items():
+            datos = np.ascontiguousarray(a, dtype="<f8").tobytes()
+            meta[nombre] = {"forma": list(a.shape), "inicio": pos // 8, "n": a.size}
+            if iniciales and nombre in iniciales:
+                meta[nombre]["inicial"] = int(iniciales[nombre])
+            partes.append(datos)
+            pos += len(datos)
+        return json.dumps(meta), b"".join(partes)
+
+    return consultar, empaquetar, tablas_reticulado
+
+
+@app.cell(hide_code=True)
+def _(base64, empaquetar, json):
+    _plantilla = r"""<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8">
+<title>Bernoulli — Sistema de Bombeo (estático)</title>
+<style>
+ body{font-family:system-ui,sans-serif;margin:1.5rem;background:#f5f5f5;color:#222}
+ .controles{display:grid;grid-template-columns:repeat(2,minmax(260px,1fr));gap:.6rem 3rem;max-width:900px}
+ label{display:flex;gap:.6rem;align-items:center} input{flex:1} b.val{min-width:4.5rem;text-align:right}
+ table{border-collapse:collapse;margin:1rem 0} td,th{border:1px solid #ccc;padding:.25rem .7rem;text-align:right}
+ svg{background:#fafafa;border:1px solid #ddd;margin:.5rem 1rem .5rem 0}
+</style></head><body>
+<h2>💧 Ecuación de Bernoulli: Sistema de Bombeo (versión estática)</h2>
+<div class="controles" id="controles"></div>
+<table><tr><th>H<sub>b</sub> [m]</th><th>Q [L/s]</th><th>P [kW]</th><th>v²/2g [m]</th></tr>
+<tr><td id="Hb"></td><td id="Q"></td><td id="P"></td><td id="hv"></td></tr></table>
+<svg id="lineas" width="560" height="360"></svg><svg id="barras" width="560" height="360"></svg>
+<script>
+const META = __META__;
+const BIN = Uint8Array.from(atob("__DATOS__"), c => c.charCodeAt(0));
+const F = new Float64Array(BIN.buffer);
+const T = {};
+for (const [k, m] of Object.entries(META)) T[k] = F.subarray(m.inicio, m.inicio + m.n);
+const nD = META.D_mm.n;
+const SL = [["z2", "🏔️ z₂ [m]", 0], ["v", "💨 v [m/s]", 1], ["D_mm", "🔩 D [mm]", 0], ["hf", "⚡ hf [m]", 1]];
+const idx = {};
+for (const [k, et, dec] of SL) {
+  const ini = META[k].inicial ?? 0;
+  idx[k] = ini;
+  const l = document.createElement("label");
+  l.innerHTML = `${et}<input type="range" min="0" max="${META[k].n - 1}" value="${ini}"><b class="val"></b>`;
+  const inp = l.querySelector("input"), val = l.querySelector("b");
+  const mostrar = () => { idx[k] = +inp.value; val.textContent = T[k][idx[k]].toFixed(dec); actualizar(); };
+  inp.addEventListener("input", mostrar);
+  document.getElementById("controles").appendChild(l);
+  val.textContent = T[k][ini].toFixed(dec);
+}
+function consultar() {
+  const z2 = T.z2[idx.z2], hv2 = T.hv2[idx.v], hf = T.hf[idx.hf];
+  const Hb = z2 + hv2 + hf, Q = T.Q_lps[idx.v * nD + idx.D_mm];
+  const E1 = -T.perdida_succion[idx.hf], E2 = E1 + Hb, E3 = z2 + hv2;
+  return {z2, hv2, hf, Hb, Q, P: T.k_potencia[0] * Q * Hb, EGL: [0, E1, E2, E3], HGL: [0, E1 - hv2, E2 - hv2, E3 - hv2]};
+}
+const SVG = "http://www.w3.org/2000/svg";
+function el(svg, tag, at, texto) {
+  const e = document.createElementNS(SVG, tag);
+  for (const [a, v] of Object.entries(at)) e.setAttribute(a, v);
+  if (texto !== undefined) e.textContent = texto;
+  svg.appendChild(e); return e;
+}
+function ejes(svg, ymin, ymax, titulo) {
+  svg.innerHTML = "";
+  const W = +svg.getAttribute("width"), H = +svg.getAttribute("height"), m = {l: 55, r: 15, t: 30, b: 45};
+  const y = v => m.t + (H - m.t - m.b) * (1 - (v - ymin) / (ymax - ymin));
+  const x = i => m.l + (W - m.l - m.r) * (i + 0.5) / 4;
+  el(svg, "text", {x: W / 2, y: 18, "text-anchor": "middle", "font-weight": "bold", "font-size": 14}, titulo);
+  const paso = Math.pow(10, Math.floor(Math.log10((ymax - ymin) / 4)));
+  const k = (ymax - ymin) / paso > 20 ? 5 : (ymax - ymin) / paso > 8 ? 2 : 1;
+  for (let v = Math.ceil(ymin / (k * paso)) * k * paso; v <= ymax; v += k * paso) {
+    el(svg, "line", {x1: m.l, x2: W - m.r, y1: y(v), y2: y(v), stroke: "#ddd", "stroke-dasharray": "3 3"});
+    el(svg, "text", {x: m.l - 6, y: y(v) + 4, "text-anchor": "end", "font-size": 11}, +v.toFixed(6));
+  }
+  ["Estanque (1)", "Antes bomba", "Después bomba", "Cerro (2)"].forEach((c, i) =>
+    el(svg, "text", {x: x(i), y: H - m.b + 18, "text-anchor": "middle", "font-size": 12}, c));
+  el(svg, "text", {x: 14, y: H / 2, transform: `rotate(-90 14 ${H / 2})`, "text-anchor": "middle", "font-size": 12}, "Altura [m]");
+  return {x, y};
+}
+function polilinea(svg, x, y, vals, color, guion) {
+  el(svg, "polyline", {points: vals.map((v, i) => `${x(i)},${y(v)}`).join(" "), fill: "none", stroke: color,
+    "stroke-width": 2.5, "stroke-dasharray": guion || ""});
+  vals.forEach((v, i) => el(svg, "circle", {cx: x(i), cy: y(v), r: 4.5, fill: color}));
+}
+function actualizar() {
+  const r = consultar();
+  document.getElementById("Hb").textContent = r.Hb.toFixed(2);
+  document.getElementById("Q").textContent = r.Q.toFixed(3);
+  document.getElementById("P").textContent = r.P.toFixed(3);
+  document.getElementById("hv").textContent = r.hv2.toFixed(4);
+
+  const todos = r.EGL.concat(r.HGL, [0, r.z2]);
+  const ymin = Math.min(...todos) - 2, ymax = Math.max(...todos) * 1.08 + 2;
+  const a = document.getElementById("lineas"), g = ejes(a, ymin, ymax, "Líneas de energía (EGL) y piezométrica (HGL)");
+  polilinea(a, g.x, g.y, r.HGL, "#1565C0", "6 4");
+  polilinea(a, g.x, g.y, r.EGL, "#C62828");
+  r.EGL.forEach((v, i) => el(a, "text", {x: g.x(i), y: g.y(v) - 9, "text-anchor": "middle", "font-size": 11,
+    fill: "darkred", "font-weight": "bold"}, v.toFixed(1) + " m"));
+  el(a, "text", {x: 60, y: 45, fill: "#C62828", "font-size": 12}, "— EGL");
+  el(a, "text", {x: 60, y: 60, fill: "#1565C0", "font-size": 12}, "- - HGL");
+
+  // Desglose: cota, presión y cinética en cada punto
+  const z = [0, -2, -2, r.z2], hv = [0, r.hv2, r.hv2, r.hv2];
+  const b = document.getElementById("barras");
+  const hp = r.EGL.map((e, i) => Math.max(e - z[i] - hv[i], 0));
+  const tope = Math.max(...r.EGL, ...hp.map((p, i) => Math.max(z[i], 0) + p + hv[i]));
+  const h = ejes(b, Math.min(0, ...r.EGL) - 1, tope * 1.1 + 1, "Desglose de energía en cada punto");
+  const ancho = (h.x(1) - h.x(0)) * 0.5;
+  for (let i = 0; i < 4; i++) {
+    let base = 0;
+    for (const [alto, color] of [[Math.max(z[i], 0), "#795548"], [hp[i], "#2196F3"], [hv[i], "#FF9800"]]) {
+      if (alto > 0) el(b, "rect", {x: h.x(i) - ancho / 2, width: ancho, y: h.y(base + alto), height: h.y(base) - h.y(base + alto),
+        fill: color, opacity: 0.85});
+      base += alto;
+    }
+  }
+  polilinea(b, h.x, h.y, r.EGL, "#d32f2f");
+  [["Cota z", "#795548"], ["Presión P/ρg", "#2196F3"], ["Cinética v²/2g", "#FF9800"]].forEach(([t, c], i) =>
+    el(b, "text", {x: 400, y: 45 + 15 * i, fill: c, "font-size": 12, "font-weight": "bold"}, "■ " + t));
+}
+actualizar();
+</script></body></html>
+"""
+
+    def pagina_estatica(tablas, iniciales=None):
+        # iniciales: índice de cada eje de slider con el que abre la página
+        meta, datos = empaquetar(tablas, iniciales)
+        return (
+            _plantilla.replace("__META__", meta)
+            .replace("__DATOS__", base64.b64encode(datos).decode("ascii"))
+        )
+
+    return (pagina_estatica,)
+
+
+@app.cell(hide_code=True)
+def _(mo, np, pagina_estatica, slider_D, slider_hf, slider_v, slider_z2, tablas_reticulado):
+    def _valores(s):
+        return np.round(np.arange(s.start, s.stop + s.step / 2, s.step), 10)
+
+    tablas_estaticas = tablas_reticulado(
+        {"z2": _valores(slider_z2), "v": _valores(slider_v), "D_mm": _valores(slider_D), "hf": _valores(slider_hf)}
+    )
+    # La página abre en los valores actuales de los sliders
+    iniciales_estaticas = {
+        k: int(np.argmin(np.abs(tablas_estaticas[k] - s.value)))
+        for k, s in {"z2": slider_z2, "v": slider_v, "D_mm": slider_D, "hf": slider_hf}.items()
+    }
+    _n_ret = int(np.prod([tablas_estaticas[k].size for k in ("z2", "v", "D_mm", "hf")]))
+    _n_bytes = sum(a.nbytes for a in tablas_estaticas.values())
+    mo.hstack(
+        [
+            mo.download(
+                lambda: pagina_estatica(tablas_estaticas, iniciales_estaticas).encode(),
+                filename="bernoulli_bombeo_estatico.html",
+                label="Descargar página estática",
+            ),
+            mo.md(f"Retícula de {_n_ret:,} combinaciones cubierta con **{_n_bytes / 1024:.1f} kB** de tablas."),
+        ],
+        justify="start",
+        gap="2rem",
+    )
+    return iniciales_estaticas, tablas_estaticas
+
+
+@app.cell(hide_code=True)
+def _(instrumentacion):
+    # Instrumentación (instrumentacion.py): tramos medidos (celda/etapa) y contadores acumulados
+    perfil = instrumentacion.Perfil()
+    medir, anotar, contar = perfil.medir, perfil.anotar, perfil.contar
+    perfil_json, perfil_chrome = perfil.a_json, perfil.a_chrome
+    tramos, contadores = perfil.tramos, perfil.contadores
+    return anotar, contadores, medir, perfil, perfil_chrome, perfil_json, tramos
+
+
+@app.cell(hide_code=True)
+def _(CancelledError, anotar, medir, mo, pool_trabajo, sys, time):
+    # Los sliders no tienen debounce: el callout numérico sigue el arrastre. Solo las figuras esperan a que
+    # los valores se queden quietos: cada una se rasteriza en un hilo que primero duerme `espera_figura_s`;
+    # si entretanto llega un valor nuevo, marimo vuelve a ejecutar la celda, marca el hilo anterior
+    # (`should_exit`) y ese hilo termina sin enviar nada al pool. Si ya lo había enviado y el trabajo sigue
+    # en cola, el envío nuevo de la misma figura (misma clave en el pool) lo cancela.
+    espera_figura_s = 0.3
+    _sesion = object()  # el pool es de todo el proceso: la clave distingue esta sesión
+    _ultimas = {}  # último PNG de cada figura, se muestra atenuado mientras llega el nuevo
+
+    def _rasterizar(fn, figura, kwargs):
+        with medir("pool", figura=figura):
+            r = pool_trabajo.ejecutar_bloqueante(fn, clave=(_sesion, figura), **kwargs)
+        for k, dt in r["tiempos"].items():
+            anotar(k, dt, figura=figura)
+        _ultimas[figura] = r["png"]
+        return mo.image(r["png"])
+
+    def figura_diferida(fn, figura, **kwargs):
+        if not mo.running_in_notebook() or sys.platform == "emscripten":
+            # Sin frontend (script, pruebas) o sin hilos del sistema (Pyodide): se dibuja de inmediato
+            return _rasterizar(fn, figura, kwargs)
+
+        def _tarea():
+            hilo = mo.current_thread()
+            time.sleep(espera_figura_s)
+            if hilo.should_exit:
+                return
+            try:
+                imagen = _rasterizar(fn, figura, kwargs)
+            except CancelledError:  # lo reemplazó un valor más nuevo antes de empezar
+                return
+            if not hilo.should_exit:
+                mo.output.replace(imagen)
+
+        mo.Thread(target=_tarea, daemon=True).start()
+        if figura in _ultimas:
+            return mo.image(_ultimas[figura], style={"opacity": "0.5"})
+        return mo.md("_Dibujando…_")
+
+    return (figura_diferida,)
+
+
 @app.cell(hide_code=True)
 def _():
     import marimo as mo
+    import base64
+    import json
+    import sys
+    import time
+    from concurrent.futures import CancelledError
     import numpy as np
-    import matplotlib.pyplot as plt
 
-    return mo, np, plt
+    # Módulos compartidos de recursos/: pool de trabajo, figuras que se rasterizan en él e instrumentación
+    if str(mo.notebook_dir()) not in sys.path:
+        sys.path.insert(0, str(mo.notebook_dir()))
+    import figuras
+    import instrumentacion
+    import pool_trabajo
+
+    return (
+        CancelledError,
+        base64,
+        figuras,
+        instrumentacion,
+        json,
+        mo,
+        np,
+        pool_trabajo,
+        sys,
+        time,
+    )
 
 
 if __name__ == "__main__":
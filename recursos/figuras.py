@@ -0,0 +1,316 @@
+"""Figuras de matplotlib que los notebooks rasterizan en el pool de trabajo (`pool_trabajo.py`).
+
+Cada función recibe solo datos (números, listas, arreglos de numpy) y devuelve el PNG con los tiempos de
+sus etapas. Los imports van dentro de cada función para que importar este módulo en el kernel no cargue
+matplotlib: solo lo cargan los trabajadores del pool.
+"""
+
+
+def dibujar_fondo(curvas, rr_lines, y_min, y_max):
+    # Se ejecuta en el pool de trabajo: usa la API orientada a objetos (sin pyplot)
+    import io
+    import time
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    t0 = time.perf_counter()
+    fig = Figure(figsize=(11, 7))
+    ax = fig.subplots()
+    fig.subplots_adjust(left=0.09, right=0.88, bottom=0.1, top=0.92)
+
+    for Re_rr, f_rr in curvas:
+        ax.plot(Re_rr, f_rr, lw=1.2, color="steelblue")
+
+    # Línea laminar (Fanning)
+    Re_l = np.logspace(2.3, np.log10(2300), 200)
+    ax.plot(Re_l, 16 / Re_l, color="black", lw=2.0, label="Laminar: f = 16/Re")
+
+    # Zona sombreada laminar
+    ax.axvspan(1e3, 2300, color="#d9d9d9", alpha=0.25, zorder=0)
+    ax.text(1300, 0.095, "Régimen laminar", fontsize=11, color="#555555")
+
+    ax.set_xscale("log")
+    ax.set_xlim(1e3, 1e8)
+
+    ax.set_ylim(y_min, y_max)
+    y_ticks = np.arange(0.0, 0.0301, 0.005)
+    ax.set_yticks(y_ticks)
+    ax.set_yticklabels([f"{t:.2f}" for t in y_ticks])
+
+    ax.grid(True, which="both", ls="--", alpha=0.3)
+    ax.set_title("Diagrama de Moody (Fanning)", fontsize=18, fontweight="bold")
+    ax.set_xlabel("Número de Reynolds, Re", fontsize=14)
+    ax.set_ylabel("Factor de fricción de Fanning, f", fontsize=14)
+    ax.tick_params(axis="both", labelsize=12)
+
+    # Eje derecho: rugosidad relativa en notación científica
+    ax2 = ax.twinx()
+    fD_right = 1 / (-2 * np.log10(rr_lines / 3.7)) ** 2
+    fF_right = fD_right / 4
+    m = (fF_right >= y_min) & (fF_right <= y_max)
+    ax2.set_ylim(y_min, y_max)
+    ax2.set_yticks(fF_right[m])
+    ax2.set_yticklabels([f"{r:.1e}" for r in rr_lines[m]], fontsize=12)
+    ax2.set_ylabel("Rugosidad relativa, ε/D", fontsize=14)
+
+    ax.legend(loc="upper center")
+
+    t1 = time.perf_counter()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    t2 = time.perf_counter()
+
+    # Geometría del área de ejes en píxeles (origen arriba a la izquierda) para el marcador
+    W, H = fig.get_size_inches() * fig.dpi
+    pos = ax.get_position()
+    geom = {
+        "W": W,
+        "H": H,
+        "x0": pos.x0 * W,
+        "x1": pos.x1 * W,
+        "y0": (1 - pos.y1) * H,
+        "y1": (1 - pos.y0) * H,
+        "lx": (3.0, 8.0),
+        "ly": (y_min, y_max),
+    }
+    return {"png": buf.getvalue(), "geom": geom, "tiempos": {"artistas": t1 - t0, "render": t2 - t1}}
+
+
+def dibujar_sistema(D_mm, EGL_0, EGL_1, EGL_2, EGL_3, HGL_0, HGL_1, HGL_2, HGL_3, Hb, Pb_kW, Q_lps, hf, v2, z2):
+    # Se ejecuta en el pool de trabajo: API orientada a objetos de matplotlib (sin pyplot)
+    import io
+    import time
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Circle, FancyBboxPatch
+
+    t0 = time.perf_counter()
+    fig = Figure(figsize=(16, 7))
+    axes = fig.subplots(1, 2)
+    fig.patch.set_facecolor('#f8f9fa')
+
+    # ══════════════════════════════════════════════════════════
+    # PANEL IZQUIERDO — Esquema físico del sistema
+    # ══════════════════════════════════════════════════════════
+    ax1 = axes[0]
+    ax1.set_facecolor('#e8f4f8')
+    ax1.set_xlim(-1.2, 11.5)
+    ax1.set_ylim(-6, z2 + 10)
+    ax1.set_title('📐 Esquema del Sistema de Bombeo', fontsize=13,
+                  fontweight='bold', pad=10)
+    ax1.set_xlabel('Distancia (esquemática)', fontsize=10)
+    ax1.set_ylabel('Cota  z  [m]', fontsize=10)
+    ax1.grid(True, alpha=0.25, linestyle='--')
+
+    # Perfil del terreno / cerro
+    xT = np.array([0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 0])
+    zT = np.array([0, 0, .05, .15, .35, .60, .78, .90, .97, 1, -.05, -.05]) * z2
+    ax1.fill(xT, zT, color='#8B7355', alpha=0.65)
+    ax1.fill([0, 0, 2, 2], [-6, 0, 0, -6], color='#8B7355', alpha=0.65)
+    # Pasto
+    ax1.fill_between([0, 2], [0, 0], [0.25, 0.25], color='#4CAF50', alpha=0.7)
+    ax1.fill_between(xT[:10], zT[:10], zT[:10] + 0.2, color='#4CAF50', alpha=0.7)
+
+    # Estanque
+    eh = min(3.5, z2 * 0.12 + 1.5)
+    ax1.add_patch(FancyBboxPatch((-1.0, -eh), 2.0, eh,
+                                  boxstyle='square', lw=2,
+                                  edgecolor='#1565C0', facecolor='#BBDEFB', alpha=0.85))
+    ax1.fill([-0.95, -0.95, 0.9, 0.9],
+             [-eh, -0.1, -0.1, -eh], color='#2196F3', alpha=0.55)
+    ax1.axhline(0, xmin=0.0, xmax=0.18, color='#1976D2', lw=3, alpha=0.9)
+    ax1.text(0, 0.5, 'Nivel libre', ha='center', fontsize=8, color='#1565C0')
+    ax1.text(0, -eh - 0.9, 'Estanque\n(Punto 1)', ha='center',
+             fontsize=8, color='#1565C0', fontweight='bold')
+    ax1.text(0, -eh - 1.7, '$z_1 = 0$ m', ha='center', fontsize=8, color='#1565C0')
+
+    # Tubería
+    x_pipe = np.linspace(2.0, 10.0, 200)
+    z_pipe = np.linspace(-2.0, z2, 200)
+    ax1.plot([0.6, 1.5], [0, 0], color='#37474F', lw=5, zorder=5, solid_capstyle='round')
+    ax1.plot([1.5, 1.5], [0, -2], color='#37474F', lw=5, zorder=5)
+    ax1.plot(x_pipe, z_pipe, color='#37474F', lw=5, zorder=5, solid_capstyle='round')
+
+    # Flechas de flujo
+    for pct in [0.25, 0.5, 0.75]:
+        xi = 2 + pct * 8
+        zi = -2 + pct * (z2 + 2)
+        dz = (z2 + 2) / 8 * 0.6
+        ax1.annotate('', xy=(xi + 0.5, zi + dz), xytext=(xi, zi),
+                     arrowprops=dict(arrowstyle='->', color='#2196F3', lw=2))
+
+    # Bomba
+    bomba_circ = Circle((1.5, -3.0), 0.55, color='#FF5722', zorder=10, ec='#BF360C', lw=2)
+    ax1.add_patch(bomba_circ)
+    ax1.text(1.5, -3.0, '⚙', fontsize=18, ha='center', va='center', zorder=11)
+    ax1.annotate(f'BOMBA\n$H_b = {Hb:.1f}$ m\n$P = {Pb_kW:.2f}$ kW',
+                 xy=(1.5, -3.6), fontsize=8, ha='center', fontweight='bold',
+                 color='#BF360C',
+                 bbox=dict(boxstyle='round,pad=0.35', facecolor='#FFCCBC', alpha=0.9))
+
+    # Punto de llegada
+    ax1.plot(10, z2, 'o', color='#E91E63', ms=11, zorder=10, mec='#880E4F', mew=2)
+    ax1.annotate(f'Punto 2\n$z_2 = {z2:.0f}$ m',
+                 xy=(10, z2), xytext=(8.0, z2 + 2.5),
+                 fontsize=9, fontweight='bold', color='#880E4F',
+                 arrowprops=dict(arrowstyle='->', color='#880E4F', lw=1.5),
+                 bbox=dict(boxstyle='round,pad=0.3', facecolor='#FCE4EC', alpha=0.85))
+
+    # Cotas de referencia
+    ax1.axhline(0,  color='#FF9800', ls=':', lw=1.5, alpha=0.8)
+    ax1.axhline(z2, color='#9C27B0', ls=':', lw=1.5, alpha=0.8)
+    ax1.annotate('', xy=(10.8, z2), xytext=(10.8, 0),
+                 arrowprops=dict(arrowstyle='<->', color='#9C27B0', lw=2))
+    ax1.text(11.1, z2 / 2, f'$z_2={z2:.0f}$ m', fontsize=9,
+             color='#9C27B0', va='center', fontweight='bold')
+
+    # ══════════════════════════════════════════════════════════
+    # PANEL DERECHO — Líneas EGL y HGL
+    # ══════════════════════════════════════════════════════════
+    ax2 = axes[1]
+    ax2.set_facecolor('#f0f4e8')
+    ax2.set_title('📊 Líneas de Energía (EGL) y Piezométrica (HGL)',
+                  fontsize=13, fontweight='bold', pad=10)
+    ax2.set_xlabel('Posición en el sistema', fontsize=10)
+    ax2.set_ylabel('Altura de energía  [m]', fontsize=10)
+    ax2.grid(True, alpha=0.25, linestyle='--')
+
+    X  = [0, 1.5, 1.5, 10]
+    Zc = [0, -2,  -2,  z2]   # cotas del eje de la tubería
+
+    # Rellenos por componente de energía
+    ax2.fill_between([0, 1.5], [EGL_0, EGL_1], [HGL_0, HGL_1],
+                     alpha=0.3, color='#FF9800', label='$v^2/2g$ (cinética)')
+    ax2.fill_between([1.5, 10], [EGL_2, EGL_3], [HGL_2, HGL_3],
+                     alpha=0.3, color='#FF9800')
+    ax2.fill_between([0, 1.5], [HGL_0, HGL_1], [Zc[0], Zc[1]],
+                     alpha=0.25, color='#2196F3', label='$P/\\rho g$ (presión)')
+    ax2.fill_between([1.5, 10], [HGL_2, HGL_3], [Zc[2], Zc[3]],
+                     alpha=0.25, color='#2196F3')
+    ax2.fill_between([0, 10], [0, 0], -1,
+                     alpha=0.0)   # referencia invisible
+    # Cota positiva
+    z_pos_0 = max(Zc[0], 0); z_pos_3 = max(Zc[3], 0)
+    if z_pos_3 > 0:
+        ax2.fill_between([1.5, 10], [Zc[2], Zc[3]], [0, 0],
+                         where=[Zc[2] >= 0, Zc[3] >= 0],
+                         alpha=0.3, color='#795548', label='$z$ (potencial)')
+
+    # Cota del terreno
+    ax2.plot([0, 1.5, 1.5, 10], [0, -2, -2, z2],
+             'k--', lw=1.5, alpha=0.45, label='Cota tubería')
+
+    # HGL
+    ax2.plot([0, 1.5], [HGL_0, HGL_1], 'b-', lw=2.5, label='HGL (piezométrica)')
+    ax2.plot([1.5, 1.5], [HGL_1, HGL_2], 'b-', lw=2.5)
+    ax2.plot([1.5, 10], [HGL_2, HGL_3], 'b-', lw=2.5)
+
+    # EGL
+    ax2.plot([0, 1.5], [EGL_0, EGL_1], 'r-', lw=2.5, label='EGL (energía total)')
+    ax2.plot([1.5, 1.5], [EGL_1, EGL_2], 'r-', lw=2.5)
+    ax2.plot([1.5, 10], [EGL_2, EGL_3], 'r-', lw=2.5)
+
+    # Puntos clave
+    for xi, ei, hi in zip([0, 1.5, 1.5, 10],
+                           [EGL_0, EGL_1, EGL_2, EGL_3],
+                           [HGL_0, HGL_1, HGL_2, HGL_3]):
+        ax2.plot(xi, ei, 'ro', ms=8, zorder=10)
+        ax2.plot(xi, hi, 'bo', ms=8, zorder=10)
+
+    # Flecha de aporte de la bomba
+    ax2.annotate('', xy=(1.5, EGL_2), xytext=(1.5, EGL_1),
+                 arrowprops=dict(arrowstyle='->', color='#FF5722', lw=2.5))
+    ax2.text(1.65, (EGL_1 + EGL_2) / 2, f'$H_b = {Hb:.1f}$ m',
+             fontsize=9, color='#BF360C', fontweight='bold')
+
+    # Etiquetas de pérdidas
+    perdida_total = EGL_2 - EGL_3
+    ax2.annotate('', xy=(10, EGL_3), xytext=(10, EGL_2),
+                 arrowprops=dict(arrowstyle='->', color='gray', lw=1.5))
+    ax2.text(9.0, (EGL_2 + EGL_3) / 2, f'$h_f={hf:.1f}$ m',
+             fontsize=8, color='gray', ha='right')
+
+    ax2.set_xticks([0, 1.5, 10])
+    ax2.set_xticklabels(['Estanque (1)', 'Bomba', 'Cerro (2)'], fontsize=10)
+    ax2.legend(loc='upper left', fontsize=9, framealpha=0.9)
+
+    fig.suptitle(
+        f'💧 Bernoulli — z₂={z2} m  |  v={v2} m/s  |  D={D_mm} mm  |  hf={hf} m'
+        f'   →   Hb={Hb:.2f} m  |  Q={Q_lps:.2f} L/s  |  P={Pb_kW:.3f} kW',
+        fontsize=11, fontweight='bold', color='#1A237E', y=1.01,
+        bbox=dict(boxstyle='round,pad=0.4', facecolor='#E3F2FD', alpha=0.9)
+    )
+
+    t1 = time.perf_counter()
+    fig.tight_layout()
+    t2 = time.perf_counter()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    t3 = time.perf_counter()
+    return {"png": buf.getvalue(), "tiempos": {"artistas": t1 - t0, "tight_layout": t2 - t1, "render": t3 - t2}}
+
+
+def dibujar_energia(EGL_0, EGL_1, EGL_2, EGL_3, Hb, hf, hv2, z2):
+    # Se ejecuta en el pool de trabajo: API orientada a objetos de matplotlib (sin pyplot)
+    import io
+    import time
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    t0 = time.perf_counter()
+    fig2 = Figure(figsize=(10, 5))
+    ax3 = fig2.subplots()
+    fig2.patch.set_facecolor('#f5f5f5')
+    ax3.set_facecolor('#fafafa')
+
+    cats   = ['Estanque (1)', 'Antes\nBomba', 'Después\nBomba', 'Cerro (2)']
+    z_v    = np.array([0.0,  -2.0,  -2.0,  z2])
+    hv_v   = np.array([0.0,  hv2,   hv2,   hv2])
+    # Altura de presión = EGL - z - hv (solo parte positiva para graficar)
+    hp_v   = np.array([EGL_0, EGL_1, EGL_2, EGL_3]) - z_v - hv_v
+    hp_v   = np.maximum(hp_v, 0)
+    z_plot = np.maximum(z_v, 0)
+
+    x = np.arange(len(cats))
+    w = 0.5
+
+    ax3.bar(x, z_plot,  w, label='Cota  z [m]',          color='#795548', alpha=0.85)
+    ax3.bar(x, hp_v,    w, bottom=z_plot,
+            label='Presión  $P/\\rho g$ [m]',             color='#2196F3', alpha=0.8)
+    ax3.bar(x, hv_v,    w, bottom=z_plot + hp_v,
+            label='Cinética  $v^2/2g$ [m]',               color='#FF9800', alpha=0.8)
+
+    # Línea de energía total
+    energias = np.array([EGL_0, EGL_1, EGL_2, EGL_3])
+    ax3.plot(x, energias, 'r-o', lw=2.5, ms=9, label='Energía total H [m]', zorder=10)
+    for xi, ei in zip(x, energias):
+        ax3.text(xi, ei + 0.4, f'{ei:.1f} m', ha='center',
+                 fontsize=9, fontweight='bold', color='darkred')
+
+    # Flecha de la bomba
+    ax3.annotate('', xy=(x[2], EGL_2), xytext=(x[1], EGL_1),
+                 arrowprops=dict(arrowstyle='->', color='#FF5722', lw=2))
+    ax3.text(1.5, (EGL_1 + EGL_2) / 2 + 1, f'+{Hb:.1f} m\n(Bomba)',
+             ha='center', fontsize=8, color='#BF360C', fontweight='bold')
+
+    # Flecha de pérdidas
+    ax3.annotate('', xy=(x[3], EGL_3), xytext=(x[2], EGL_2),
+                 arrowprops=dict(arrowstyle='->', color='gray', lw=1.5))
+    ax3.text(2.5, (EGL_2 + EGL_3) / 2 + 1, f'−{hf:.1f} m\n(Pérdidas)',
+             ha='center', fontsize=8, color='gray')
+
+    ax3.set_title('⚡ Desglose de Energía en cada Punto del Sistema',
+                  fontsize=12, fontweight='bold', pad=8)
+    ax3.set_ylabel('Altura de energía [m]', fontsize=10)
+    ax3.set_xticks(x)
+    ax3.set_xticklabels(cats, fontsize=11)
+    ax3.legend(loc='upper right', fontsize=9, framealpha=0.92)
+    ax3.grid(True, axis='y', alpha=0.3, linestyle='--')
+
+    t1 = time.perf_counter()
+    fig2.tight_layout()
+    t2 = time.perf_counter()
+    buf = io.BytesIO()
+    fig2.savefig(buf, format="png", bbox_inches="tight")
+    t3 = time.perf_counter()
+    return {"png": buf.getvalue(), "tiempos": {"artistas": t1 - t0, "tight_layout": t2 - t1, "render": t3 - t2}}
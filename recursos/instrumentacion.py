@@ -0,0 +1,68 @@
+"""Instrumentación de los notebooks interactivos: tramos medidos (celda/etapa) y contadores acumulados.
+
+Lo usan `00_moody.py` y `bernoulli_bombeo.py`. Cada notebook crea su propio `Perfil` (las sesiones no
+comparten mediciones) y lo exporta como JSON o como traza de Chrome (chrome://tracing, Perfetto).
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Perfil:
+    """Tramos y contadores de una sesión; guarda los últimos `n_max` tramos y muestras de contadores."""
+
+    def __init__(self, n_max=2000):
+        self.t_base = time.perf_counter()
+        self.tramos = deque(maxlen=n_max)
+        self.muestras = deque(maxlen=n_max)
+        self.contadores = {}
+        self._pausa = threading.local()
+
+    @contextmanager
+    def medir(self, nombre, **args):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._tramo(nombre, t0, time.perf_counter() - t0, args)
+
+    def anotar(self, nombre, dt, **args):
+        """Registra un tramo medido fuera del kernel (en el pool de trabajo) que terminó recién."""
+        self._tramo(nombre, time.perf_counter() - dt, dt, args)
+
+    def contar(self, nombre, n=1):
+        if getattr(self._pausa, "activa", False):
+            return
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + n
+        self.muestras.append((time.perf_counter() - self.t_base, nombre, self.contadores[nombre]))
+
+    @contextmanager
+    def sin_contar(self):
+        """Trabajo propio del diagnóstico: en este hilo no suma tramos ni contadores."""
+        anterior = getattr(self._pausa, "activa", False)
+        self._pausa.activa = True
+        try:
+            yield
+        finally:
+            self._pausa.activa = anterior
+
+    def _tramo(self, nombre, t0, dt, args):
+        if getattr(self._pausa, "activa", False):
+            return
+        self.tramos.append({"nombre": nombre, "t0": t0 - self.t_base, "dt": dt, "args": args})
+        self.contar(f"n_{nombre}")
+
+    def a_json(self):
+        return json.dumps({"tramos": list(self.tramos), "contadores": self.contadores}, indent=2)
+
+    def a_chrome(self):
+        # Formato "Trace Event": tramos como eventos completos ("X") y contadores como series ("C")
+        eventos = [
+            {"name": t["nombre"], "ph": "X", "ts": t["t0"] * 1e6, "dur": t["dt"] * 1e6, "pid": 1, "tid": 1, "args": t["args"]}
+            for t in self.tramos
+        ]
+        eventos += [{"name": k, "ph": "C", "ts": ts * 1e6, "pid": 1, "args": {k: v}} for ts, k, v in self.muestras]
+        return json.dumps({"traceEvents": eventos, "displayTimeUnit": "ms"})
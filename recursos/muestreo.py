@@ -0,0 +1,92 @@
+"""Muestreo adaptativo de curvas y caché de puntos ya evaluados.
+
+Lo usan `00_moody.py` y `02_pumps.py`. La caché es una por proceso y la comparten los redibujos y las
+sesiones (`marimo run` ejecuta cada sesión en un hilo del mismo servidor): un LRU acotado de curvas, cada una
+un dict con los puntos evaluados. Las claves de curva las elige cada notebook (p. ej. el nombre del notebook
+y los parámetros de la curva).
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+N_CURVAS = 64
+
+_lock = threading.Lock()
+_curvas = OrderedDict()
+
+
+def cache_curva(clave):
+    """Dict de puntos de la curva `clave` (nuevo si no estaba); descarta las curvas usadas hace más tiempo."""
+    with _lock:
+        if clave in _curvas:
+            _curvas.move_to_end(clave)
+        else:
+            _curvas[clave] = {}
+            while len(_curvas) > N_CURVAS:
+                _curvas.popitem(last=False)
+        return _curvas[clave]
+
+
+def vaciar_cache():
+    with _lock:
+        _curvas.clear()
+
+
+def muestreo_adaptativo(fn, x0, x1, tol, n_ini=17, niveles=8, cache=None):
+    """Puntos ``x`` de [x0, x1] donde la interpolación lineal de ``fn`` queda dentro de ``tol``.
+
+    Devuelve ``(x, y, stats)`` con ``y`` de forma (salidas, puntos) y ``stats`` con los puntos, las
+    evaluaciones nuevas y los valores reutilizados de ``cache`` (ver `cache_curva`).
+    """
+    # Bisección de intervalos: se divide solo donde el punto medio se aparta de la cuerda más que `tol`
+    # (por salida si `fn` devuelve varias filas). Los puntos viven en una grilla entera fina
+    # x = x0 + i·paso, así la caché (un dict por curva) se consulta por igualdad exacta de índices.
+    tol = np.atleast_1d(np.asarray(tol, dtype=float))[:, None]
+    escala = 2**niveles
+    paso = (x1 - x0) / ((n_ini - 1) * escala)
+    clave = (x0, x1, n_ini, niveles)
+    stats = {"evaluaciones": 0, "reutilizados": 0}
+
+    def evaluar(i):
+        ci, cy = (cache or {}).get(clave, (np.empty(0, dtype=np.int64), None))
+        pos = np.minimum(np.searchsorted(ci, i), max(ci.size - 1, 0))
+        esta = ci[pos] == i if ci.size else np.zeros(i.size, dtype=bool)
+        nuevos = i[~esta]
+        y_n = np.atleast_2d(fn(x0 + nuevos * paso)) if nuevos.size else None
+        y = np.empty(((cy if cy is not None else y_n).shape[0], i.size))
+        if esta.any():
+            y[:, esta] = cy[:, pos[esta]]
+        if nuevos.size:
+            y[:, ~esta] = y_n
+            if cache is not None:
+                todos_i = np.concatenate([ci, nuevos])
+                todos_y = y_n if cy is None else np.concatenate([cy, y_n], axis=1)
+                orden = np.argsort(todos_i, kind="stable")
+                cache[clave] = (todos_i[orden], todos_y[:, orden])
+        stats["evaluaciones"] += nuevos.size
+        stats["reutilizados"] += int(esta.sum())
+        return y
+
+    i_ini = np.arange(n_ini, dtype=np.int64) * escala
+    y_ini = evaluar(i_ini)
+    idx, ys = [i_ini], [y_ini]
+    i_a, i_b = i_ini[:-1], i_ini[1:]
+    y_a, y_b = y_ini[:, :-1], y_ini[:, 1:]
+    for _ in range(niveles):
+        if i_a.size == 0:
+            break
+        i_m = (i_a + i_b) // 2
+        y_m = evaluar(i_m)
+        dividir = np.any(np.abs(y_m - 0.5 * (y_a + y_b)) > tol, axis=0)
+        idx.append(i_m[dividir])
+        ys.append(y_m[:, dividir])
+        i_a, i_b = np.concatenate([i_a[dividir], i_m[dividir]]), np.concatenate([i_m[dividir], i_b[dividir]])
+        y_a = np.concatenate([y_a[:, dividir], y_m[:, dividir]], axis=1)
+        y_b = np.concatenate([y_m[:, dividir], y_b[:, dividir]], axis=1)
+
+    idx = np.concatenate(idx)
+    orden = np.argsort(idx)
+    stats["puntos"] = idx.size
+    return x0 + idx[orden] * paso, np.concatenate(ys, axis=1)[:, orden], stats
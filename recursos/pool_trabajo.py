@@ -0,0 +1,190 @@
+"""Pool de trabajo acotado para rasterizar figuras fuera del kernel de marimo.
+
+Lo usan `00_moody.py` y `bernoulli_bombeo.py`. Hay un único pool por proceso, compartido por todas
+las sesiones (`marimo run` ejecuta cada sesión en un hilo del mismo servidor). Las funciones que se
+envían deben estar definidas a nivel de módulo en un módulo importable (ver `figuras.py`): los
+trabajadores las reciben por referencia con pickle, igual que sus argumentos.
+
+Donde no se pueden crear procesos ni hilos (Pyodide, `sys.platform == "emscripten"`) la función se
+ejecuta en línea, en el mismo hilo del kernel. Si el pool deja de aceptar trabajos (p. ej. murió un
+trabajador) se crea uno nuevo; solo mientras no se pueda crear ninguno se ejecuta en línea, y se vuelve a
+intentar cada `REINTENTO_S` segundos.
+
+Un trabajo puede llevar una `clave` (p. ej. sesión y figura): al enviar otro con la misma clave, el
+anterior se cancela si aún espera en la cola, para que los redibujos ya superados no ocupen trabajadores.
+"""
+
+import asyncio
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+N_MAX = 4
+REINTENTO_S = 30.0
+
+_lock = threading.Lock()
+_ejecutor = None
+_tipo = None
+_n = 1
+_en_cola = 0
+_reintento = 0.0  # instante desde el que se puede volver a crear el pool tras un fallo
+_precarga = ("matplotlib.figure",)
+_pendientes = {}  # clave -> último futuro enviado con esa clave
+_latencias = deque(maxlen=1000)
+
+
+def _precargar(modulos):
+    # Importa en el trabajador lo que las figuras usan, para que el primer dibujo no lo pague
+    for m in modulos:
+        __import__(m)
+
+
+def _crear_ejecutor(n, precargar):
+    if sys.platform == "emscripten":
+        return None, "en línea"
+    try:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        ejecutor = ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn"))
+        for _ in range(n):
+            ejecutor.submit(_precargar, precargar)
+        return ejecutor, "procesos"
+    except (ImportError, NotImplementedError, OSError, RuntimeError):
+        pass
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        return ThreadPoolExecutor(max_workers=n), "hilos"
+    except (ImportError, RuntimeError):
+        return None, "en línea"
+
+
+def _crear():
+    # Con _lock tomado
+    global _ejecutor, _tipo, _n, _reintento
+    _n = max(1, min(N_MAX, os.cpu_count() or 1))
+    _ejecutor, _tipo = _crear_ejecutor(_n, _precarga)
+    if _ejecutor is None:
+        _n = 1
+        _reintento = time.monotonic() + REINTENTO_S
+
+
+def iniciar(precargar=("matplotlib.figure",)):
+    """Crea el pool la primera vez que se llama (llamadas siguientes no hacen nada)."""
+    global _precarga
+    with _lock:
+        if _tipo is None:
+            _precarga = tuple(precargar)
+            _crear()
+
+
+@atexit.register
+def _cerrar():
+    if _ejecutor is not None:
+        _ejecutor.shutdown(wait=False, cancel_futures=True)
+
+
+def _recrear(roto):
+    # El pool `roto` rechazó un trabajo: se reemplaza una vez (si otro hilo ya lo hizo, se usa ese)
+    with _lock:
+        if _ejecutor is roto:
+            if roto is not None:
+                roto.shutdown(wait=False, cancel_futures=True)
+            _crear()
+        return _ejecutor
+
+
+@contextmanager
+def _contabilizar():
+    global _en_cola
+    t0 = time.perf_counter()
+    with _lock:
+        _en_cola += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _en_cola -= 1
+            _latencias.append(time.perf_counter() - t0)
+
+
+def _someter(fn, kwargs):
+    iniciar()
+    ejecutor = _ejecutor
+    if ejecutor is None and sys.platform != "emscripten" and time.monotonic() >= _reintento:
+        ejecutor = _recrear(None)  # en línea por un fallo anterior: se intenta de nuevo
+    for intento in range(2):
+        if ejecutor is None:
+            return None
+        try:
+            return ejecutor.submit(fn, **kwargs)
+        except RuntimeError:  # pool cerrado o roto (BrokenProcessPool), o no se pueden iniciar trabajadores
+            if intento == 0:
+                ejecutor = _recrear(ejecutor)
+    _a_linea(ejecutor)
+    return None
+
+
+def _a_linea(ejecutor):
+    # Tampoco el pool nuevo acepta trabajos: en línea hasta el próximo reintento
+    global _ejecutor, _tipo, _n, _reintento
+    with _lock:
+        if _ejecutor is ejecutor:
+            ejecutor.shutdown(wait=False, cancel_futures=True)
+            _ejecutor, _tipo, _n = None, "en línea", 1
+            _reintento = time.monotonic() + REINTENTO_S
+
+
+def _enviar(fn, kwargs, clave=None):
+    # Futuro del trabajo, o None si hay que ejecutarlo en línea. Cancela el trabajo anterior de la misma clave.
+    futuro = _someter(fn, kwargs)
+    if clave is not None:
+        with _lock:
+            anterior = _pendientes.pop(clave, None)
+            if futuro is not None:
+                _pendientes[clave] = futuro
+                futuro.add_done_callback(lambda f: _olvidar(clave, f))
+        if anterior is not None:
+            anterior.cancel()  # solo tiene efecto si aún no empezó
+    return futuro
+
+
+def _olvidar(clave, futuro):
+    with _lock:
+        if _pendientes.get(clave) is futuro:
+            del _pendientes[clave]
+
+
+async def ejecutar(fn, *, clave=None, **kwargs):
+    """Ejecuta ``fn(**kwargs)`` en el pool y devuelve su resultado (en línea si no hay pool).
+
+    Con ``clave``, el trabajo anterior de la misma clave se cancela si no ha empezado; quien lo esperaba recibe
+    `asyncio.CancelledError` (`concurrent.futures.CancelledError` en `ejecutar_bloqueante`).
+    """
+    with _contabilizar():
+        futuro = _enviar(fn, kwargs, clave)
+        return fn(**kwargs) if futuro is None else await asyncio.wrap_future(futuro)
+
+
+def ejecutar_bloqueante(fn, *, clave=None, **kwargs):
+    """Como `ejecutar`, pero espera el resultado bloqueando el hilo que llama (para hilos de fondo)."""
+    with _contabilizar():
+        futuro = _enviar(fn, kwargs, clave)
+        return fn(**kwargs) if futuro is None else futuro.result()
+
+
+def estado():
+    """Tipo de pool, trabajadores, trabajos en cola o en curso y percentiles de latencia (ms)."""
+    iniciar()
+    with _lock:
+        lat = np.array(_latencias) * 1000
+        en_cola = _en_cola
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if lat.size else (np.nan,) * 3
+    return {"tipo": _tipo, "trabajadores": _n, "en_cola": en_cola, "n": lat.size, "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
@@ -0,0 +1,80 @@
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+RECURSOS = Path(__file__).resolve().parent.parent / "recursos"
+
+# Multiplica todos los presupuestos de tiempo (p. ej. PRESUPUESTO_ESCALA=3 en una máquina lenta)
+ESCALA = float(os.environ.get("PRESUPUESTO_ESCALA", "1"))
+
+_definiciones = {}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "rendimiento: presupuestos de latencia y rendimiento (-m 'not rendimiento' para omitir)")
+
+
+def ejecutar_notebook(nombre):
+    """Ejecuta un notebook de recursos/ una sola vez por sesión y devuelve sus definiciones."""
+    if nombre not in _definiciones:
+        spec = importlib.util.spec_from_file_location(f"recursos_{nombre}", RECURSOS / f"{nombre}.py")
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        _, defs = modulo.app.run()
+        _definiciones[nombre] = defs
+    return _definiciones[nombre]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _sin_escrituras_en_recursos(tmp_path_factory):
+    # La caché en disco de 04_barrido va a un directorio de la sesión, y los notebooks y módulos de recursos/
+    # se importan sin escribir __pycache__ (tampoco los trabajadores del pool ni los intérpretes hijos)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("IIQ2013_CACHE_BARRIDO", str(tmp_path_factory.mktemp("cache_barrido")))
+        mp.setenv("PYTHONDONTWRITEBYTECODE", "1")
+        mp.setattr(sys, "dont_write_bytecode", True)
+        yield
+
+
+@pytest.fixture(scope="session")
+def notebook():
+    return ejecutar_notebook
+
+
+@pytest.fixture(scope="session")
+def recursos():
+    return RECURSOS
+
+
+@pytest.fixture(scope="session")
+def escala():
+    """Factor de PRESUPUESTO_ESCALA para los límites de tiempo que no pasan por `presupuesto`."""
+    return ESCALA
+
+
+def mejor_tiempo(fn, *args, repeticiones=5, **kwargs):
+    """Mínimo de varias ejecuciones (s), tras una de calentamiento."""
+    fn(*args, **kwargs)
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos)
+
+
+@pytest.fixture
+def presupuesto():
+    def verificar(fn, *args, ms, **kwargs):
+        t = mejor_tiempo(fn, *args, **kwargs)
+        limite = ms * ESCALA / 1000
+        assert t <= limite, f"{getattr(fn, '__name__', fn)}: {t * 1000:.2f} ms > presupuesto {limite * 1000:.2f} ms"
+        return t
+
+    return verificar
@@ -0,0 +1,18 @@
+"""Valores de referencia independientes de los notebooks."""
+
+from decimal import Decimal, localcontext
+
+
+def colebrook_decimal(Re, rr, digitos=40):
+    """Factor de Darcy de Colebrook-White con aritmética decimal de alta precisión."""
+    with localcontext() as ctx:
+        ctx.prec = digitos
+        Re, rr = Decimal(repr(float(Re))), Decimal(repr(float(rr)))
+        tol = Decimal(10) ** (5 - digitos)
+        x = Decimal(8)  # x = 1/sqrt(f)
+        for _ in range(500):
+            x_nuevo = -2 * (rr / Decimal("3.7") + Decimal("2.51") * x / Re).log10()
+            if abs(x_nuevo - x) < tol:
+                break
+            x = x_nuevo
+        return float(1 / (x_nuevo * x_nuevo))
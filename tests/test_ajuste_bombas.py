@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def _ajustar(d, registros):
+    _, columnas = d["agrupar"](registros["id"], registros["Q"], registros["H"], registros["eta"], registros["NPSHr"])
+    return d["ajustar_bombas"](*columnas)
+
+
+def test_recupera_coeficientes_sin_ruido(notebook):
+    d = notebook("09_ajuste_bombas")
+    registros, verdad = d["registros_sinteticos"](500, ruido=0.0, falta_npsh=0.0)
+    coef, residuos, _ = _ajustar(d, registros)
+    np.testing.assert_allclose(coef, verdad, rtol=1e-7)
+    assert np.nanmax(residuos["H"]) < 1e-9
+
+
+def test_datos_faltantes_y_pocos_puntos(notebook):
+    d = notebook("09_ajuste_bombas")
+    registros = {
+        "id": np.array([1, 1, 1, 1, 2, 2]),
+        "Q": np.array([0.0, 50.0, 100.0, 150.0, 10.0, 20.0]),
+        "H": np.array([60.0, 56.125, 48.5, 37.125, 50.0, 49.0]),
+        "eta": np.array([0.5, 0.7, 0.8, 0.7, 0.6, 0.65]),
+        "NPSHr": np.array([2.0, np.nan, 3.0, np.nan, 1.0, np.nan]),
+    }
+    coef, _, n_puntos = _ajustar(d, registros)
+    assert n_puntos["NPSHr"].tolist() == [2, 1]
+    np.testing.assert_allclose(coef[0, :3], [60.0, 0.04, 0.00075], rtol=1e-9)
+    assert np.isfinite(coef[0, 6:]).all()
+    # Bomba 2: dos puntos no bastan para las cuadráticas y uno no basta para NPSHr
+    assert np.isnan(coef[1]).all()
+
+
+def test_coeficientes_alimentan_curva_de_02_pumps(notebook):
+    d = notebook("09_ajuste_bombas")
+    curvas_bomba = notebook("02_pumps")["curvas_bomba"]
+    registros, _ = d["registros_sinteticos"](20)
+    coef, _, _ = _ajustar(d, registros)
+    Q = np.linspace(0.0, 200.0, 50)
+    H, eta, npsh = d["evaluar_bombas"](coef, Q)
+    for i in range(coef.shape[0]):
+        kw = dict(zip(d["nombres_coef"], coef[i]))
+        _, H_i, eta_i, N_i, _ = curvas_bomba(Q, 1.0, eta_m=0.95, rho=998.0, **kw)
+        np.testing.assert_allclose(H_i, H[i], rtol=1e-12)
+        np.testing.assert_allclose(eta_i, eta[i], rtol=1e-12)
+        np.testing.assert_allclose(N_i, npsh[i], rtol=1e-12)
+
+
+def test_bomba_degenerada_en_lote_sano(notebook):
+    d = notebook("09_ajuste_bombas")
+    registros, verdad = d["registros_sinteticos"](1000, ruido=0.0, falta_npsh=0.0)
+    extra = {
+        # Tres ensayos en el mismo caudal, todo en Q=0 y sin Q (ids tras los del lote sintético)
+        "id": np.repeat([5000, 5001, 5002], 3),
+        "Q": np.array([50.0, 50.0, 50.0, 0.0, 0.0, 0.0, np.nan, np.nan, np.nan]),
+        "H": np.full(9, 40.0),
+        "eta": np.full(9, 0.7),
+        "NPSHr": np.full(9, 2.0),
+    }
+    registros = {k: np.concatenate([registros[k], extra[k]]) for k in extra}
+    with np.errstate(all="raise"):
+        coef, residuos, _ = _ajustar(d, registros)
+    np.testing.assert_allclose(coef[:1000], verdad, rtol=1e-7)
+    assert np.isnan(coef[1000:]).all() and np.isnan(residuos["H"][1000:]).all()
@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+import pytest
+
+
+def test_exportar_npz_por_bloques(notebook, tmp_path):
+    d = notebook("04_barrido")
+    ejes = {"z2": np.arange(5, 15, 1.0), "v": np.array([0.5, 1.0, 2.0]), "D_mm": np.array([50.0, 100.0]), "hf": np.zeros(1)}
+    res = d["barrer"](d["modelo_bernoulli"], ejes, bloque=7, cache=False)
+    info = d["exportar_columnas"](res, tmp_path / "barrido", formato="npz", bloque=7)
+
+    esperado = d["a_columnas"](res)
+    with np.load(info["ruta"]) as z:
+        assert sorted(z.files) == sorted(esperado)
+        for k, a in esperado.items():
+            np.testing.assert_array_equal(z[k], a)
+
+
+def _modelo_escalado(k):
+    def modelo(x):
+        return {"y": k * x + 0.5}
+
+    return modelo
+
+
+def test_cache_distingue_constantes_capturas_y_dtype(notebook, tmp_path):
+    barrer = notebook("04_barrido")["barrer"]
+    ejes = {"x": np.arange(10.0)}
+    r1 = barrer(_modelo_escalado(2.0), ejes, bloque=4, cache=tmp_path)
+    assert r1["n_bloques_cache"] == 0 and len(list(tmp_path.glob("*.npz"))) == 3
+    assert barrer(_modelo_escalado(2.0), ejes, bloque=4, cache=tmp_path)["n_bloques_cache"] == 3
+    # Mismo código, otro valor capturado; y mismo modelo con otro dtype
+    r3 = barrer(_modelo_escalado(3.0), ejes, bloque=4, cache=tmp_path)
+    assert r3["n_bloques_cache"] == 0
+    np.testing.assert_array_equal(r3["salidas"]["y"], 3.0 * ejes["x"] + 0.5)
+    assert barrer(_modelo_escalado(2.0), ejes, bloque=4, cache=tmp_path, dtype=np.float64)["n_bloques_cache"] == 0
+
+    # Misma firma y nombres, otra constante
+    def modelo(x):
+        return {"y": 2.0 * x + 0.25}
+
+    modelo.__name__ = "modelo"
+    assert barrer(modelo, ejes, bloque=4, cache=tmp_path)["n_bloques_cache"] == 0
+
+
+def _modelo_con(fn):
+    def modelo(x):
+        return {"y": fn(x)}
+
+    return modelo
+
+
+def test_cache_por_valores_no_por_direcciones(notebook, tmp_path):
+    barrer = notebook("04_barrido")["barrer"]
+    ejes = {"x": np.arange(10.0)}
+    # Dos funciones capturadas iguales pero distintas en memoria dan la misma clave
+    barrer(_modelo_con(lambda x: 2.0 * x), ejes, bloque=4, cache=tmp_path)
+    assert barrer(_modelo_con(lambda x: 2.0 * x), ejes, bloque=4, cache=tmp_path)["n_bloques_cache"] == 3
+    assert barrer(_modelo_con(lambda x: 3.0 * x), ejes, bloque=4, cache=tmp_path)["n_bloques_cache"] == 0
+
+
+def test_cache_reutiliza_subgrillas_al_ampliar_ejes(notebook, tmp_path):
+    barrer = notebook("04_barrido")["barrer"]
+    modelo = _modelo_escalado(2.0)
+
+    def modelo2(a, b):
+        return {"y": a * 10 + b}
+
+    ejes = {"a": np.arange(5.0), "b": np.arange(4.0)}
+    r1 = barrer(modelo2, ejes, bloque=8, cache=tmp_path)
+    assert r1["n_bloques"] == 3
+    # Un valor más en el eje que se corta en tramos: solo el último tramo es nuevo
+    r2 = barrer(modelo2, {"a": np.arange(6.0), "b": np.arange(4.0)}, bloque=8, cache=tmp_path)
+    assert (r2["n_bloques"], r2["n_bloques_cache"]) == (3, 2)
+    np.testing.assert_array_equal(r2["salidas"]["y"], np.arange(6.0)[:, None] * 10 + np.arange(4.0))
+    # Un eje más largo en el mismo modelo de una variable también reutiliza los tramos completos
+    barrer(modelo, {"x": np.arange(10.0)}, bloque=4, cache=tmp_path)
+    assert barrer(modelo, {"x": np.arange(12.0)}, bloque=4, cache=tmp_path)["n_bloques_cache"] == 2
+
+
+def test_cache_no_lee_bloques_a_medias(notebook, tmp_path):
+    barrer = notebook("04_barrido")["barrer"]
+    ejes = {"x": np.arange(10.0)}
+    barrer(_modelo_escalado(2.0), ejes, bloque=4, cache=tmp_path)
+    assert not list(tmp_path.glob("*.tmp"))
+    dañado = sorted(tmp_path.glob("*.npz"))[0]
+    dañado.write_bytes(dañado.read_bytes()[:50])
+    r = barrer(_modelo_escalado(2.0), ejes, bloque=4, cache=tmp_path)
+    assert r["n_bloques_cache"] == 2
+    np.testing.assert_array_equal(r["salidas"]["y"], 2.0 * ejes["x"] + 0.5)
+
+
+def test_cache_se_poda_por_antiguedad(notebook, tmp_path):
+    d = notebook("04_barrido")
+    ejes = {"x": np.arange(1000.0)}
+    d["barrer"](_modelo_escalado(1.0), ejes, bloque=100, cache=tmp_path)
+    archivos = sorted(tmp_path.glob("*.npz"))
+    assert len(archivos) == 10
+    for t, a in enumerate(archivos):  # orden de uso explícito
+        os.utime(a, (1e9 + t, 1e9 + t))
+    d["podar_cache"](tmp_path, tope_mb=4 * archivos[0].stat().st_size / 2**20)
+    quedan = set(tmp_path.glob("*.npz"))
+    assert len(quedan) == 4 and quedan == set(archivos[-4:])
+
+
+def test_bloques_se_generan_una_vez(notebook, tmp_path, monkeypatch):
+    d = notebook("04_barrido")
+    ejes = {"z2": np.arange(5, 15, 1.0), "v": np.array([0.5, 1.0, 2.0]), "D_mm": np.array([50.0, 100.0]), "hf": np.zeros(1)}
+    res = d["barrer"](d["modelo_bernoulli"], ejes, bloque=7, cache=False)
+    generados = []
+    original = np.unravel_index
+    monkeypatch.setattr(np, "unravel_index", lambda *a, **k: generados.append(1) or original(*a, **k))
+    d["exportar_columnas"](res, tmp_path / "barrido", formato="npz", bloque=7)
+    assert len(generados) == -(-res["n_puntos"] // 7)
+
+
+@pytest.mark.parametrize("formato", ["parquet", "arrow"])
+def test_exportar_pyarrow(notebook, tmp_path, formato):
+    pa = pytest.importorskip("pyarrow")
+    d = notebook("04_barrido")
+    ejes = {"z2": np.arange(5, 15, 1.0), "v": np.array([0.5, 1.0, 2.0]), "D_mm": np.array([50.0, 100.0]), "hf": np.zeros(1)}
+    res = d["barrer"](d["modelo_bernoulli"], ejes, bloque=7, cache=False)
+    info = d["exportar_columnas"](res, tmp_path / "barrido", formato=formato, bloque=7)
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+
+        tabla = pq.read_table(info["ruta"])
+    else:
+        with pa.ipc.open_file(info["ruta"]) as f:
+            tabla = f.read_all()
+    esperado = d["a_columnas"](res)
+    assert tabla.num_rows == res["n_puntos"] and sorted(tabla.column_names) == sorted(esperado)
+    for k, a in esperado.items():
+        np.testing.assert_array_equal(tabla.column(k).to_numpy(), a)
@@ -0,0 +1,45 @@
+import base64
+import json
+import re
+
+import numpy as np
+
+
+def test_tablas_cubren_reticula_de_sliders(notebook):
+    d = notebook("bernoulli_bombeo")
+    t = d["tablas_estaticas"]
+    assert [t[k].size for k in ("z2", "v", "D_mm", "hf")] == [96, 80, 56, 61]
+    assert t["v"][0] == 0.1 and t["v"][-1] == 8.0 and t["hf"][-1] == 30.0
+
+
+def test_consulta_coincide_con_modelo(notebook):
+    d = notebook("bernoulli_bombeo")
+    t = d["tablas_estaticas"]
+    rng = np.random.default_rng(0)
+    i = [rng.integers(0, t[k].size, 10_000) for k in ("z2", "v", "D_mm", "hf")]
+    r = d["consultar"](t, *i)
+    m = notebook("04_barrido")["modelo_bernoulli"](t["z2"][i[0]], t["v"][i[1]], t["D_mm"][i[2]], t["hf"][i[3]])
+    for k in ("Hb", "Q_lps", "Pb_kW"):
+        np.testing.assert_allclose(r[k], m[k], rtol=1e-13)
+
+
+def test_pagina_contiene_tablas(notebook):
+    d = notebook("bernoulli_bombeo")
+    t = d["tablas_estaticas"]
+    html = d["pagina_estatica"](t)
+    meta = json.loads(re.search(r"const META = (\{.*?\});", html).group(1))
+    datos = np.frombuffer(base64.b64decode(re.search(r'atob\("([^"]+)"\)', html).group(1)), dtype="<f8")
+    for k, a in t.items():
+        m = meta[k]
+        np.testing.assert_array_equal(datos[m["inicio"]:m["inicio"] + m["n"]].reshape(m["forma"]), a)
+
+
+def test_indices_iniciales_desde_sliders(notebook):
+    d = notebook("bernoulli_bombeo")
+    t, ini = d["tablas_estaticas"], d["iniciales_estaticas"]
+    assert ini == {"z2": 25, "v": 19, "D_mm": 15, "hf": 10}
+    assert [t[k][ini[k]] for k in ("z2", "v", "D_mm", "hf")] == [d["z2"], d["v2"], d["D_mm"], d["hf"]]
+    html = d["pagina_estatica"](t, ini)
+    meta = json.loads(re.search(r"const META = (\{.*?\});", html).group(1))
+    assert {k: meta[k]["inicial"] for k in ini} == ini
+    assert "inicial" not in meta["hv2"]
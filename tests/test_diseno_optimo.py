@@ -0,0 +1,13 @@
+import numpy as np
+
+
+def test_fila_infactible_queda_en_nan(notebook):
+    d = notebook("05_diseno_optimo")
+    # 8 L/s es factible; 0.1 L/s queda bajo 0.5 m/s incluso en D = 20 mm
+    for D in (d["catalogo_mm"] / 1000, None):
+        sel, _ = d["diametro_optimo"]([65.0, 65.0], [0.008, 0.0001], [1500.0, 1500.0], d["costos_base"], D=D)
+        assert sel["factible"].tolist() == [True, False]
+        for nombre, a in sel.items():
+            if nombre != "factible":
+                assert np.isfinite(a[0]) and np.isnan(a[1]), nombre
+        assert 0.5 <= sel["v"][0] <= 3.0
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pytest
+
+from referencia import colebrook_decimal
+
+# Ejemplo resuelto de 01_iterative (aire a 35 °C, L1 = 150 m, Q1 = 0.35 m³/s, hf = 20 m)
+D_MIN = 0.26731932074307346
+Q2 = 0.23756533521458598
+CAIDA_PCT = 32.12418993868972
+
+
+def _ducto_referencia(Q1=0.35, L1=150.0, L2=300.0, h=20.0, nu=1.65e-5, eps=1.5e-6, g=9.81):
+    # Mismas ecuaciones que 01_iterative, iteradas hasta convergencia con Colebrook decimal
+    f = 0.02
+    for _ in range(50):
+        D = (8.0 * f * L1 * Q1 * Q1 / (g * math.pi**2 * h)) ** 0.2
+        f = colebrook_decimal(4.0 * Q1 / (math.pi * D * nu), eps / D)
+    f = 0.02
+    for _ in range(50):
+        Q = (math.pi * D * D / 4.0) * math.sqrt(2.0 * g * h * D / (f * L2))
+        f = colebrook_decimal(4.0 * Q / (math.pi * D * nu), eps / D)
+    return D, Q
+
+
+def test_iterative_valores_dorados(notebook):
+    d = notebook("01_iterative")
+    assert d["D_min"] == pytest.approx(D_MIN, rel=1e-12)
+    assert d["Q2_final"] == pytest.approx(Q2, rel=1e-12)
+    assert d["drop_pct"] == pytest.approx(CAIDA_PCT, rel=1e-12)
+
+
+def test_iterative_contra_referencia(notebook):
+    d = notebook("01_iterative")
+    D, Q = _ducto_referencia()
+    # Con 5 iteraciones por parte: D con 6 cifras, Q2 con 5
+    assert d["D_min"] == pytest.approx(D, rel=1e-6)
+    assert d["Q2_final"] == pytest.approx(Q, rel=1e-5)
+    assert d["res_a"]["iteracion"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_montecarlo_sin_dispersion_reproduce_iterative(notebook):
+    r = notebook("06_montecarlo")["ducto_lote"](np.array([1.5e-6]), np.array([1.65e-5]))
+    assert r["D_min_mm"][0] == pytest.approx(1000 * D_MIN, rel=1e-6)
+    assert r["caida_pct"][0] == pytest.approx(CAIDA_PCT, rel=1e-5)
+
+
+def test_barrido_ducto_en_punto_del_ejemplo(notebook):
+    r = notebook("04_barrido")["modelo_ducto"](np.array([0.35]), np.array([150.0]), np.array([20.0]))
+    assert r["D_min"][0] == pytest.approx(D_MIN, rel=1e-6)
+
+
+@pytest.mark.parametrize("rD", [0.6, 0.8, 1.2, 1.4])
+def test_bomba_leyes_de_afinidad(notebook, rD):
+    curvas_bomba = notebook("02_pumps")["curvas_bomba"]
+    Q_ref = np.linspace(0.0, 200.0, 41)
+    datos = dict(H0=62.0, a=0.06, b=0.00035, eta_max=0.82, Qbep_ref=180.0, k_eta=7.5e-6, eta_m=0.95,
+                 rho=998.0, npsh0=2.0, c_npsh=1.5e-4)
+    Q1, H1, eta1, N1, P1 = curvas_bomba(Q_ref, 1.0, **datos)
+    Q2_, H2, eta2, N2, P2 = curvas_bomba(Q_ref, rD, **datos)
+    np.testing.assert_allclose(Q2_, Q1 * rD, rtol=1e-14)
+    np.testing.assert_allclose(H2, H1 * rD**2, rtol=1e-14)
+    np.testing.assert_allclose(N2, N1 * rD**2, rtol=1e-14)
+    np.testing.assert_array_equal(eta2, eta1)
+    np.testing.assert_allclose(P2, P1 * rD**3, rtol=1e-12)
+
+
+def test_bomba_punto_de_diseno(notebook):
+    curvas_bomba = notebook("02_pumps")["curvas_bomba"]
+    Q, H, eta, _, P = curvas_bomba(np.array([180.0]), 1.0, 62.0, 0.06, 0.00035, 0.82, 180.0, 7.5e-6, 0.95,
+                                   998.0, 2.0, 1.5e-4)
+    assert H[0] == pytest.approx(62.0 - 0.06 * 180 - 0.00035 * 180**2)
+    assert eta[0] == pytest.approx(0.82)
+    assert P[0] == pytest.approx(998.0 * 9.81 * 0.05 * H[0] / (0.82 * 0.95) / 1000)
+
+
+def test_bernoulli_altura_y_potencia(notebook):
+    d = notebook("bernoulli_bombeo")
+    z2, v2, D_mm, hf = d["z2"], d["v2"], d["D_mm"], d["hf"]
+    Q = math.pi * (D_mm / 1000) ** 2 / 4 * v2
+    assert d["Hb"] == pytest.approx(z2 + v2**2 / (2 * 9.81) + hf, rel=1e-14)
+    assert d["Pb_kW"] == pytest.approx(1000.0 * 9.81 * Q * d["Hb"] / 1000, rel=1e-14)
+    # Valores por defecto de los sliders: z2 = 30 m, v = 2 m/s, D = 100 mm, hf = 5 m
+    assert d["Hb"] == pytest.approx(35.203873598369015, rel=1e-12)
+    assert d["Pb_kW"] == pytest.approx(5.424745114586176, rel=1e-12)
+
+
+def test_barrido_bernoulli_coincide_con_notebook(notebook):
+    d = notebook("bernoulli_bombeo")
+    r = notebook("04_barrido")["modelo_bernoulli"](d["z2"], d["v2"], d["D_mm"], d["hf"])
+    assert r["Hb"] == pytest.approx(d["Hb"], rel=1e-14)
+    assert r["Pb_kW"] == pytest.approx(d["Pb_kW"], rel=1e-14)
+    assert r["Q_lps"] == pytest.approx(d["Q_lps"], rel=1e-14)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def est(notebook):
+    return notebook("10_estaciones_bombeo")
+
+
+def test_inversa_y_combinaciones(est):
+    t = est["tipos"]
+    Q = np.linspace(0.0, 300.0, 31)[:, None]
+    np.testing.assert_allclose(est["Q_bomba"](t, est["H_bomba"](t, Q)), np.broadcast_to(Q, (31, 2)), atol=1e-9)
+
+    k = np.array([[3.0, 0.0], [1.0, 2.0]])
+    H = np.linspace(0.0, 70.0, 50)
+    Qi = est["Q_bomba"](t, H[:, None])
+    np.testing.assert_allclose(est["curva_paralelo"](t, k, H), (k @ Qi.T), rtol=1e-14)
+    assert (Qi[H > 62.0, 0] == 0).all()  # válvula de retención
+    Qs = np.linspace(0.0, 100.0, 11)
+    np.testing.assert_allclose(est["curva_serie"](t, k, Qs)[0], 3 * est["H_bomba"](t, Qs[:, None])[:, 0])
+
+
+def test_configuraciones(est):
+    k = est["configuraciones"]([3, 1])
+    assert k.shape == (7, 2) and not (k.sum(axis=1) == 0).any()
+
+
+def _raiz(f, a, b, n=60):
+    # Bisección escalar: f(a) y f(b) de distinto signo
+    fa = f(a)
+    for _ in range(n):
+        m = 0.5 * (a + b)
+        if (f(m) > 0) == (fa > 0):
+            a, fa = m, f(m)
+        else:
+            b = m
+    return 0.5 * (a + b)
+
+
+def _punto_escalar(t, kc, Q_d, modo):
+    # Caudal y altura de cada tipo encendido, resolviendo la curva combinada con escalares
+    tipos = [i for i in range(len(kc)) if kc[i] > 0]
+    H_i = lambda i, q: t["H0"][i] - t["a"][i] * q - t["b"][i] * q * q
+    if modo == "serie":
+        return {i: (Q_d, H_i(i, Q_d)) for i in tipos}, sum(kc[i] * H_i(i, Q_d) for i in tipos)
+
+    def q_i(i, H):  # inversa de la curva de un tipo, también por bisección (válvula de retención: Q >= 0)
+        return 0.0 if H >= t["H0"][i] else _raiz(lambda q: H_i(i, q) - H, 0.0, 1e4)
+
+    H_max = max(t["H0"][i] for i in tipos)
+    if sum(kc[i] * q_i(i, 0.0) for i in tipos) < Q_d:
+        return None, np.nan
+    H = _raiz(lambda h: sum(kc[i] * q_i(i, h) for i in tipos) - Q_d, 0.0, H_max)
+    return {i: (q_i(i, H), H) for i in tipos}, H
+
+
+@pytest.mark.parametrize("modo", ["paralelo", "serie"])
+def test_escalonamiento_contra_fuerza_bruta(est, modo):
+    t, H_est, K, rho, g, eta_m = est["tipos"], 25.0, 0.00015, 998.0, 9.81, 0.95
+    Q_d = np.linspace(5.0, 400.0, 23)
+    e = est["escalonar"](t, [3, 1], Q_d, H_est, K, modo=modo, eta_m=eta_m, rho=rho, g=g)
+    for j, q in enumerate(Q_d):
+        Hs = H_est + K * q * q
+        P = {}
+        for c, kc in enumerate(e["k"]):
+            puntos, H = _punto_escalar(t, kc, q, modo)
+            if puntos is None or H < Hs or any(qi <= 0 or hi <= 0 for qi, hi in puntos.values()):
+                continue
+            P[c] = sum(
+                kc[i] * rho * g * (qi / 3600) * hi / (np.clip(t["eta_max"][i] - t["k_eta"][i] * (qi - t["Qbep"][i]) ** 2, 0.05, 0.9) * eta_m) / 1000
+                for i, (qi, hi) in puntos.items()
+            )
+        if not P:
+            assert e["mejor"][j] == -1
+            continue
+        c_min = min(P, key=P.get)
+        assert e["P_min"][j] == pytest.approx(P[c_min], rel=1e-7)
+        # Mismo escalonamiento (salvo empate de potencia dentro de la tolerancia)
+        assert e["mejor"][j] == c_min or P.get(e["mejor"][j], np.inf) == pytest.approx(P[c_min], rel=1e-7)
+    assert (e["mejor"] >= 0).sum() > Q_d.size // 2
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from referencia import colebrook_decimal
+
+RE = np.geomspace(4e3, 1e8, 25)
+RR = [0.0, 1e-6, 1e-4, 1e-3, 1e-2, 0.05]
+
+
+@pytest.fixture(scope="module")
+def f_ref():
+    return {rr: np.array([colebrook_decimal(re, rr) for re in RE]) for rr in RR}
+
+
+def test_referencia_decimal_cumple_colebrook():
+    f = colebrook_decimal(1e5, 1e-4)
+    residuo = 1 / np.sqrt(f) + 2 * np.log10(1e-4 / 3.7 + 2.51 / (1e5 * np.sqrt(f)))
+    assert abs(residuo) < 1e-12
+
+
+@pytest.mark.parametrize("rr", RR)
+def test_moody_f_darcy_colebrook(notebook, f_ref, rr):
+    f = notebook("00_moody")["f_darcy_colebrook"](RE, rr)
+    np.testing.assert_allclose(f, f_ref[rr], rtol=1e-12)
+
+
+@pytest.mark.parametrize("rr", RR)
+def test_moody_f_fanning(notebook, f_ref, rr):
+    f_fanning = notebook("00_moody")["f_fanning"]
+    np.testing.assert_allclose(f_fanning(RE, rr), f_ref[rr] / 4, rtol=1e-12)
+    Re_lam = np.array([100.0, 1000.0, 2299.0])
+    np.testing.assert_allclose(f_fanning(Re_lam, rr), 16 / Re_lam, rtol=1e-15)
+
+
+@pytest.mark.parametrize("rr", RR)
+def test_iterative_colebrook_f(notebook, f_ref, rr):
+    colebrook_f = notebook("01_iterative")["colebrook_f"]
+    f = np.array([colebrook_f(re, rr) for re in RE])
+    # Punto fijo desde f0 = 0.02 con n = 30: la convergencia más lenta es en tubo liso a Re bajo (~1e-7)
+    np.testing.assert_allclose(f, f_ref[rr], rtol=1e-6)
+
+
+@pytest.mark.parametrize("rr", RR)
+def test_diseno_f_darcy_colebrook(notebook, f_ref, rr):
+    # 6 iteraciones desde Swamee-Jain: precisión de ingeniería, no de máquina
+    f = notebook("05_diseno_optimo")["f_darcy_colebrook"](RE, np.full_like(RE, rr))
+    np.testing.assert_allclose(f, f_ref[rr], rtol=1e-6)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+
+def test_joukowsky_cierre_instantaneo_sin_friccion(notebook):
+    golpe_ariete = notebook("08_golpe_ariete")["golpe_ariete"]
+    r = golpe_ariete(30.0, 0.1, 2.0, 1000.0, 1000.0, escenario="valvula", T=1e-9, n_tramos=100, f=0.0)
+    # Con Courant = 1 y sin fricción el método de las características es exacto
+    assert r["H_max"][-1] - r["H_ini"][-1] == pytest.approx(r["joukowsky"], rel=1e-12)
+
+
+def test_permanente_coincide_con_bernoulli(notebook):
+    p = notebook("08_golpe_ariete")["permanente"](30.0, 0.1, 2.0, 1000.0)
+    assert p["Hb"] == pytest.approx(30.0 + p["hv"] + p["hf"])
+    assert p["hv"] == pytest.approx(notebook("bernoulli_bombeo")["hv2"])
+
+
+@pytest.mark.parametrize("escenario", ["bomba", "valvula"])
+def test_envolvente_contiene_permanente(notebook, escenario):
+    r = notebook("08_golpe_ariete")["golpe_ariete"](30.0, 0.1, 2.0, 1000.0, 400.0, escenario=escenario, n_tramos=200)
+    assert (r["H_max"] >= r["H_ini"]).all() and (r["H_min"] <= r["H_ini"]).all()
+    assert r["H_sondas"].shape == (r["n_pasos"] + 1, 3)
+    # Sin transitorio no hay envolvente
+    quieto = notebook("08_golpe_ariete")["golpe_ariete"](30.0, 0.1, 2.0, 1000.0, 400.0, escenario=escenario, T=1e12, n_tramos=50)
+    assert quieto["H_max"] - quieto["H_min"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_curva_de_bomba_plana(notebook):
+    golpe_ariete = notebook("08_golpe_ariete")["golpe_ariete"]
+    plana = golpe_ariete(30.0, 0.1, 2.0, 1000.0, 400.0, n_tramos=50, H0_rel=1.0)
+    casi = golpe_ariete(30.0, 0.1, 2.0, 1000.0, 400.0, n_tramos=50, H0_rel=1.0 + 1e-9)
+    assert np.isfinite(plana["H_sondas"]).all() and np.isfinite(plana["Q_sondas"]).all()
+    np.testing.assert_allclose(plana["H_sondas"], casi["H_sondas"], rtol=1e-6)
+    with pytest.raises(ValueError, match="H0_rel"):
+        golpe_ariete(30.0, 0.1, 2.0, 1000.0, 400.0, n_tramos=50, H0_rel=0.9)
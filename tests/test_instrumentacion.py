@@ -0,0 +1,19 @@
+import importlib
+import json
+
+
+def test_perfil_y_trabajo_fuera_de_contadores(monkeypatch, recursos):
+    monkeypatch.syspath_prepend(str(recursos))
+    perfil = importlib.import_module("instrumentacion").Perfil()
+    with perfil.medir("calculo", celda="a"):
+        perfil.contar("puntos", 10)
+    perfil.anotar("render", 0.002, figura="x")
+    with perfil.sin_contar():
+        with perfil.medir("verificacion"):
+            perfil.contar("puntos", 1000)
+    perfil.contar("puntos", 5)
+    assert perfil.contadores == {"puntos": 15, "n_calculo": 1, "n_render": 1}
+    assert [t["nombre"] for t in perfil.tramos] == ["calculo", "render"]
+    eventos = json.loads(perfil.a_chrome())["traceEvents"]
+    assert [e["ph"] for e in eventos].count("X") == 2 and eventos[1]["dur"] == 2000.0
+    assert json.loads(perfil.a_json())["contadores"] == perfil.contadores
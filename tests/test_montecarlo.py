@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+
+def test_histograma_se_amplia_sin_recortar(notebook):
+    d = notebook("06_montecarlo")
+    h = d["histograma_nuevo"](0.0, 1.0, n_bins=8)
+    d["acumular"](h, np.array([0.05, 0.55, 0.95]))
+    d["acumular"](h, np.array([3.7, -2.2]))
+    assert h["lo"] <= -2.2 and h["hi"] > 3.7 and h["cuentas"].sum() == 5
+    bordes = np.linspace(h["lo"], h["hi"], 9)
+    np.testing.assert_array_equal(h["cuentas"], np.histogram([0.05, 0.55, 0.95, 3.7, -2.2], bordes)[0])
+
+
+def test_resultado_no_depende_del_bloque(notebook):
+    d = notebook("06_montecarlo")
+    cv = {"eps": 1.0, "nu": 0.1, "curva": 0.1, "eta": 0.1}
+    a = d["monte_carlo"](30_000, 7, cv, bloque=30_000)
+    b = d["monte_carlo"](30_000, 7, cv, bloque=1_111)
+    for nombre, ha in a["hist"].items():
+        hb = b["hist"][nombre]
+        assert (ha["lo"], ha["hi"]) == (hb["lo"], hb["hi"])
+        np.testing.assert_array_equal(ha["cuentas"], hb["cuentas"])
+        assert ha["cuentas"].sum() == 30_000
+
+
+def test_muestras_no_finitas_se_cuentan_aparte(notebook):
+    d = notebook("06_montecarlo")
+    h = d["histograma_nuevo"](0.0, 1.0, n_bins=8)
+    d["acumular"](h, np.array([0.2, np.inf, np.nan, 0.7, -np.inf]))
+    d["acumular"](h, np.array([np.nan]))
+    assert (h["lo"], h["hi"]) == (0.0, 1.0)
+    assert h["n"] == h["cuentas"].sum() == 2 and h["no_finitos"] == 4
+    assert h["cuentas"][1] == h["cuentas"][5] == 1
+    assert d["resumen"](h)["media"] == pytest.approx(0.45)
+    vacio = d["histograma_nuevo"](0.0, 1.0, n_bins=8)
+    d["acumular"](vacio, np.array([np.inf]))
+    assert vacio["no_finitos"] == 1 and np.isnan(d["cuantiles"](vacio, [0.5])).all()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from referencia import colebrook_decimal
+from tiempo_interactivo import medir_arranque
+
+
+def test_friccion_escalar(notebook):
+    f_fanning = notebook("00_moody_wasm")["f_fanning"]
+    for Re in (2300.0, 4e3, 1e5, 1e8):
+        for rr in (1e-6, 1e-3, 5e-2):
+            assert f_fanning(Re, rr) == pytest.approx(colebrook_decimal(Re, rr) / 4, rel=1e-14)
+    assert f_fanning(1000.0, 1e-3) == 0.016
+
+
+def test_asset_publicado_esta_al_dia(notebook, recursos):
+    d = notebook("00_moody_wasm")
+    datos = (recursos / "public" / d["nombre_asset"]).read_bytes()
+    assert len(datos) < 4096
+    assert datos == d["empaquetar_curvas"](d["calcular_curvas"]())
+    assert d["origen_curvas"].startswith("asset")
+    with pytest.raises(ValueError):
+        d["desempaquetar_curvas"](b"PNG" + datos)
+
+
+def test_curvas_iguales_a_00_moody(notebook):
+    d = notebook("00_moody_wasm")
+    m = notebook("00_moody")
+    px_y = (d["geom"]["y1"] - d["geom"]["y0"]) / 0.03
+    for (rr, puntos), (Re, f) in zip(d["curvas"].items(), m["curvas"]):
+        x, y = np.array(puntos).T
+        # Mismo muestreo adaptativo: mismos puntos, valores en float32 (muy por debajo de un píxel)
+        np.testing.assert_allclose(10.0**x, Re, rtol=1e-6)
+        assert np.abs(y - f).max() * px_y < 1e-3
+
+
+def test_svg_del_diagrama(notebook):
+    d = notebook("00_moody_wasm")
+    svg = d["grafico"].text
+    assert svg.count("<polyline") == len(d["curvas"]) + 1
+    assert f"f = {d['f0']:.4f}" in svg
+
+
+def test_arranque_sin_numpy_ni_matplotlib():
+    m = medir_arranque("00_moody_wasm", repeticiones=1)
+    if not m["sonda"]:
+        # Sin la sonda, app.run() importa matplotlib por su cuenta y la lista de paquetes no dice nada del notebook
+        pytest.skip("versión de marimo sin verificar para la sonda de matplotlib (MARIMO_VERIFICADO en tiempo_interactivo.py)")
+    assert m["paquetes"] == []
@@ -0,0 +1,85 @@
+import importlib
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("nombre", ["00_moody", "02_pumps"])
+def test_error_de_cuerda_dentro_de_tolerancia(notebook, nombre):
+    muestreo = notebook(nombre)["muestreo_adaptativo"]
+    fn = lambda x: np.stack([np.tanh(20 * (x - 0.3)), 0.1 * x**2])
+    x, y, st = muestreo(fn, 0.0, 1.0, [1e-3, 1e-4], niveles=10)
+    x_ref = np.linspace(0.0, 1.0, 100_001)
+    y_ref = fn(x_ref)
+    assert np.abs(np.interp(x_ref, x, y[0]) - y_ref[0]).max() < 2e-3
+    assert np.abs(np.interp(x_ref, x, y[1]) - y_ref[1]).max() < 2e-4
+    assert np.all(np.diff(x) > 0) and x[0] == 0.0 and x[-1] == pytest.approx(1.0)
+    # Los puntos se concentran en el escalón de tanh
+    assert np.mean(np.abs(x - 0.3) < 0.15) > 0.5
+    assert st["puntos"] == x.size < 17 * 2**10 // 10
+
+
+def test_cache_reutiliza_puntos(notebook):
+    muestreo = notebook("00_moody")["muestreo_adaptativo"]
+    llamadas = []
+
+    def fn(x):
+        llamadas.append(x.size)
+        return np.exp(-((x - 0.5) ** 2) / 0.01)
+
+    cache = {}
+    x1, y1, st1 = muestreo(fn, 0.0, 1.0, 1e-4, cache=cache)
+    x2, y2, st2 = muestreo(fn, 0.0, 1.0, 1e-4, cache=cache)
+    assert st1["evaluaciones"] == sum(llamadas) and st1["reutilizados"] == 0
+    assert st2["evaluaciones"] == 0 and st2["reutilizados"] == st1["evaluaciones"]
+    np.testing.assert_array_equal(x1, x2)
+    np.testing.assert_array_equal(y1, y2)
+    # Una tolerancia más fina solo evalúa los puntos que faltan
+    _, _, st3 = muestreo(fn, 0.0, 1.0, 1e-6, cache=cache)
+    assert 0 < st3["evaluaciones"] < st3["evaluaciones"] + st3["reutilizados"]
+
+
+def test_cache_lru_compartida(notebook, monkeypatch, recursos):
+    notebook("00_moody")
+    notebook("02_pumps")
+    monkeypatch.syspath_prepend(str(recursos))
+    muestreo = importlib.import_module("muestreo")
+    # Ambos notebooks guardan sus curvas en la misma caché del módulo
+    assert {c[0] for c in muestreo._curvas} == {"00_moody", "02_pumps"}
+    monkeypatch.setattr(muestreo, "_curvas", type(muestreo._curvas)())
+    monkeypatch.setattr(muestreo, "N_CURVAS", 3)
+    a = muestreo.cache_curva("a")
+    a["x"] = 1
+    for k in "bc":
+        muestreo.cache_curva(k)
+    assert muestreo.cache_curva("a") is a  # usada recién: pasa al final
+    muestreo.cache_curva("d")
+    assert list(muestreo._curvas) == ["c", "a", "d"]
+
+
+def test_curvas_de_moody(notebook):
+    d = notebook("00_moody")
+    g = d["geom"]
+    px_y = (g["y1"] - g["y0"]) / (g["ly"][1] - g["ly"][0])
+    px_x = (g["x1"] - g["x0"]) / (g["lx"][1] - g["lx"][0])
+    x_ref = np.linspace(3.0, 8.0, 20_001)
+    lejos = np.abs(x_ref - np.log10(2300)) > 2 / px_x
+    for rr, (Re, f) in zip(d["rr_lines"], d["curvas"]):
+        assert Re.size < 100
+        f_ref = d["f_fanning"](10.0**x_ref, rr)
+        assert np.abs(np.interp(x_ref, np.log10(Re), f) - f_ref)[lejos].max() * px_y <= d["tol_px"] * 1.01
+        # El salto laminar-turbulento queda en menos de medio píxel
+        i = np.searchsorted(Re, 2300.0)
+        assert (np.log10(Re[i]) - np.log10(Re[i - 1])) * px_x < 0.5
+
+
+def test_curva_de_bomba_termina_en_h_cero(notebook):
+    d = notebook("02_pumps")
+    caudal_corte = d["caudal_corte"]
+    Qc = caudal_corte(62.0, 0.06, 0.00035, 500.0)
+    assert 62.0 - 0.06 * Qc - 0.00035 * Qc**2 == pytest.approx(0.0, abs=1e-10)
+    assert caudal_corte(62.0, 0.06, 0.00035, 300.0) == 300.0
+    assert caudal_corte(62.0, 0.0, 0.0, 300.0) == 300.0
+    assert caudal_corte(-1.0, 0.06, 0.00035, 300.0) == 0.0
+    # Con los valores por defecto: menos puntos que la grilla fija de 240
+    assert d["Q"].size < 240 and d["Q_ref"][-1] == pytest.approx(d["Q_corte"])
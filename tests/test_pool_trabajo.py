@@ -0,0 +1,76 @@
+import asyncio
+import importlib
+import sys
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.fixture
+def pool_trabajo(monkeypatch, recursos):
+    monkeypatch.syspath_prepend(str(recursos))
+    modulo = importlib.import_module("pool_trabajo")
+    estado = {"_ejecutor": None, "_tipo": None, "_n": 1, "_en_cola": 0, "_reintento": 0.0, "_pendientes": {}}
+    for nombre, valor in estado.items():
+        monkeypatch.setattr(modulo, nombre, valor)
+    yield modulo
+    if modulo._ejecutor is not None:
+        modulo._ejecutor.shutdown(wait=True, cancel_futures=True)
+
+
+class SinHilos:
+    def submit(self, fn, **kwargs):
+        raise RuntimeError("can't start new thread")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_en_linea_en_pyodide(pool_trabajo, monkeypatch):
+    monkeypatch.setattr(sys, "platform", "emscripten")
+    assert asyncio.run(pool_trabajo.ejecutar(dict, a=7)) == {"a": 7}
+    e = pool_trabajo.estado()
+    assert e["tipo"] == "en línea" and e["trabajadores"] == 1 and e["n"] >= 1 and e["en_cola"] == 0
+
+
+def test_en_linea_si_no_se_pueden_iniciar_trabajadores(pool_trabajo, monkeypatch):
+    creados = []
+    monkeypatch.setattr(pool_trabajo, "_crear_ejecutor", lambda n, p: creados.append(1) or (SinHilos(), "hilos"))
+    monkeypatch.setattr(pool_trabajo, "_ejecutor", SinHilos())
+    monkeypatch.setattr(pool_trabajo, "_tipo", "hilos")
+    assert asyncio.run(pool_trabajo.ejecutar(dict, a=1)) == {"a": 1}
+    assert pool_trabajo.estado()["tipo"] == "en línea" and len(creados) == 1
+    # Mientras no venza el reintento no se vuelve a crear el pool
+    assert pool_trabajo.ejecutar_bloqueante(dict, a=2) == {"a": 2} and len(creados) == 1
+
+
+def test_pool_roto_se_recrea(pool_trabajo, monkeypatch):
+    monkeypatch.setattr(pool_trabajo, "_crear_ejecutor", lambda n, p: (ThreadPoolExecutor(1), "hilos"))
+    monkeypatch.setattr(pool_trabajo, "_ejecutor", SinHilos())
+    monkeypatch.setattr(pool_trabajo, "_tipo", "hilos")
+    assert pool_trabajo.ejecutar_bloqueante(dict, a=3) == {"a": 3}
+    assert pool_trabajo.estado()["tipo"] == "hilos" and isinstance(pool_trabajo._ejecutor, ThreadPoolExecutor)
+
+
+def test_clave_cancela_trabajo_superado(pool_trabajo, monkeypatch):
+    monkeypatch.setattr(pool_trabajo, "_crear_ejecutor", lambda n, p: (ThreadPoolExecutor(1), "hilos"))
+    liberar = threading.Event()
+    ocupado = pool_trabajo._enviar(liberar.wait, {"timeout": 10})
+    viejo = pool_trabajo._enviar(dict, {"v": 1}, clave=("sesion", "figura"))
+    nuevo = pool_trabajo._enviar(dict, {"v": 2}, clave=("sesion", "figura"))
+    otro = pool_trabajo._enviar(dict, {"v": 3}, clave=("sesion", "otra"))
+    liberar.set()
+    assert ocupado.result() is True and nuevo.result() == {"v": 2} and otro.result() == {"v": 3}
+    with pytest.raises(CancelledError):
+        viejo.result()
+
+
+def test_pool_de_procesos(pool_trabajo):
+    pool_trabajo.iniciar(precargar=())
+    if pool_trabajo.estado()["tipo"] != "procesos":
+        pytest.skip("el entorno no permite crear procesos")
+    assert asyncio.run(pool_trabajo.ejecutar(dict, a=7)) == {"a": 7}
+    assert pool_trabajo.ejecutar_bloqueante(dict, b=2) == {"b": 2}
+    e = pool_trabajo.estado()
+    assert e["trabajadores"] >= 1 and e["n"] >= 1 and e["en_cola"] == 0 and e["p50_ms"] > 0
@@ -0,0 +1,12 @@
+import numpy as np
+
+
+def test_temperaturas_no_finitas_dan_nan(notebook):
+    d = notebook("07_propiedades")
+    T = np.array([20.0, np.nan, np.inf, -np.inf, 80.0])
+    r = d["propiedades"]("agua", T)
+    for a in r.values():
+        assert np.isfinite(a[[0, 4]]).all() and np.isnan(a[1:4]).all()
+    np.testing.assert_allclose(r["rho"][[0, 4]], d["propiedades"]("agua", np.array([20.0, 80.0]))["rho"], rtol=0)
+    assert np.isnan(d["rho_T"]("aire", np.nan)) and np.isfinite(d["rho_T"]("aire", 25.0))
+
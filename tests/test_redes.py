@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from referencia import colebrook_decimal
+
+
+@pytest.fixture(scope="module")
+def ejemplo(notebook):
+    d = notebook("03_redes")
+    red = d["red_ejemplo"]
+    sol = d["resolver_red"](red)
+    # Pérdidas con f evaluado en los caudales finales
+    Q, D, L = sol["Q"], red["D"], red["L"]
+    Re = 4.0 * np.abs(Q) / (np.pi * D * 1.0e-6)
+    f, _ = d["f_darcy"](Re, red["eps"] / D)
+    h = 8.0 * f * L / (9.81 * np.pi**2 * D**5) * Q * np.abs(Q)
+    return red, sol, Re, f, h
+
+
+def test_newton_converge_cuadraticamente(ejemplo):
+    _, sol, _, _, _ = ejemplo
+    e = np.array(sol["historial"])
+    assert sol["convergio"] and sol["iteraciones"] == e.size == 5
+    assert e[-1] < 1e-8
+    # Cada paso al menos eleva al cuadrado el error (salvo la constante) desde la segunda iteración
+    assert np.all(e[2:] <= 20 * e[1:-1] ** 2)
+
+
+def test_continuidad_en_nodos(ejemplo):
+    red, sol, _, _, _ = ejemplo
+    Q, n = sol["Q"], red["demanda"].size
+    neto = np.bincount(red["hasta"], Q, n) - np.bincount(red["desde"], Q, n)
+    np.testing.assert_allclose(neto[1:], red["demanda"][1:], rtol=0, atol=1e-12)
+    assert -neto[0] == pytest.approx(red["demanda"].sum(), abs=1e-12)
+
+
+def test_energia_en_tuberias_y_mallas(ejemplo):
+    red, sol, _, _, h = ejemplo
+    H = sol["H"]
+    assert H[0] == 210.0 and np.all(np.isfinite(H))
+    np.testing.assert_allclose(h, H[red["desde"]] - H[red["hasta"]], rtol=0, atol=1e-8)
+    # Mallas 1-2-5-4 y 2-3-6-5 (tuberías numeradas desde 1, signo según el sentido desde→hasta)
+    for malla in ([2, 5, -7, -4], [3, 6, -8, -5]):
+        residuo = sum(np.sign(p) * h[abs(p) - 1] for p in malla)
+        assert abs(residuo) < 1e-8
+
+
+def test_friccion_coincide_con_colebrook(ejemplo):
+    red, _, Re, f, _ = ejemplo
+    ref = [colebrook_decimal(r, red["eps"] / D) for r, D in zip(Re, red["D"])]
+    np.testing.assert_allclose(f, ref, rtol=1e-4)
+
+
+def test_red_sin_nodo_de_carga_fija(notebook):
+    d = notebook("03_redes")
+    red = dict(d["red_ejemplo"], H_fijo=np.full(7, np.nan))
+    with pytest.raises(ValueError, match="carga fija"):
+        d["resolver_red"](red)
@@ -0,0 +1,122 @@
+"""Presupuestos de latencia (mejor de 5, ms) con margen de ~3x sobre la medición de referencia.
+
+En máquinas más lentas se pueden escalar con PRESUPUESTO_ESCALA.
+"""
+
+import numpy as np
+import pytest
+
+from tiempo_interactivo import medir_arranque
+
+pytestmark = pytest.mark.rendimiento
+
+RNG = np.random.default_rng(0)
+
+
+def test_f_darcy_colebrook(notebook, presupuesto):
+    Re = np.geomspace(4e3, 1e8, 100_000)
+    presupuesto(notebook("00_moody")["f_darcy_colebrook"], Re, 1e-4, ms=100)
+
+
+def test_f_fanning(notebook, presupuesto):
+    Re = np.geomspace(1e3, 1e8, 100_000)
+    presupuesto(notebook("00_moody")["f_fanning"], Re, 1e-4, ms=100)
+
+
+def test_muestreo_adaptativo_moody(notebook, presupuesto):
+    d = notebook("00_moody")
+    muestreo, f_fanning = d["muestreo_adaptativo"], d["f_fanning"]
+    # Las 6 curvas del fondo sin caché (peor caso: primer dibujo)
+    presupuesto(lambda: [muestreo(lambda x: f_fanning(10.0**x, rr), 3.0, 8.0, 1.3e-5) for rr in d["rr_lines"]], ms=60)
+
+
+def test_colebrook_f_escalar(notebook, presupuesto):
+    colebrook_f = notebook("01_iterative")["colebrook_f"]
+    Re = np.geomspace(4e3, 1e8, 1000).tolist()
+    presupuesto(lambda: [colebrook_f(r, 1e-4) for r in Re], ms=60)
+
+
+def test_curvas_bomba(notebook, presupuesto):
+    Q = np.linspace(0.0, 300.0, 1_000_000)
+    presupuesto(
+        notebook("02_pumps")["curvas_bomba"], Q, 1.1, 62.0, 0.06, 0.00035, 0.82, 180.0, 7.5e-6, 0.95, 998.0, 2.0, 1.5e-4,
+        ms=150,
+    )
+
+
+def test_modelo_bernoulli(notebook, presupuesto):
+    n = 1_000_000
+    args = (RNG.uniform(5, 100, n), RNG.uniform(0.1, 8, n), RNG.uniform(25, 300, n), RNG.uniform(0, 30, n))
+    presupuesto(notebook("04_barrido")["modelo_bernoulli"], *args, ms=80)
+
+
+def test_modelo_ducto(notebook, presupuesto):
+    n = 100_000
+    args = (RNG.uniform(0.05, 1.0, n), RNG.uniform(50, 500, n), RNG.uniform(10, 40, n))
+    presupuesto(notebook("04_barrido")["modelo_ducto"], *args, ms=150)
+
+
+def test_diametro_optimo_lote(notebook, presupuesto):
+    d = notebook("05_diseno_optimo")
+    n = 20_000
+    args = (RNG.uniform(10, 120, n), RNG.uniform(0.002, 0.08, n), RNG.uniform(200, 8000, n), d["costos_base"])
+    presupuesto(d["diametro_optimo"], *args, D=d["catalogo_mm"] / 1000, ms=150)
+
+
+def test_monte_carlo(notebook, presupuesto):
+    cv = {"eps": 0.5, "nu": 0.03, "curva": 0.03, "eta": 0.02}
+    presupuesto(notebook("06_montecarlo")["monte_carlo"], 100_000, 1, cv, ms=300)
+
+
+def test_propiedades(notebook, presupuesto):
+    T = RNG.uniform(0, 100, 1_000_000)
+    presupuesto(notebook("07_propiedades")["propiedades"], "agua", T, ms=120)
+
+
+def test_resolver_red(notebook, presupuesto):
+    d = notebook("03_redes")
+    presupuesto(d["resolver_red"], d["red_malla"](40), ms=300)
+
+
+def test_golpe_ariete(notebook, presupuesto):
+    # 10³ tramos × 10⁴ pasos
+    golpe_ariete = notebook("08_golpe_ariete")["golpe_ariete"]
+    presupuesto(golpe_ariete, 30.0, 0.1, 2.0, 1000.0, 1000.0, n_tramos=1000, t_fin=10.0, repeticiones=2, ms=600)
+
+
+def test_ajuste_bombas_lote(notebook, presupuesto):
+    d = notebook("09_ajuste_bombas")
+    registros, _ = d["registros_sinteticos"](10_000)
+    _, columnas = d["agrupar"](registros["id"], registros["Q"], registros["H"], registros["eta"], registros["NPSHr"])
+    presupuesto(d["ajustar_bombas"], *columnas, ms=300)
+
+
+def test_escalonamiento_estacion(notebook, presupuesto):
+    d = notebook("10_estaciones_bombeo")
+    Q_d = np.linspace(1.0, 1200.0, 2000)
+    presupuesto(d["escalonar"], d["tipos"], [6, 2], Q_d, 25.0, 0.00015, ms=80)
+
+
+def test_friccion_con_derivadas(notebook, presupuesto):
+    # Valor y dos derivadas: debe costar menos que f_darcy_colebrook (solo valor, 35 iteraciones)
+    Re = np.geomspace(4e3, 1e8, 100_000)
+    presupuesto(notebook("11_sensibilidades")["friccion_derivadas"], Re, 1e-4, ms=25)
+
+
+def test_diametro_con_derivadas(notebook, presupuesto):
+    Q = np.linspace(0.05, 1.0, 100_000)
+    presupuesto(notebook("11_sensibilidades")["diametro_derivadas"], Q, 150.0, 20.0, ms=170)
+
+
+def test_analiticas_mas_rapidas_que_diferencias(notebook):
+    # Con 3 o más parámetros las diferencias centradas cuestan 7+ soluciones contra una
+    for fila in notebook("11_sensibilidades")["comparar_diferencias"](20_000):
+        if fila["n_param"] >= 3:
+            assert fila["t_fd"] > 2 * fila["t_an"], fila["modelo"]
+
+
+def test_tiempo_interactivo_moody_wasm(escala):
+    # Intérprete nuevo: desde terminar de importar marimo hasta el primer cuadro del notebook liviano
+    m = medir_arranque("00_moody_wasm", repeticiones=2)
+    assert m["tti_s"] - m["marimo_s"] < 1.0 * escala
+    assert m["importaciones_s"] < 0.5 * escala
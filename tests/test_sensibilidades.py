@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from referencia import colebrook_decimal
+
+D_MIN = 0.26731932074307346
+
+
+def _centrada(fn, x, p, salida, rel=1e-6):
+    dx = rel * x[p]
+    return (fn(**dict(x, **{p: x[p] + dx}))[salida] - fn(**dict(x, **{p: x[p] - dx}))[salida]) / (2 * dx)
+
+
+def test_colebrook_newton_precision_de_maquina(notebook):
+    fr = notebook("11_sensibilidades")["friccion_derivadas"]
+    Re = np.geomspace(4e3, 1e8, 12)
+    for rr in (1e-6, 1e-4, 1e-2, 5e-2):
+        ref = np.array([colebrook_decimal(r, rr) for r in Re])
+        np.testing.assert_allclose(fr(Re, rr)["f"], ref, rtol=1e-14)
+
+
+def test_derivadas_de_colebrook(notebook):
+    fr = notebook("11_sensibilidades")["friccion_derivadas"]
+    x = {"Re": np.geomspace(4e3, 1e8, 50), "rr": np.geomspace(1e-5, 5e-2, 50)}
+    r = fr(**x)
+    # Paso mayor: a Re alto df/dRe es ~1e-14 y el redondeo domina con pasos de 1e-6
+    np.testing.assert_allclose(r["df_dRe"], _centrada(fr, x, "Re", "f", rel=1e-4), rtol=1e-6)
+    np.testing.assert_allclose(r["df_drr"], _centrada(fr, x, "rr", "f", rel=1e-4), rtol=1e-6)
+    lam = fr(np.array([1000.0]), 1e-3)
+    assert lam["f"][0] == 0.064 and lam["df_dRe"][0] == pytest.approx(-64e-6) and lam["df_drr"][0] == 0.0
+
+
+@pytest.mark.parametrize(
+    "nombre, x, salida, derivadas",
+    [
+        ("diametro_derivadas", {"Q": 0.35, "L": 150.0, "h": 20.0}, "D", {"Q": "dD_dQ", "L": "dD_dL", "h": "dD_dh"}),
+        ("caudal_derivadas", {"D": D_MIN, "L": 300.0, "h": 20.0}, "Q", {"D": "dQ_dD", "L": "dQ_dL", "h": "dQ_dh"}),
+        (
+            "altura_derivadas",
+            {"z2": 65.0, "v": 1.6, "D": 0.08, "L": 1500.0},
+            "Hb",
+            {"z2": "dHb_dz2", "v": "dHb_dv", "D": "dHb_dD", "L": "dHb_dL"},
+        ),
+        (
+            "altura_derivadas",
+            {"z2": 65.0, "v": 1.6, "D": 0.08, "L": 1500.0},
+            "P_kW",
+            {"z2": "dP_dz2", "v": "dP_dv", "D": "dP_dD", "L": "dP_dL"},
+        ),
+    ],
+)
+def test_derivadas_frente_a_diferencias_finitas(notebook, nombre, x, salida, derivadas):
+    fn = notebook("11_sensibilidades")[nombre]
+    r = fn(**x)
+    for p, clave in derivadas.items():
+        assert float(r[clave]) == pytest.approx(float(_centrada(fn, x, p, salida)), rel=1e-6)
+
+
+def test_ejemplo_de_01_iterative(notebook):
+    d = notebook("11_sensibilidades")
+    it = notebook("01_iterative")
+    assert d["D_min"] == pytest.approx(D_MIN, rel=1e-6)
+    assert d["D_min"] == pytest.approx(it["D_min"], rel=1e-6)
+    assert d["Q2"] == pytest.approx(it["Q2_final"], rel=1e-5)
+    # dlnD/dlnQ = (2 + e_Re) · dlnD/dlnL; en régimen casi totalmente rugoso e_Re → 0
+    sa = d["diametro_derivadas"](1.0, 150.0, 20.0, eps=1e-2)
+    e_Re, _ = d["elasticidades"](d["friccion_derivadas"](sa["Re"], 1e-2 / sa["D"]), sa["Re"], 1e-2 / sa["D"])
+    assert abs(float(e_Re)) < 0.01
+    assert float(sa["dD_dQ"]) * 1.0 == pytest.approx((2 + float(e_Re)) * float(sa["dD_dL"]) * 150.0, rel=1e-12)
+    assert float(sa["dD_dL"]) * 150.0 == pytest.approx(-float(sa["dD_dh"]) * 20.0, rel=1e-12)
+
+
+def test_bomba_y_punto_de_operacion(notebook):
+    d = notebook("11_sensibilidades")
+    coef = dict(H0=62.0, a=0.06, b=0.00035)
+    Q, rD = np.linspace(0, 300, 31), np.full(31, 1.1)
+    b = d["bomba_derivadas"](Q, rD, **coef)
+    curvas_bomba = notebook("02_pumps")["curvas_bomba"]
+    _, H, *_ = curvas_bomba(Q / 1.1, 1.1, 62.0, 0.06, 0.00035, 0.82, 180.0, 7.5e-6, 0.95, 998.0, 2.0, 1.5e-4)
+    np.testing.assert_allclose(b["H"], H, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(b["dH_dQ"], -0.06 * rD - 2 * 0.00035 * Q)
+    np.testing.assert_allclose(b["dH_drD"], 2 * rD * 62.0 - 0.06 * Q)
+
+    po = d["punto_operacion_derivadas"]
+    x = {"rD": 1.05, "H_est": 25.0, "K": 0.0008}
+    r = po(**coef, **x)
+    assert float(r["H"]) == pytest.approx(25.0 + 0.0008 * float(r["Q"]) ** 2)
+    for p, clave in {"rD": "dQ_drD", "H_est": "dQ_dHest", "K": "dQ_dK"}.items():
+        fd = _centrada(lambda **k: po(**coef, **k), x, p, "Q")
+        assert float(r[clave]) == pytest.approx(float(fd), rel=1e-6)
+
+
+def test_comparacion_con_diferencias(notebook):
+    comparacion = notebook("11_sensibilidades")["comparacion"]
+    assert [f["n_param"] for f in comparacion] == [2, 3, 3, 4]
+    for fila in comparacion:
+        assert fila["error"] < 1e-3
+
+
+@pytest.mark.parametrize("nombre", ["caudal_derivadas", "diametro_derivadas"])
+def test_marca_casos_sin_converger(notebook, nombre):
+    d = notebook("11_sensibilidades")
+    rng = np.random.default_rng(3)
+    n = 20_000
+    if nombre == "caudal_derivadas":
+        x = {"D": np.exp(rng.uniform(np.log(0.005), np.log(0.6), n)), "L": rng.uniform(50, 5000, n), "h": np.exp(rng.uniform(np.log(1e-3), np.log(50), n))}
+    else:
+        x = {"Q": np.exp(rng.uniform(np.log(1e-5), np.log(1.0), n)), "L": rng.uniform(50, 5000, n), "h": np.exp(rng.uniform(np.log(1e-3), np.log(50), n))}
+    with np.errstate(all="ignore"):
+        r = d[nombre](**x)
+    ok = r["convergio"]
+    assert 0 < ok.sum() < n
+    g, L, h = 9.81, x["L"], x["h"]
+    if nombre == "caudal_derivadas":
+        hf = 8 * r["f"] * L * r["Q"] ** 2 / (g * np.pi**2 * x["D"] ** 5)
+    else:
+        hf = 8 * r["f"] * L * x["Q"] ** 2 / (g * np.pi**2 * r["D"] ** 5)
+    np.testing.assert_allclose(hf[ok], h[ok], rtol=1e-9)
+    for k, v in r.items():
+        if k != "convergio":
+            assert np.isnan(v[~ok]).all(), k
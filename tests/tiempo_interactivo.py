@@ -0,0 +1,120 @@
+"""Tiempo hasta el primer cuadro interactivo de un notebook, sin navegador.
+
+Cada notebook se ejecuta en un intérprete nuevo (``python -X importtime``) hasta que todas sus celdas terminan,
+que es cuando el gráfico y los controles quedan disponibles. Se informa:
+
+- ``marimo_s``: importar marimo (común a todos los notebooks);
+- ``tti_s``: desde antes de importar marimo hasta terminar ``app.run()``;
+- ``importaciones_s``: parte del tiempo del notebook gastada importando módulos;
+- ``paquetes``: paquetes de terceros que el notebook agrega a marimo y sus dependencias en el proceso principal,
+  y ``peso_mb`` su tamaño en disco, aproximación de lo que Pyodide tendría que descargar e inicializar.
+  (Localmente `00_moody` rasteriza con matplotlib en procesos aparte; en Pyodide lo haría en el mismo proceso.)
+  Los módulos propios de `recursos/` (p. ej. `pool_trabajo`) no cuentan como paquetes.
+
+Uso (desde la raíz del repo)::
+
+    python tests/tiempo_interactivo.py 00_moody 00_moody_wasm
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+RECURSOS = Path(__file__).resolve().parent.parent / "recursos"
+_MARCA = "--- notebook ---"
+MARIMO_VERIFICADO = {(0, v) for v in range(20, 26)}
+
+_HIJO = r"""
+import importlib.util, json, os, re, sys, time
+t0 = time.perf_counter()
+import marimo
+t1 = time.perf_counter()
+# app.run() importa matplotlib siempre que esté instalado (marimo/_runtime/app/script_runner.py consulta
+# DependencyManager.matplotlib.has() para cerrar figuras tras cada celda); en el navegador solo se carga si el
+# notebook lo importa, así que la sonda se limita a lo ya importado. No hay API pública para desactivarla: el
+# parche usa una API privada, verificada con las versiones de MARIMO_VERIFICADO; con otra, `sonda` sale False.
+sonda = False
+if tuple(int(p) for p in marimo.__version__.split(".")[:2]) in MARIMO_VERIFICADO:
+    try:
+        from marimo._dependencies.dependencies import DependencyManager
+        DependencyManager.matplotlib.has = lambda quiet=False: "matplotlib" in sys.modules
+        sonda = True
+    except (ImportError, AttributeError):
+        pass
+base = set(sys.modules)
+print(MARCA, file=sys.stderr, flush=True)
+spec = importlib.util.spec_from_file_location("nb", RUTA)
+nb = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(nb)
+nb.app.run()
+t2 = time.perf_counter()
+
+def peso(nombre):
+    archivo = getattr(sys.modules.get(nombre), "__file__", None)
+    if not archivo:
+        return 0
+    if os.path.basename(archivo) != "__init__.py":
+        return os.path.getsize(archivo)
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(os.path.dirname(archivo)) for f in fs)
+
+# Las dependencias propias de marimo (p. ej. pygments para mo.md) ya vienen con el runtime del navegador
+from importlib.metadata import packages_distributions, requires
+req = {re.split(r"[ ;<>=!~\[]", r)[0].lower().replace("_", "-") for r in requires("marimo") or [] if "extra ==" not in r}
+dist = packages_distributions()
+nuevos = {m.split(".")[0] for m in set(sys.modules) - base} - {m.split(".")[0] for m in base}
+paquetes = sorted(
+    m for m in nuevos
+    if m not in sys.stdlib_module_names and not m.startswith("_")
+    and os.path.dirname(getattr(sys.modules.get(m), "__file__", None) or "") != os.path.dirname(RUTA)
+    and not any(d.lower().replace("_", "-") in req for d in dist.get(m, []))
+)
+print(json.dumps({"marimo_s": t1 - t0, "tti_s": t2 - t0, "paquetes": paquetes, "sonda": sonda,
+                  "peso_mb": sum(peso(m) for m in paquetes) / 2**20}))
+"""
+
+
+def _importaciones_s(stderr):
+    # Suma del tiempo propio ("self") de cada módulo importado después de la marca
+    total, activo = 0, False
+    for linea in stderr.splitlines():
+        if linea.startswith(_MARCA):
+            activo = True
+        elif activo and linea.startswith("import time:"):
+            campo = linea.split(":", 1)[1].split("|")[0].strip()
+            if campo.isdigit():
+                total += int(campo)
+    return total / 1e6
+
+
+def medir_arranque(nombre, repeticiones=3):
+    """Mejor de varias ejecuciones en intérpretes nuevos; devuelve tiempos (s), paquetes y peso (MB)."""
+    codigo = (
+        _HIJO.replace("MARIMO_VERIFICADO", repr(MARIMO_VERIFICADO))
+        .replace("MARCA", repr(_MARCA))
+        .replace("RUTA", repr(str(RECURSOS / f"{nombre}.py")))
+    )
+    entorno = dict(os.environ, MPLBACKEND="Agg")
+    mejor = None
+    for _ in range(repeticiones):
+        r = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", codigo], capture_output=True, text=True, env=entorno, check=True
+        )
+        datos = json.loads(r.stdout.strip().splitlines()[-1])
+        datos["importaciones_s"] = _importaciones_s(r.stderr)
+        if mejor is None or datos["tti_s"] < mejor["tti_s"]:
+            mejor = datos
+    return mejor
+
+
+if __name__ == "__main__":
+    nombres = sys.argv[1:] or ["00_moody", "00_moody_wasm"]
+    print("| notebook | TTI (s) | marimo (s) | importaciones del notebook (s) | paquetes extra | peso (MB) |")
+    print("|---|---:|---:|---:|---|---:|")
+    for nombre in nombres:
+        m = medir_arranque(nombre)
+        print(
+            f"| {nombre} | {m['tti_s']:.2f} | {m['marimo_s']:.2f} | {m['importaciones_s']:.2f} | "
+            f"{', '.join(m['paquetes']) or '—'} | {m['peso_mb']:.1f} |"
+        )